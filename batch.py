@@ -0,0 +1,194 @@
+"""Vectorised evaluation of many hands at once with NumPy.
+
+`evaluate_batch` scores an array of hands, one row of card ids per hand, using
+the same tables as `evaluator.evaluate`, without creating any `Card`, `Hand`
+or `HandSpace` objects along the way.
+"""
+import numpy as np
+from card import Card
+import evaluator
+from evaluator import _FLUSH_BEST, _NONFLUSH, _OFFSETS
+
+# Rows are processed in chunks to bound the size of temporary arrays.
+CHUNK_SIZE = 1 << 16
+
+_FLUSH_TABLE = np.asarray(_FLUSH_BEST)
+_NONFLUSH_TABLES = {n: np.asarray(_NONFLUSH[n]) for n in (5, 6, 7)}
+
+_OFFSET_TABLE = np.zeros((13, 8, 5), dtype=np.int32)
+for _i, _by_remaining in enumerate(_OFFSETS):
+    for _m, _by_count in enumerate(_by_remaining):
+        _OFFSET_TABLE[_i, _m, :len(_by_count)] = _by_count
+del _i, _m, _by_remaining, _by_count
+
+_CATEGORY_TABLE = np.array(
+    [0] + [evaluator.strength_of(s).value for s in range(1, evaluator.NUM_CLASSES+1)],
+    dtype=np.uint8
+)
+
+def card_ids(hands):
+    """Convert hands of cards or labels into an array of card ids.
+
+    Parameters
+    ----------
+    hands : iterable
+        An iterable of hands, each an iterable of `Card` instances and/or
+        card labels like `'As'`. All hands must have the same number of cards.
+
+    Returns
+    -------
+    numpy.ndarray
+        A `uint8` array of shape `(len(hands), cards per hand)` of card ids
+        (see `card.Card.id`).
+
+    """
+    return np.array(
+        [[(c if isinstance(c, Card) else Card(c)).id for c in hand] for hand in hands],
+        dtype=np.uint8
+    )
+
+def categories(scores):
+    """Get the hand strength category of each score.
+
+    Parameters
+    ----------
+    scores : numpy.ndarray
+        Scores, as returned by `evaluate_batch`.
+
+    Returns
+    -------
+    numpy.ndarray
+        A `uint8` array of `enums.HandStrength` values, one per score.
+
+    """
+    return _CATEGORY_TABLE[scores]
+
+def evaluate_batch(cards):
+    """Score the best 5-card hand for each row of an array of card ids.
+
+    Parameters
+    ----------
+    cards : numpy.ndarray
+        An integer array of shape `(N, 5)`, `(N, 6)` or `(N, 7)`, where each
+        row holds the ids of distinct cards (see `card.Card.id`).
+
+    Raises
+    ------
+    ValueError
+        If `cards` is not 2-dimensional with 5 to 7 columns.
+
+    Returns
+    -------
+    scores : numpy.ndarray
+        A `uint16` array of length N with the score of each hand, as given by
+        `evaluator.evaluate`.
+    strengths : numpy.ndarray
+        A `uint8` array of length N with the `enums.HandStrength` value of
+        each hand.
+
+    """
+    cards = np.asarray(cards)
+    if cards.ndim != 2 or cards.shape[1] not in _NONFLUSH_TABLES:
+        raise ValueError(f"Expected an array of shape (N, 5 to 7), but got {cards.shape}.")
+
+    scores = np.empty(len(cards), dtype=np.uint16)
+    for start in range(0, len(cards), CHUNK_SIZE):
+        stop = start + CHUNK_SIZE
+        scores[start:stop] = _evaluate_chunk(cards[start:stop])
+    return scores, _CATEGORY_TABLE[scores]
+
+def evaluate_boards(boards, holes):
+    """Score several players' hole cards on each of an array of boards.
+    
+    The per-rank and per-suit tallies of each board are computed once and 
+    shared by all of the players, so this is faster than calling 
+    `evaluate_batch` on each player's cards.
+
+    Parameters
+    ----------
+    boards : numpy.ndarray
+        An integer array of shape `(N, 3)`, `(N, 4)` or `(N, 5)` of card ids.
+    holes : numpy.ndarray
+        An integer array of each player's two hole card ids, either of shape 
+        `(P, 2)` to use the same hole cards on every board, or `(P, N, 2)`. 
+        Hole cards should not also appear on the boards: the scores of any 
+        such rows are meaningless (but harmless, so that callers can mask 
+        them out afterwards).
+
+    Raises
+    ------
+    ValueError
+        If the arrays do not have the shapes above.
+
+    Returns
+    -------
+    numpy.ndarray
+        A `uint16` array of shape `(P, N)` with the score of each player's 
+        best hand on each board, as given by `evaluator.evaluate`.
+
+    """
+    boards = np.asarray(boards)
+    holes = np.asarray(holes)
+    if boards.ndim != 2 or boards.shape[1] + 2 not in _NONFLUSH_TABLES:
+        raise ValueError(f"Expected boards of shape (N, 3 to 5), but got {boards.shape}.")
+    if holes.shape[-1] != 2 or holes.ndim not in (2, 3) or (holes.ndim == 3 and holes.shape[1] != len(boards)):
+        raise ValueError(f"Expected holes of shape (P, 2) or (P, {len(boards)}, 2), but got {holes.shape}.")
+
+    scores = np.empty((len(holes), len(boards)), dtype=np.uint16)
+    for start in range(0, len(boards), CHUNK_SIZE):
+        stop = start + CHUNK_SIZE
+        chunk = holes if holes.ndim == 2 else holes[:, start:stop]
+        scores[:, start:stop] = _evaluate_boards_chunk(boards[start:stop], chunk)
+    return scores
+
+def _tally(cards):
+    # Per-rank counts, per-suit counts and per-suit rank bitmasks of each row.
+    n_rows = len(cards)
+    ranks = (cards >> 2).astype(np.intp)
+    suits = (cards & 3).astype(np.intp)
+    rows = np.arange(n_rows)[:, None]
+    counts = np.bincount((rows * 13 + ranks).ravel(), minlength=13 * n_rows).reshape(n_rows, 13)
+    suit_cells = (rows * 4 + suits).ravel()
+    suit_counts = np.bincount(suit_cells, minlength=4 * n_rows).reshape(n_rows, 4)
+    suit_masks = np.bincount(
+        suit_cells, weights=(1 << ranks).ravel(), minlength=4 * n_rows
+    ).reshape(n_rows, 4).astype(np.intp)
+    return counts, suit_counts, suit_masks
+
+def _score(counts, suit_counts, suit_masks, n):
+    # Scores rows of tallies for hands of n cards, as `evaluator.evaluate_counts`.
+    remaining = n - np.cumsum(counts, axis=1) + counts
+    index = _OFFSET_TABLE[np.arange(13), remaining, counts].sum(axis=1)
+    scores = _NONFLUSH_TABLES[n][index]
+
+    # At most one suit can hold five or more of 7 cards, and it beats the rest.
+    rows = np.arange(len(counts))
+    flush_suit = suit_counts.argmax(axis=1)
+    flushed = suit_counts[rows, flush_suit] >= 5
+    if flushed.any():
+        scores[flushed] = _FLUSH_TABLE[suit_masks[rows[flushed], flush_suit[flushed]]]
+    return scores
+
+def _evaluate_chunk(cards):
+    return _score(*_tally(cards), cards.shape[1])
+
+def _evaluate_boards_chunk(boards, holes):
+    counts, suit_counts, suit_masks = _tally(boards)
+    rows = np.arange(len(boards))
+    n = boards.shape[1] + 2
+
+    scores = np.empty((len(holes), len(boards)), dtype=np.uint16)
+    for player, hole in enumerate(holes):
+        player_counts = counts.copy()
+        player_suit_counts = suit_counts.copy()
+        player_suit_masks = suit_masks.copy()
+        for card in (hole[..., 0], hole[..., 1]):
+            rank = (card >> 2).astype(np.intp)
+            suit = (card & 3).astype(np.intp)
+            player_counts[rows, rank] += 1
+            player_suit_counts[rows, suit] += 1
+            player_suit_masks[rows, suit] |= 1 << rank
+        # Only reachable when a hole card is also on the board.
+        np.minimum(player_counts, 4, out=player_counts)
+        scores[player] = _score(player_counts, player_suit_counts, player_suit_masks, n)
+    return scores
@@ -0,0 +1,273 @@
+"""Benchmarks of the core classes and the batch paths.
+
+Each benchmark times a small, representative piece of work, such as building
+a `Hand` of a given category or scoring a `HandSpace` of 7 cards, and reports
+the best time per operation over several repeats. Results are saved as JSON,
+and can be compared against a saved baseline to flag regressions:
+
+    python bench.py run -o baseline.json
+    python bench.py compare baseline.json
+
+`compare` exits with status 1 if any benchmark is slower than the baseline by
+more than the tolerance.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+from card import Card
+from deck import Deck
+from hand import Hand, HandSpace
+
+# Each benchmark maps its name to a function which does any setup and returns
+# `(operation, n)`, where calling `operation()` performs `n` operations.
+BENCHMARKS = {}
+
+# Example 5-card hands of each category, weakest first.
+EXAMPLE_HANDS = {
+    'HIGH_CARD': ['Ks', 'Jd', '8c', '5h', '3s'],
+    'PAIR': ['Qs', 'Qd', '9c', '6h', '2s'],
+    'TWO_PAIR': ['Js', 'Jd', '7c', '7h', '4s'],
+    'THREE_OF_A_KIND': ['9s', '9d', '9c', 'Kh', '3s'],
+    'STRAIGHT': ['9s', '8d', '7c', '6h', '5s'],
+    'FLUSH': ['Ah', 'Jh', '8h', '6h', '2h'],
+    'FULL_HOUSE': ['Ts', 'Td', 'Tc', '4h', '4s'],
+    'FOUR_OF_A_KIND': ['8s', '8d', '8c', '8h', 'As'],
+    'STRAIGHT_FLUSH': ['9c', '8c', '7c', '6c', '5c'],
+    'ROYAL_FLUSH': ['As', 'Ks', 'Qs', 'Js', 'Ts'],
+}
+
+def benchmark(name):
+    """Register a benchmark setup function under a name (a decorator)."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+@benchmark('card.construct')
+def _card_construct():
+    labels = [Card.from_id(i).label for i in range(52)]
+    return lambda: [Card(label) for label in labels], len(labels)
+
+@benchmark('deck.shuffle_take')
+def _deck_shuffle_take():
+    def deal():
+        deck = Deck()
+        deck.shuffle()
+        return deck.take(5)
+    return deal, 1
+
+@benchmark('deck.take_labels_reset')
+def _deck_take_labels_reset():
+    deck = Deck()
+    labels = ['As', 'Kd', '7h', '7c', '2s']
+    def deal():
+        deck.take(labels=labels)
+        deck.reset()
+    return deal, 1
+
+for _strength, _labels in EXAMPLE_HANDS.items():
+    @benchmark(f'hand.construct.{_strength.lower()}')
+    def _hand_construct(labels=_labels):
+        cards = [Card(label) for label in labels]
+        return lambda: Hand(cards=cards).strength, 1
+del _strength, _labels
+
+@benchmark('hand.compare')
+def _hand_compare():
+    hands = [Hand(labels) for labels in EXAMPLE_HANDS.values()]
+    pairs = [(a, b) for a in hands for b in hands]
+    def compare():
+        for a, b in pairs:
+            a < b
+            a == b
+            a >= b
+    return compare, 3 * len(pairs)
+
+for _n in (5, 6, 7):
+    @benchmark(f'handspace.{_n}_cards')
+    def _handspace(n=_n):
+        cards = [Card(label) for label in ['Ah', 'Kh', 'Qd', 'Jh', '9c', '4s', '2h'][:n]]
+        return lambda: HandSpace(cards[:2], cards[2:]).best_hand, 1
+del _n
+
+@benchmark('batch.evaluate_batch_7')
+def _evaluate_batch():
+    import numpy as np
+    from batch import evaluate_batch
+    cards = Deck().deal_batch(100_000, players=0, board_cards=7, rng=np.random.default_rng(0))[1]
+    return lambda: evaluate_batch(cards), len(cards)
+
+@benchmark('batch.evaluate_boards')
+def _evaluate_boards():
+    import numpy as np
+    from batch import evaluate_boards
+    holes, boards = Deck().deal_batch(100_000, players=3, board_cards=5, rng=np.random.default_rng(0))
+    holes = holes.transpose(1, 0, 2)
+    return lambda: evaluate_boards(boards, holes), holes.shape[0] * len(boards)
+
+@benchmark('omaha.evaluate_boards')
+def _omaha_boards():
+    import numpy as np
+    from omaha import evaluate_boards
+    _, cards = Deck().deal_batch(20_000, players=0, board_cards=13, rng=np.random.default_rng(0))
+    holes = cards[:, :8].reshape(-1, 2, 4).transpose(1, 0, 2)
+    return lambda: evaluate_boards(cards[:, 8:], holes), holes.shape[0] * len(cards)
+
+@benchmark('deck.deal_batch')
+def _deal_batch():
+    import numpy as np
+    deck, rng = Deck(), np.random.default_rng(0)
+    return lambda: deck.deal_batch(100_000, players=2, board_cards=5, rng=rng), 100_000
+
+@benchmark('equity.monte_carlo')
+def _equity():
+    from equity import equity
+    hands = [['Ah', 'As'], ['Kd', 'Kc']]
+    return lambda: equity(hands, iterations=50_000, workers=1, seed=0), 50_000
+
+def run(names=None, repeat=5):
+    """Run benchmarks.
+
+    Parameters
+    ----------
+    names : list, optional
+        Names or name prefixes of the benchmarks to run, e.g. `['hand.']`.
+        The default is None, which runs every benchmark.
+    repeat : int, optional
+        The number of timings of each benchmark, of which the fastest is
+        reported. The default is 5.
+
+    Returns
+    -------
+    dict
+        Benchmark names and their seconds per operation.
+
+    """
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if names and not any(name.startswith(n) for n in names):
+            continue
+        operation, n = setup()
+        timer = timeit.Timer(operation)
+        number, _ = timer.autorange()
+        results[name] = min(timer.repeat(repeat, number)) / (number * n)
+    return results
+
+def save(results, path):
+    """Save benchmark results, with details of the machine, as JSON.
+
+    Parameters
+    ----------
+    results : dict
+        Results from `run`.
+    path : str
+        The file to write.
+
+    Returns
+    -------
+    None
+
+    """
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+def load(path):
+    """Load benchmark results saved by `save`.
+
+    Parameters
+    ----------
+    path : str
+        The file to read.
+
+    Returns
+    -------
+    dict
+        Benchmark names and their seconds per operation.
+
+    """
+    with open(path) as f:
+        return json.load(f)['results']
+
+def compare(results, baseline, tolerance=0.1):
+    """Compare benchmark results against a baseline.
+
+    Parameters
+    ----------
+    results : dict
+        Results from `run` or `load`.
+    baseline : dict
+        Baseline results from `run` or `load`.
+    tolerance : float, optional
+        The relative change in time per operation that counts as a
+        regression or an improvement. The default is 0.1 (10%).
+
+    Returns
+    -------
+    list
+        Tuples of `(name, baseline, current, ratio, status)` for each
+        benchmark in both results, where `ratio` is the current time over the
+        baseline time and `status` is `'slower'`, `'faster'` or `'same'`.
+
+    """
+    rows = []
+    for name in results.keys() & baseline.keys():
+        ratio = results[name] / baseline[name]
+        if ratio > 1 + tolerance:
+            status = 'slower'
+        elif ratio < 1 - tolerance:
+            status = 'faster'
+        else:
+            status = 'same'
+        rows.append((name, baseline[name], results[name], ratio, status))
+    return sorted(rows)
+
+def _format(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run benchmarks and compare them with a baseline.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help="run benchmarks")
+    run_parser.add_argument('-o', '--output', default=None, help="JSON file to save the results to")
+    compare_parser = commands.add_parser('compare', help="compare results with a baseline")
+    compare_parser.add_argument('baseline', help="JSON file of baseline results")
+    compare_parser.add_argument(
+        'results', nargs='?', default=None, help="JSON file of results (default: run the benchmarks now)"
+    )
+    compare_parser.add_argument(
+        '-t', '--tolerance', type=float, default=0.1, help="relative change to flag (default: 0.1)"
+    )
+    for sub in (run_parser, compare_parser):
+        sub.add_argument('-k', '--only', action='append', default=None, help="benchmark name prefix to run")
+        sub.add_argument('-r', '--repeat', type=int, default=5, help="timings per benchmark (default: 5)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run(args.only, args.repeat)
+        for name, seconds in results.items():
+            print(f"{name:<36} {_format(seconds):>10}/op")
+        if args.output:
+            save(results, args.output)
+        return 0
+
+    baseline = load(args.baseline)
+    results = load(args.results) if args.results else run(args.only, args.repeat)
+    rows = compare(results, baseline, args.tolerance)
+    for name, before, after, ratio, status in rows:
+        print(f"{name:<36} {_format(before):>10} {_format(after):>10} {ratio:>6.2f}x  {status}")
+    return int(any(status == 'slower' for *_, status in rows))
+
+if __name__ == '__main__':
+    sys.exit(main())
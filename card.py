@@ -20,6 +20,12 @@ class Card:
     because there will be mutliple matches. This might be slower, but rank 
     comparisons are more of a requirement than dealing of specific cards (for 
     now).
+    
+    There are exactly 52 `Card` instances: they are created once when this 
+    module is imported, and constructing a `Card` returns the matching 
+    instance rather than a new object, so `Card('As') is Card('as')`. Each card 
+    also carries a unique integer `id` (see `Card.id`) for use as an index or 
+    a bit position.
 
     Parameters
     ----------
@@ -41,20 +47,56 @@ class Card:
     Raises
     ------
     ValueError
-        If if label is None and only one or none of `rank` and `suit` are 
-        passed.
+        If `label` is not a valid card label, or if label is None and only 
+        one or none of `rank` and `suit` are passed.
 
     """
-    def __init__(self, label: str = None, rank: int = None, suit: str = None):
+    __slots__ = ('_id', '_rank', '_suit', '_label')
+    
+    # Canonical instances, filled in once at import (see bottom of module).
+    _by_id = []
+    _by_label = {}
+    _by_rank_suit = {}
+    
+    def __new__(cls, label: str = None, rank: int = None, suit: str = None):
         if label is not None:
-            self._rank, self._suit = self.parse_label(label)
-            # By this point label will be valid if parse_label worked
-            self._label = label.capitalize()
+            try:
+                return cls._by_label[label.capitalize()]
+            except (KeyError, AttributeError):
+                raise ValueError(f"Invalid card label: {label!r}")
         elif all([rank, suit]):
-            self._label = Rank(rank).label + Suit[suit.upper()].value
-            self._rank, self._suit = self.parse_label(self.label)
-        else:
-            raise ValueError("Expected either `label`, or both of `rank` and `suit`.")
+            try:
+                return cls._by_rank_suit[(rank, suit.upper())]
+            except (KeyError, AttributeError):
+                raise ValueError(f"Invalid rank and suit: {rank!r}, {suit!r}")
+        raise ValueError("Expected either `label`, or both of `rank` and `suit`.")
+    
+    @classmethod
+    def _create(cls, card_id, rank, suit, label):
+        # Build one of the 52 canonical cards, bypassing `__new__`.
+        card = object.__new__(cls)
+        card._id = card_id
+        card._rank = rank
+        card._suit = suit
+        card._label = label
+        return card
+    
+    @classmethod
+    def from_id(cls, card_id):
+        """Get the card for an integer id.
+
+        Parameters
+        ----------
+        card_id : int
+            An integer in the range (0, 51) inclusive (see `Card.id`).
+
+        Returns
+        -------
+        Card
+            The canonical card instance with that id.
+
+        """
+        return cls._by_id[card_id]
 
     @classmethod
     def parse_label(cls, label):
@@ -75,6 +117,10 @@ class Card:
         """
         return Rank.get(label[0].upper()).value, Suit(label[1].lower()).name
     
+    def __reduce__(self):
+        # Unpickling (and copying) goes back through the canonical table.
+        return (Card, (self._label,))
+    
     def __repr__(self):
         return f"<Card('{self.label}')>"
     
@@ -88,7 +134,7 @@ class Card:
     
     def __le__(self, other):
         if isinstance(other, Card):
-            self.rank <= other.rank
+            return self.rank <= other.rank
         return self.rank <= other
     
     def __eq__(self, other):
@@ -120,6 +166,29 @@ class Card:
     def label(self):
         """str: The label abbreviation for this card."""
         return self._label
+    
+    @property
+    def id(self):
+        """int: Unique integer id, in the range (0, 51), for this card.
+        
+        Ids are ordered by rank and then suit, i.e. `'2c'` is 0, `'2d'` is 1, 
+        and `'As'` is 51 (the same order as `enums.get_all_handlabels`).
+        """
+        return self._id
+
+# Intern the 52 canonical cards
+for _rank in Rank.values():
+    for _suit in Suit:
+        _card = Card._create(
+            (_rank - 2) * 4 + Suit.values().index(_suit.value),
+            _rank,
+            _suit.name,
+            Rank(_rank).label + _suit.value
+        )
+        Card._by_id.append(_card)
+        Card._by_label[_card.label] = _card
+        Card._by_rank_suit[(_rank, _suit.name)] = _card
+del _rank, _suit, _card
 
 if __name__ == '__main__':
     td = Card('td')
@@ -0,0 +1,173 @@
+from card import Card
+
+class CardSet:
+    """An immutable set of playing cards backed by an integer bitmask.
+
+    Each card occupies the bit given by its `Card.id`, so a full deck fits in
+    a 52-bit integer. Set operations (`|`, `&`, `-`, `^`), membership tests
+    and `len` are single integer operations, which makes `CardSet` suitable
+    for tracking dead cards, boards and hole cards in tight loops.
+
+    Iteration always yields cards in ascending `Card.id` order (i.e. `'2c'`
+    first and `'As'` last), regardless of the order they were added in.
+
+    Parameters
+    ----------
+    cards : iterable, optional
+        An iterable of `Card` instances and/or card labels like `'As'`, or
+        another `CardSet`. The default is None, which creates an empty set.
+
+    Raises
+    ------
+    ValueError
+        If any of the given labels is not a valid card label.
+
+    """
+    __slots__ = ('_mask',)
+
+    def __init__(self, cards=None):
+        if isinstance(cards, CardSet):
+            self._mask = cards._mask
+            return
+
+        mask = 0
+        if cards is not None:
+            for card in cards:
+                if not isinstance(card, Card):
+                    card = Card(card)
+                mask |= 1 << card.id
+        self._mask = mask
+
+    @classmethod
+    def from_mask(cls, mask):
+        """Create a card set directly from an integer bitmask.
+
+        Parameters
+        ----------
+        mask : int
+            A bitmask where bit `i` is set if the card with id `i` is present.
+
+        Returns
+        -------
+        CardSet
+            The card set represented by `mask`.
+
+        """
+        cardset = cls.__new__(cls)
+        cardset._mask = mask
+        return cardset
+
+    @classmethod
+    def full(cls):
+        """CardSet: A set containing all 52 cards."""
+        return cls.from_mask(FULL_MASK)
+
+    @property
+    def mask(self):
+        """int: The bitmask for this set, with bit `Card.id` set per card."""
+        return self._mask
+
+    @property
+    def ids(self):
+        """list: Integer ids of the cards in the set, in ascending order."""
+        ids = []
+        mask = self._mask
+        while mask:
+            low = mask & -mask
+            ids.append(low.bit_length() - 1)
+            mask ^= low
+        return ids
+
+    @property
+    def labels(self):
+        """list: Labels of the cards in the set, in ascending id order."""
+        return [card.label for card in self]
+
+    def __iter__(self):
+        mask = self._mask
+        while mask:
+            low = mask & -mask
+            yield Card.from_id(low.bit_length() - 1)
+            mask ^= low
+
+    def __len__(self):
+        return self._mask.bit_count()
+
+    def __bool__(self):
+        return self._mask != 0
+
+    def __contains__(self, card):
+        if not isinstance(card, Card):
+            try:
+                card = Card(card)
+            except (ValueError, TypeError):
+                return False
+        return (self._mask >> card.id) & 1 == 1
+
+    def __or__(self, other):
+        return CardSet.from_mask(self._mask | _as_mask(other))
+
+    def __and__(self, other):
+        return CardSet.from_mask(self._mask & _as_mask(other))
+
+    def __sub__(self, other):
+        return CardSet.from_mask(self._mask & ~_as_mask(other))
+
+    def __xor__(self, other):
+        return CardSet.from_mask(self._mask ^ _as_mask(other))
+
+    __ror__ = __or__
+    __rand__ = __and__
+    __rxor__ = __xor__
+
+    def __eq__(self, other):
+        if isinstance(other, CardSet):
+            return self._mask == other._mask
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._mask)
+
+    def __repr__(self):
+        return f"CardSet({self.labels})"
+
+    def isdisjoint(self, other):
+        """Check whether this set has no cards in common with another.
+
+        Parameters
+        ----------
+        other : CardSet or iterable
+            Another card set, or cards/labels to build one from.
+
+        Returns
+        -------
+        bool
+            True if the two sets share no cards.
+
+        """
+        return self._mask & _as_mask(other) == 0
+
+    def issubset(self, other):
+        """Check whether every card in this set is also in another.
+
+        Parameters
+        ----------
+        other : CardSet or iterable
+            Another card set, or cards/labels to build one from.
+
+        Returns
+        -------
+        bool
+            True if this set is a subset of `other`.
+
+        """
+        return self._mask & ~_as_mask(other) == 0
+
+
+FULL_MASK = (1 << 52) - 1
+
+def _as_mask(other):
+    # Allow set operations with plain iterables of cards or labels.
+    if isinstance(other, CardSet):
+        return other._mask
+    return CardSet(other)._mask
@@ -2,6 +2,7 @@ from itertools import product
 import random
 from enums import Rank, Suit
 from card import Card
+from cardset import CardSet, FULL_MASK
 
 class Deck:
     """A deck of playing cards.
@@ -12,27 +13,41 @@ class Deck:
         `.fan` - view a small selection of the deck.
         `.has` - check if the deck contains a specific card.
         `.take` - take cards from the deck.
+        `.reset` - put every card back in the deck.
+        `.deal_batch` - deal many independent deals at once, as NumPy arrays.
+    
+    The deck keeps its 52 cards in a fixed-size list, in deck order, and 
+    tracks which of them remain with a bitmask of card ids (see `Card.id`). 
+    Taking cards by label, checking membership and resetting therefore only 
+    flip bits, and a single deck can be reused across many deals. The cards 
+    remaining in the deck are also available as a `CardSet` via `.cardset`.
     
     """
     def __init__(self):
-        self.cards = [
+        self._order = [
             Card(rank=r, suit=s) for s,r in product(Suit.items(), Rank.values())
         ]
+        self._live = FULL_MASK
+        # Cards above _top in _order have all been taken from the top.
+        self._top = len(self._order)
         self._current_index = 0
     
     def __iter__(self):
         return self
     
     def __next__(self):
-        if self._current_index >= len(self.cards):
-            self._current_index = 0
-            raise StopIteration
-
-        self._current_index += 1
-        return self.cards[self._current_index-1]
+        # _current_index is a position in _order, skipping taken cards.
+        live = self._live
+        while self._current_index < self._top:
+            card = self._order[self._current_index]
+            self._current_index += 1
+            if live >> card._id & 1:
+                return card
+        self._current_index = 0
+        raise StopIteration
     
     def __len__(self):
-        return len(self.cards)
+        return self._live.bit_count()
     
     def __getitem__(self, obj):
         return self.cards[obj]
@@ -44,7 +59,13 @@ class Deck:
         return f"{self.cards}"
     
     def _search(self, lambda_=None):
-        return list(filter(lambda_, self))
+        return list(filter(lambda_, self.cards))
+    
+    @property
+    def cards(self):
+        """list: The cards remaining in the deck, from bottom to top."""
+        live = self._live
+        return [c for c in self._order[:self._top] if live >> c._id & 1]
     
     def shuffle(self):
         """Shuffle the deck in place.
@@ -54,7 +75,23 @@ class Deck:
         None
 
         """
-        random.shuffle(self.cards)
+        random.shuffle(self._order)
+        self._top = len(self._order)
+    
+    def reset(self):
+        """Put every card that was taken back into the deck.
+        
+        The order of the cards is left as it was, so call `.shuffle` as well 
+        for a fresh random deal.
+
+        Returns
+        -------
+        None
+
+        """
+        self._live = FULL_MASK
+        self._top = len(self._order)
+        self._current_index = 0
     
     def fan(self, n=5):
         """See the first `n` cards
@@ -72,13 +109,18 @@ class Deck:
         """
         return self[:n] if n > 0 else self[n:]
     
+    @property
+    def cardset(self):
+        """CardSet: The cards remaining in the deck, as a `CardSet`."""
+        return CardSet.from_mask(self._live)
+    
     def has(self, label):
         """Check to see if a card label, is contained in the deck.
 
         Parameters
         ----------
-        label : str
-            A label like `Jd`, 'As', etc.
+        label : str or Card
+            A label like `Jd`, 'As', etc, or a `Card`.
 
         Returns
         -------
@@ -86,7 +128,11 @@ class Deck:
             Whether the card denoted by the label exists in the deck or not.
 
         """
-        return label in [card.label for card in self]
+        if not isinstance(label, Card):
+            label = Card._by_label.get(str(label).capitalize())
+            if label is None:
+                return False
+        return bool(self._live >> label._id & 1)
     
     def take(self, n=None, labels=None, lambda_=None):
         """Take cards from deck.
@@ -100,9 +146,10 @@ class Deck:
         n : int, optional
             Number of cards to take from the top of the deck. The default is 
             None.
-        labels : str or list, optional
-            A list of card labels, like ['Ts', 'Qc'] to take from the deck. The 
-            default is None.
+        labels : str, list or CardSet, optional
+            A list of card labels, like ['Ts', 'Qc'], or a `CardSet` of cards 
+            to take from the deck. Cards that are not in the deck are ignored. 
+            The default is None.
         lambda_ : callable, optional
             A custom lambda function for the cards in the deck. The default is 
             None.
@@ -110,7 +157,8 @@ class Deck:
         Raises
         ------
         ValueError
-            If no arguments are given.
+            If no arguments are given, or `n` is more than the number of cards 
+            left in the deck.
 
         Returns
         -------
@@ -121,24 +169,87 @@ class Deck:
         if labels is not None:
             if isinstance(labels, str):
                 labels = [labels]
-            lambda_ = lambda x: x.label in labels
+            wanted = CardSet(labels).mask & self._live
+            self._live &= ~wanted
+            return list(CardSet.from_mask(wanted))
         
         if lambda_ is not None:
-            # Create a search list as a reference to extract from cards.
-            searched = [i.label for i in self._search(lambda_) if i is not None]
-            
-            # Store cards to take
-            taken = [c for c in self if c.label in searched]
-            
-            # Update original cards list  to reflect removal
-            self.cards = [c for c in self if c.label not in searched]
-            
+            taken = self._search(lambda_)
+            self._live &= ~CardSet(taken).mask
             return taken
         
         if n is None:
             # Default is None because this function acts in place.
             raise ValueError("Must specify either n, labels, or lambda function.")
-        return [self.cards.pop() for _ in range(n)]
+        if n > len(self):
+            raise ValueError(f"Cannot take {n} cards from a deck of {len(self)}.")
+        taken = []
+        while len(taken) < n:
+            self._top -= 1
+            card = self._order[self._top]
+            if self._live >> card._id & 1:
+                self._live ^= 1 << card._id
+                taken.append(card)
+        return taken
+    
+    def deal_batch(self, num_deals, players=2, board_cards=5, exclude=None, rng=None):
+        """Deal many independent deals from the cards in the deck.
+        
+        Each deal is a uniformly random arrangement of the remaining cards, 
+        drawn for all deals at once by partially sorting random keys, so 
+        dealing millions of hands takes a few array operations. The deck 
+        itself is left unchanged. This requires `numpy`.
+
+        Parameters
+        ----------
+        num_deals : int
+            The number of deals.
+        players : int, optional
+            The number of players to deal 2 hole cards each. The default is 2.
+        board_cards : int, optional
+            The number of community cards to deal. The default is 5.
+        exclude : list or CardSet, optional
+            Card labels, `Card` instances or a `CardSet` of cards that must not 
+            be dealt, in addition to those already taken from the deck. The 
+            default is None.
+        rng : numpy.random.Generator, optional
+            The random number generator to use. The default is None, which 
+            creates a new unseeded generator.
+
+        Raises
+        ------
+        ValueError
+            If the deck does not have enough cards for a deal.
+
+        Returns
+        -------
+        holes : numpy.ndarray
+            A `uint8` array of shape `(num_deals, players, 2)` of hole card 
+            ids (see `Card.id`).
+        boards : numpy.ndarray
+            A `uint8` array of shape `(num_deals, board_cards)` of board card 
+            ids.
+
+        """
+        import numpy as np
+        live = self._live
+        if exclude is not None:
+            live &= ~CardSet(exclude).mask
+        ids = np.array(CardSet.from_mask(live).ids, dtype=np.uint8)
+        n = 2 * players + board_cards
+        if n > len(ids):
+            raise ValueError(f"Cannot deal {n} cards per deal from a deck of {len(ids)}.")
+        
+        rng = rng if rng is not None else np.random.default_rng()
+        drawn = np.empty((num_deals, n), dtype=np.uint8)
+        if n:
+            keys = rng.random((num_deals, len(ids)))
+            # The n smallest keys pick the cards, and sorting them orders them.
+            picked = np.argpartition(keys, n-1, axis=1)[:, :n]
+            order = np.argsort(np.take_along_axis(keys, picked, axis=1), axis=1)
+            drawn[:] = ids[np.take_along_axis(picked, order, axis=1)]
+        return drawn[:, :2*players].reshape(num_deals, players, 2), drawn[:, 2*players:]
+
 
 if __name__ == '__main__':
     deck = Deck()
@@ -0,0 +1,177 @@
+"""Draws and outs of incomplete holdings.
+
+A holding of 3 to 6 cards (e.g. hole cards and a flop) is drawing to a
+straight or a flush if one more card could complete one, or, with at least
+two cards still to come in hold 'em, if two more cards could (a backdoor
+draw). A draw only counts if completing it would beat what the cards already
+make, so a made flush is not also a flush draw.
+
+Everything is worked out from 13-bit rank bitmasks of the cards, overall and
+per suit (as in `evaluator`), without building any `Hand` objects. The
+analysis of each set of cards is cached, so repeated queries about the same
+holding are cheap.
+
+Cards can be given as `Card` instances, labels or a `CardSet`.
+"""
+from functools import lru_cache
+from card import Card
+from cardset import CardSet
+from enums import Draw, HandStrength
+import evaluator
+from evaluator import STRAIGHTS
+
+# Bitmask of the four cards of each rank index, for turning ranks into cards.
+_RANK_CARDS = [0b1111 << (4 * r) for r in range(13)]
+
+def _as_mask(cards):
+    if isinstance(cards, CardSet):
+        return cards.mask
+    mask = 0
+    for c in cards:
+        mask |= 1 << (c if isinstance(c, Card) else Card(c)).id
+    return mask
+
+def _completing(rankmask):
+    # Bitmask of the ranks that would each complete a straight.
+    ranks = 0
+    for straight in STRAIGHTS:
+        missing = straight & ~rankmask
+        if missing.bit_count() == 1:
+            ranks |= missing
+    return ranks
+
+def _made(ids, counts):
+    # The category of the best hand the cards already make.
+    if len(ids) >= 5:
+        return evaluator.strength_of(evaluator.evaluate(ids))
+    groups = sorted(counts, reverse=True)
+    if groups[0] == 4:
+        return HandStrength.FOUR_OF_A_KIND
+    if groups[0] == 3:
+        return HandStrength.THREE_OF_A_KIND
+    if groups[:2] == [2, 2]:
+        return HandStrength.TWO_PAIR
+    return HandStrength.PAIR if groups[0] == 2 else HandStrength.HIGH_CARD
+
+@lru_cache(maxsize=1 << 14)
+def _analyse(mask):
+    # Returns the draws and the bitmask of outs of the cards in `mask`.
+    ids = [i for i in range(52) if mask >> i & 1]
+    if not 3 <= len(ids) <= 6:
+        raise ValueError(f"Expected 3 to 6 cards, but got {len(ids)}.")
+    counts = [0] * 13
+    suits = [0, 0, 0, 0]
+    for i in ids:
+        counts[i >> 2] += 1
+        suits[i & 3] |= 1 << (i >> 2)
+    rankmask = suits[0] | suits[1] | suits[2] | suits[3]
+    made = _made(ids, counts)
+    backdoor = len(ids) <= 5
+
+    draws = set()
+    outs = 0
+    if made.value < HandStrength.STRAIGHT.value:
+        straight_ranks = _completing(rankmask)
+        if straight_ranks.bit_count() >= 2:
+            draws.add(Draw.OPEN_ENDED_STRAIGHT_DRAW)
+        elif straight_ranks:
+            draws.add(Draw.GUTSHOT)
+        elif backdoor and any((straight & rankmask).bit_count() == 3 for straight in STRAIGHTS):
+            draws.add(Draw.BACKDOOR_STRAIGHT_DRAW)
+        for r in range(13):
+            if straight_ranks >> r & 1:
+                outs |= _RANK_CARDS[r]
+    if made.value < HandStrength.FLUSH.value:
+        for s, suit in enumerate(suits):
+            if suit.bit_count() == 4:
+                draws.add(Draw.FLUSH_DRAW)
+                outs |= sum(1 << (4 * r + s) for r in range(13))
+            elif suit.bit_count() == 3 and backdoor:
+                draws.add(Draw.BACKDOOR_FLUSH_DRAW)
+    if made.value < HandStrength.STRAIGHT_FLUSH.value:
+        for s, suit in enumerate(suits):
+            if suit.bit_count() >= 4:
+                straight_ranks = _completing(suit)
+                outs |= sum(1 << (4 * r + s) for r in range(13) if straight_ranks >> r & 1)
+    if Draw.FLUSH_DRAW in draws and draws & {Draw.OPEN_ENDED_STRAIGHT_DRAW, Draw.GUTSHOT}:
+        draws.add(Draw.COMBO_DRAW)
+    if Draw.FLUSH_DRAW in draws:
+        draws.discard(Draw.BACKDOOR_FLUSH_DRAW)
+    return frozenset(draws), outs & ~mask
+
+def find_draws(cards):
+    """Find the straight and flush draws of some cards.
+
+    Parameters
+    ----------
+    cards : iterable or CardSet
+        3 to 6 cards, as `Card` instances and/or labels.
+
+    Raises
+    ------
+    ValueError
+        If there are fewer than 3 or more than 6 cards.
+
+    Returns
+    -------
+    list
+        The `enums.Draw` members that the cards have, strongest first. A
+        flush draw with an open-ended or gutshot straight draw is also a
+        `Draw.COMBO_DRAW`. An open-ended straight draw is any straight draw
+        that two ranks complete, so double gutshots count as well.
+
+    """
+    draws = _analyse(_as_mask(cards))[0]
+    return sorted(draws, key=lambda draw: draw.value, reverse=True)
+
+def has_draw(cards, draw):
+    """Check if some cards have a draw.
+
+    Parameters
+    ----------
+    cards : iterable or CardSet
+        3 to 6 cards, as `Card` instances and/or labels.
+    draw : Draw or str
+        An `enums.Draw` member, or its name.
+
+    Returns
+    -------
+    bool
+        Whether the cards have the draw.
+
+    """
+    if isinstance(draw, str):
+        draw = Draw[draw]
+    return draw in _analyse(_as_mask(cards))[0]
+
+def outs(cards, dead=None):
+    """Find the outs of some cards to a straight or a flush.
+
+    An out is a card that has not been seen which, as the next card, would
+    complete a straight, a flush or a straight flush that beats the best
+    hand that the cards already make. Each card is counted once, however
+    many draws it completes.
+
+    Parameters
+    ----------
+    cards : iterable or CardSet
+        3 to 6 cards, as `Card` instances and/or labels.
+    dead : iterable or CardSet, optional
+        Other cards that have been seen and cannot come, e.g. an opponent's
+        known hole cards. The default is None.
+
+    Raises
+    ------
+    ValueError
+        If there are fewer than 3 or more than 6 cards.
+
+    Returns
+    -------
+    CardSet
+        The outs. Use `len` to count them.
+
+    """
+    mask = _analyse(_as_mask(cards))[1]
+    if dead is not None:
+        mask &= ~_as_mask(dead)
+    return CardSet.from_mask(mask)
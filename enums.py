@@ -75,4 +75,12 @@ class HandStrength(_ExtendedEnum):
     FULL_HOUSE = 6
     FOUR_OF_A_KIND = 7
     STRAIGHT_FLUSH = 8
-    ROYAL_FLUSH = 9
\ No newline at end of file
+    ROYAL_FLUSH = 9
+
+class Draw(_ExtendedEnum):
+    BACKDOOR_STRAIGHT_DRAW = 0
+    BACKDOOR_FLUSH_DRAW = 1
+    GUTSHOT = 2
+    OPEN_ENDED_STRAIGHT_DRAW = 3
+    FLUSH_DRAW = 4
+    COMBO_DRAW = 5
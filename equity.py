@@ -0,0 +1,369 @@
+"""Equity calculation for Texas hold 'em and Omaha.
+
+`equity` calculates each player's share of the pot at showdown, given their
+hole cards and any known board cards. By default it deals random runouts with
+`Deck.deal_batch` and scores every player's 7 cards with
+`batch.evaluate_batch`. Iterations are split into independently seeded shards
+which are run across a pool of processes, and the per-shard counts are then
+merged.
+
+With `exact=True`, it instead enumerates every possible runout (and every
+possible holding of any unknown players). Runouts that are equivalent under
+a suit permutation which fixes the known cards are only scored once, and
+weighted by how many runouts they stand for (see `isomorphism`). Each runout
+is scored once for all players with `batch.evaluate_boards`, in chunks which
+are likewise spread across processes.
+
+Omaha hands (4 or 5 hole cards, of which exactly two must be used) are
+calculated the same way, but scored with `omaha.evaluate_boards`.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, combinations, islice, repeat
+import os
+import numpy as np
+from card import Card
+from cardset import CardSet
+from deck import Deck
+from batch import evaluate_batch, evaluate_boards
+from isomorphism import canonical_mask, stabilizer
+import omaha
+
+# Iterations per vectorised step within a shard.
+STEP_SIZE = 1 << 15
+
+# Approximate number of (holding, runout) pairs per chunk in exact mode.
+CHUNK_SIZE = 1 << 18
+
+class EquityResult:
+    """Equity of each player in a hand, from `equity`.
+
+    Attributes
+    ----------
+    equity : numpy.ndarray
+        Each player's expected share of the pot, with split pots shared
+        equally between the winners.
+    stderr : numpy.ndarray
+        The standard error of each player's equity estimate (zero when the
+        equity was calculated exactly).
+    wins : numpy.ndarray
+        The number of deals that each player won outright.
+    ties : numpy.ndarray
+        The number of deals on which each player split the pot.
+    losses : numpy.ndarray
+        The number of deals that each player lost.
+    iterations : int
+        The number of deals that were evaluated.
+
+    """
+    def __init__(self, wins, ties, losses, shares, squared_shares, exact=False):
+        self.wins = np.asarray(wins, dtype=np.int64)
+        self.ties = np.asarray(ties, dtype=np.int64)
+        self.losses = np.asarray(losses, dtype=np.int64)
+        self.iterations = int(self.wins[0] + self.ties[0] + self.losses[0])
+        n = self.iterations
+        self.equity = shares / n
+        if exact:
+            self.stderr = np.zeros(len(shares))
+        elif n > 1:
+            variance = np.maximum(squared_shares - n * self.equity ** 2, 0) / (n - 1)
+            self.stderr = np.sqrt(variance / n)
+        else:
+            self.stderr = np.full(len(shares), np.nan)
+
+    def __repr__(self):
+        return f"<EquityResult(equity={np.round(self.equity, 4).tolist()}, iterations={self.iterations})>"
+
+def as_ids(cards):
+    """Convert cards or labels into a list of card ids.
+
+    Parameters
+    ----------
+    cards : iterable or None
+        `Card` instances and/or card labels like `'As'`, or None for no cards.
+
+    Returns
+    -------
+    list
+        The id of each card (see `card.Card.id`).
+
+    """
+    if cards is None:
+        return []
+    return [(c if isinstance(c, Card) else Card(c)).id for c in cards]
+
+def _parse_hand(hole_cards_per_player, board, dead, n_hole=None):
+    # Validates the known cards and returns (holes, board, live) id arrays,
+    # with unknown hole cards given as -1.
+    if not 2 <= len(hole_cards_per_player) <= 9:
+        raise ValueError(f"Expected 2 to 9 players, but got {len(hole_cards_per_player)}.")
+
+    known_holes = [as_ids(hole) for hole in hole_cards_per_player if hole is not None]
+    if n_hole is None:
+        n_hole = len(known_holes[0]) if known_holes else 2
+    if n_hole not in (2,) + omaha.HOLE_SIZES:
+        raise ValueError(f"Expected 2, 4 or 5 hole cards per player, but got {n_hole}.")
+
+    holes = []
+    for hole in hole_cards_per_player:
+        ids = as_ids(hole)
+        if hole is not None and len(ids) != n_hole:
+            raise ValueError(f"Each player must have {n_hole} hole cards (or None), but got {len(ids)}.")
+        holes.append(ids or [-1] * n_hole)
+    board = as_ids(board)
+    if len(board) > 5:
+        raise ValueError(f"The board can have at most 5 cards, but got {len(board)}.")
+
+    known = [i for hole in holes for i in hole if i >= 0] + board + as_ids(dead)
+    if len(set(known)) != len(known):
+        raise ValueError("Hole, board and dead cards must all be different.")
+
+    live = (CardSet.full() - CardSet(map(Card.from_id, known))).ids
+    return np.array(holes, dtype=np.int16), np.array(board, dtype=np.uint8), np.array(live, dtype=np.uint8)
+
+def _tally(scores, weights=None):
+    # scores: (players, deals). Returns per-player wins, ties, losses, and
+    # the sum and sum of squares of each player's share of the pot, with
+    # each deal counted `weights` times if given.
+    best = scores.max(axis=0)
+    winners = scores == best
+    n_winners = winners.sum(axis=0)
+    shares = winners / n_winners
+    outcomes = [
+        winners & (n_winners == 1),
+        winners & (n_winners > 1),
+        ~winners,
+        shares,
+        shares ** 2,
+    ]
+    if weights is None:
+        return np.stack([outcome.sum(axis=1) for outcome in outcomes])
+    return np.stack([outcome @ weights for outcome in outcomes])
+
+def _evaluate_boards(boards, holes):
+    # Scores hold 'em or Omaha hole cards on each board, by their number.
+    if holes.shape[-1] == 2:
+        return evaluate_boards(boards, holes)
+    return omaha.evaluate_boards(boards, holes)
+
+def _deal(deck, size, players, n_hole, n_board, exclude, rng):
+    # Deals n_hole cards to each of the players and n_board more board cards.
+    if n_hole == 2:
+        return deck.deal_batch(size, players, n_board, exclude=exclude, rng=rng)
+    _, drawn = deck.deal_batch(size, 0, n_hole * players + n_board, exclude=exclude, rng=rng)
+    return drawn[:, :n_hole * players].reshape(size, players, n_hole), drawn[:, n_hole * players:]
+
+def _simulate(holes, board, live, iterations, seed):
+    # Runs one shard of the simulation, returning the stacked `_tally` totals.
+    rng = np.random.default_rng(seed)
+    unknown = np.flatnonzero(holes[:, 0] < 0)
+    n_hole = holes.shape[1]
+    n_board = 5 - len(board)
+    deck = Deck()
+    known = CardSet.full() - CardSet(map(Card.from_id, live.tolist()))
+
+    totals = np.zeros((5, len(holes)))
+    for start in range(0, iterations, STEP_SIZE):
+        size = min(STEP_SIZE, iterations - start)
+        dealt, runouts = _deal(deck, size, len(unknown), n_hole, n_board, known, rng)
+        boards = np.hstack([np.broadcast_to(board, (size, len(board))), runouts])
+
+        scores = np.empty((len(holes), size), dtype=np.uint16)
+        for player, hole in enumerate(holes):
+            if hole[0] < 0:
+                hole = dealt[:, int(np.searchsorted(unknown, player))]
+            else:
+                hole = np.broadcast_to(hole.astype(np.uint8), (size, n_hole))
+            if n_hole == 2:
+                scores[player] = evaluate_batch(np.hstack([hole, boards]))[0]
+            else:
+                scores[player] = omaha.evaluate_boards(boards, hole[None])[0]
+        totals += _tally(scores)
+    return totals
+
+def iter_runouts(live, n_board, chunk_size):
+    """Iterate over every runout of some cards, in chunks.
+
+    Parameters
+    ----------
+    live : numpy.ndarray
+        The ids of the cards that can be dealt.
+    n_board : int
+        The number of cards in each runout.
+    chunk_size : int
+        The number of runouts in each chunk (the last may have fewer).
+
+    Yields
+    ------
+    numpy.ndarray
+        A `uint8` array of shape `(chunk_size, n_board)` of card ids, each row
+        an `n_board`-card combination of `live`, in lexicographic order. With
+        `n_board` of 0, a single chunk holding the one empty runout.
+
+    """
+    if n_board == 0:
+        yield np.empty((1, 0), dtype=np.uint8)
+        return
+    combos = chain.from_iterable(combinations(live.tolist(), n_board))
+    while True:
+        chunk = np.fromiter(islice(combos, chunk_size * n_board), dtype=np.uint8)
+        if not len(chunk):
+            return
+        yield chunk.reshape(-1, n_board)
+
+def id_masks(cards):
+    """Get the bitmask of the card ids in each row of an array.
+
+    Parameters
+    ----------
+    cards : numpy.ndarray
+        An integer array of shape `(N, K)` of card ids, such as the
+        combinations from `iter_runouts`.
+
+    Returns
+    -------
+    numpy.ndarray
+        A `uint64` array of length `N`, with bit `i` of each row's mask set if
+        card id `i` is in the row (as in `cardset.CardSet.mask`).
+
+    """
+    return (np.uint64(1) << cards.astype(np.uint64)).sum(axis=1, dtype=np.uint64)
+
+def _assignments(holding_masks, n, taken=0):
+    # Yields every tuple of n mutually disjoint holdings, as index tuples.
+    if n == 0:
+        yield ()
+        return
+    for i in np.flatnonzero((holding_masks & np.uint64(taken)) == 0):
+        for rest in _assignments(holding_masks, n-1, taken | int(holding_masks[i])):
+            yield (i,) + rest
+
+def _enumerate(holes, board, live, suit_permutations, runouts):
+    # Tallies every deal with the given runouts, returning `_tally` totals.
+    # Only runouts that are canonical under the suit permutations are scored.
+    weights = None
+    if len(suit_permutations) > 1:
+        canonical, weights = canonical_mask(runouts, suit_permutations)
+        runouts, weights = runouts[canonical], weights[canonical].astype(float)
+
+    boards = np.hstack([np.broadcast_to(board, (len(runouts), len(board))), runouts])
+    known = np.flatnonzero(holes[:, 0] >= 0)
+    unknown = np.flatnonzero(holes[:, 0] < 0)
+    if not len(unknown):
+        return _tally(_evaluate_boards(boards, holes), weights)
+
+    # Every unknown player draws from the same holdings, so each holding is
+    # scored once per runout and shared between them.
+    holdings = np.array(list(combinations(live.tolist(), 2)), dtype=np.uint8)
+    holding_scores = evaluate_boards(boards, holdings)
+    known_scores = evaluate_boards(boards, holes[known])
+    holding_masks = id_masks(holdings)
+    valid = (holding_masks[:, None] & id_masks(runouts)[None, :]) == 0
+
+    totals = np.zeros((5, len(holes)))
+    for fixed in _assignments(holding_masks, len(unknown) - 1):
+        taken = np.uint64(sum(int(holding_masks[i]) for i in fixed))
+        deals = valid & ((holding_masks & taken) == 0)[:, None]
+        for i in fixed:
+            deals &= valid[i]
+        last, runout = np.nonzero(deals)
+
+        scores = np.empty((len(holes), len(last)), dtype=np.uint16)
+        scores[known] = known_scores[:, runout]
+        for player, i in zip(unknown, fixed):
+            scores[player] = holding_scores[i, runout]
+        scores[unknown[-1]] = holding_scores[last, runout]
+        totals += _tally(scores, None if weights is None else weights[runout])
+    return totals
+
+def equity(hole_cards_per_player, board=None, dead=None, iterations=100_000, workers=None, seed=None, exact=False,
+           n_hole=None):
+    """Calculate each player's equity, by Monte Carlo simulation or exactly.
+
+    Parameters
+    ----------
+    hole_cards_per_player : list
+        One entry per player (2 to 9 players): a list or `CardSet` of their
+        hole cards as `Card` instances or labels, or None if the player's
+        hole cards are unknown (in which case they are dealt at random).
+    board : list, optional
+        Known community cards, from 0 to 5 cards. The default is None.
+    dead : list, optional
+        Cards known to be out of play, e.g. folded or burnt cards. The
+        default is None.
+    iterations : int, optional
+        The number of random deals to evaluate. Ignored if `exact` is True. 
+        The default is 100000.
+    workers : int, optional
+        The number of processes to run the simulation on. The default is
+        None, which uses one per CPU. With a single worker, the simulation
+        runs in the calling process.
+    seed : int, optional
+        Seed for the random number generator, for reproducible results. The
+        default is None.
+    exact : bool, optional
+        Whether to enumerate every possible deal and return exact equities 
+        instead of simulating. This is fast with known hole cards (a 
+        heads-up preflop enumeration takes a few seconds), but every unknown 
+        player multiplies the work by the number of holdings they could 
+        have. The default is False.
+    n_hole : int, optional
+        The number of hole cards per player: 2 for hold 'em, or 4 or 5 for
+        Omaha, where each hand must use exactly two of them and three board
+        cards (see `omaha`). The default is None, which takes the number
+        from the known hole cards (or 2 if there are none).
+
+    Raises
+    ------
+    ValueError
+        If there are fewer than 2 or more than 9 players, a player does not
+        have `n_hole` hole cards, the board has more than 5 cards, any card
+        is given more than once, `iterations` is less than 1, or an exact
+        Omaha calculation has unknown players.
+
+    Returns
+    -------
+    EquityResult
+        The equity of each player, in the order they were given.
+
+    """
+    holes, board, live = _parse_hand(hole_cards_per_player, board, dead, n_hole)
+    workers = workers or os.cpu_count() or 1
+    if exact and holes.shape[1] > 2 and (holes[:, 0] < 0).any():
+        raise ValueError("Exact Omaha equity needs every player's hole cards.")
+    if exact:
+        return _exact(holes, board, live, workers)
+    if iterations < 1:
+        raise ValueError(f"Expected at least 1 iteration, but got {iterations}.")
+
+    # Several shards per worker evens out the load between processes.
+    n_shards = min(iterations, workers if workers == 1 else 4 * workers)
+    shard_sizes = [iterations // n_shards + (i < iterations % n_shards) for i in range(n_shards)]
+    seeds = np.random.SeedSequence(seed).spawn(n_shards)
+
+    args = [(holes, board, live, size, s) for size, s in zip(shard_sizes, seeds)]
+    if workers == 1:
+        totals = sum(_simulate(*a) for a in args)
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            totals = sum(pool.map(_simulate, *zip(*args)))
+    return EquityResult(*totals)
+
+def _exact(holes, board, live, workers):
+    # Exact equity, with chunks of runouts spread across processes.
+    n_unknown = int((holes[:, 0] < 0).sum())
+    n_holdings = len(live) * (len(live) - 1) // 2 if n_unknown else 1
+    chunks = iter_runouts(live, 5 - len(board), max(1, CHUNK_SIZE // n_holdings))
+
+    # Suit permutations that leave each player's known cards, the board and
+    # the dead cards where they are.
+    known = [hole for hole in holes.tolist() if hole[0] >= 0] + [board.tolist()]
+    dead = set(range(52)).difference(live.tolist(), *known)
+    suit_permutations = stabilizer(*[map(Card.from_id, ids) for ids in known + [dead]])
+
+    args = (repeat(holes), repeat(board), repeat(live), repeat(suit_permutations), chunks)
+    if workers == 1:
+        totals = sum(map(_enumerate, *args))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            totals = sum(pool.map(_enumerate, *args))
+    return EquityResult(*totals, exact=True)
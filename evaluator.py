@@ -0,0 +1,413 @@
+"""Lookup-table evaluation of 5-card poker hands.
+
+Every 5-card hand belongs to one of 7462 equivalence classes (e.g. all
+`A-K-Q-J-9` non-flush hands are equivalent, whatever their suits). This
+module numbers those classes from 1 (`7-5-4-3-2`, the weakest high card) to
+7462 (the royal flush), so that a higher score is always a stronger hand, and
+maps any 5 cards to their score in a handful of table lookups:
+
+    - Flushes are looked up by the bitmask of their ranks.
+    - Other hands with five distinct ranks (high cards and straights) are
+      looked up by the same bitmask in a second table.
+    - Everything else (hands with a repeated rank) is looked up by the
+      product of a prime number per card rank, which is unique to each
+      multiset of ranks.
+
+Hands of 5 to 7 cards can also be scored directly, by their best 5-card
+hand, without enumerating their 5-card subsets (see `evaluate`). This uses
+two larger tables, built once and saved to `CACHE_DIR`, which are then
+memory-mapped whenever this module is imported:
+
+    - The best flush (or straight flush) for every bitmask of ranks in one
+      suit.
+    - The best non-flush hand for every multiset of 5, 6 or 7 ranks, indexed
+      by a perfect hash of the per-rank card counts.
+
+Cards are referred to by their integer ids (see `card.Card.id`).
+"""
+from array import array
+from itertools import combinations
+import mmap
+import os
+from enums import HandStrength
+
+NUM_CLASSES = 7462
+
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# Rank bitmasks (bit 0 is a two, bit 12 an ace) for the ten straights, from
+# the wheel (A-2-3-4-5) up to broadway (T-J-Q-K-A).
+STRAIGHTS = (0b1000000001111,) + tuple(0b11111 << i for i in range(9))
+
+def _rankmask(ranks):
+    mask = 0
+    for r in ranks:
+        mask |= 1 << r
+    return mask
+
+def _hand_classes():
+    # Yields (HandStrength, ranks) for each equivalence class, weakest first.
+    # Ranks are rank indexes (0 for a two, 12 for an ace) of all five cards,
+    # ordered by their importance when breaking ties, e.g. (5, 5, 12, 9, 2)
+    # for a pair of sevens with A-J-4 kickers.
+    descending = range(12, -1, -1)
+    straights = set(STRAIGHTS)
+    distinct = [r for r in sorted(combinations(descending, 5)) if _rankmask(r) not in straights]
+    straight_ranks = [(3, 2, 1, 0, 12)] + [tuple(range(i+4, i-1, -1)) for i in range(9)]
+
+    def kickers(n, *exclude):
+        return sorted(combinations([r for r in descending if r not in exclude], n))
+
+    for ranks in distinct:
+        yield HandStrength.HIGH_CARD, ranks
+    for p in range(13):
+        for k in kickers(3, p):
+            yield HandStrength.PAIR, (p, p) + k
+    for hi in range(13):
+        for lo in range(hi):
+            for k in kickers(1, hi, lo):
+                yield HandStrength.TWO_PAIR, (hi, hi, lo, lo) + k
+    for t in range(13):
+        for k in kickers(2, t):
+            yield HandStrength.THREE_OF_A_KIND, (t, t, t) + k
+    for ranks in straight_ranks:
+        yield HandStrength.STRAIGHT, ranks
+    for ranks in distinct:
+        yield HandStrength.FLUSH, ranks
+    for t in range(13):
+        for p in kickers(1, t):
+            yield HandStrength.FULL_HOUSE, (t, t, t) + p + p
+    for q in range(13):
+        for k in kickers(1, q):
+            yield HandStrength.FOUR_OF_A_KIND, (q, q, q, q) + k
+    for ranks in straight_ranks[:-1]:
+        yield HandStrength.STRAIGHT_FLUSH, ranks
+    yield HandStrength.ROYAL_FLUSH, straight_ranks[-1]
+
+_CLASSES = [None] + list(_hand_classes())
+_FLUSH = [0] * 8192
+_UNIQUE5 = [0] * 8192
+_PRODUCTS = {}
+_CATEGORIES = [None]
+
+for _score, (_strength, _ranks) in enumerate(_CLASSES[1:], 1):
+    _CATEGORIES.append(_strength)
+    if _strength in (HandStrength.HIGH_CARD, HandStrength.STRAIGHT):
+        _UNIQUE5[_rankmask(_ranks)] = _score
+    elif _strength in (HandStrength.FLUSH, HandStrength.STRAIGHT_FLUSH, HandStrength.ROYAL_FLUSH):
+        _FLUSH[_rankmask(_ranks)] = _score
+    else:
+        _product = 1
+        for _r in _ranks:
+            _product *= PRIMES[_r]
+        _PRODUCTS[_product] = _score
+del _score, _strength, _ranks, _r, _product
+
+assert len(_CLASSES) - 1 == NUM_CLASSES
+
+# Per-card codes packing everything the evaluator needs into one integer:
+# the rank bit in bits 16-28, one bit per suit in bits 12-15, the rank index
+# in bits 8-11 and the rank prime in bits 0-7.
+CARD_CODES = tuple(
+    PRIMES[i >> 2] | ((i >> 2) << 8) | (1 << (12 + (i & 3))) | (1 << (16 + (i >> 2)))
+    for i in range(52)
+)
+
+def evaluate5(a, b, c, d, e):
+    """Score a 5-card hand.
+
+    Parameters
+    ----------
+    a, b, c, d, e : int
+        Ids of the five (distinct) cards (see `card.Card.id`).
+
+    Returns
+    -------
+    int
+        The equivalence class of the hand, from 1 (weakest) to 7462 (a royal
+        flush).
+
+    """
+    a = CARD_CODES[a]
+    b = CARD_CODES[b]
+    c = CARD_CODES[c]
+    d = CARD_CODES[d]
+    e = CARD_CODES[e]
+    bits = (a | b | c | d | e) >> 16
+    if a & b & c & d & e & 0xF000:
+        return _FLUSH[bits]
+    score = _UNIQUE5[bits]
+    if score:
+        return score
+    return _PRODUCTS[(a & 0xFF) * (b & 0xFF) * (c & 0xFF) * (d & 0xFF) * (e & 0xFF)]
+
+def evaluate_cards(cards):
+    """Score a 5-card hand given as `Card` instances.
+
+    Parameters
+    ----------
+    cards : iterable
+        Exactly five distinct `Card` instances.
+
+    Returns
+    -------
+    int
+        The equivalence class of the hand (see `evaluate5`).
+
+    """
+    return evaluate5(*[card.id for card in cards])
+
+def _class_key(strength, ranks):
+    # Packs the category and the distinct ranks (as `enums.Rank` values, in
+    # tiebreak order, with a wheel's ace as 1) into 4-bit fields.
+    key = strength.value
+    groups = list(dict.fromkeys(r + 2 for r in ranks))
+    if groups == [5, 4, 3, 2, 14]:
+        groups = [5, 4, 3, 2, 1]
+    for r in groups + [0] * (5 - len(groups)):
+        key = (key << 4) | r
+    return key
+
+_KEYS = [0] + [_class_key(strength, ranks) for strength, ranks in _CLASSES[1:]]
+
+def strength_of(score):
+    """Get the hand strength category of a score.
+
+    Parameters
+    ----------
+    score : int
+        A score from `evaluate5`, in the range (1, 7462).
+
+    Returns
+    -------
+    enums.HandStrength
+        The category of hands that the score belongs to.
+
+    """
+    return _CATEGORIES[score]
+
+def key_of(score):
+    """Get the comparison key of a score.
+    
+    Keys order hands exactly as scores do, but are built the same way as 
+    `hand.Hand.key`, so that they can also be compared with hands of fewer 
+    than five cards.
+
+    Parameters
+    ----------
+    score : int
+        A score from `evaluate5`, in the range (1, 7462).
+
+    Returns
+    -------
+    int
+        The `enums.HandStrength` value in bits 20 and up, followed by the 
+        ranks that break ties within that category, 4 bits each.
+
+    """
+    return _KEYS[score]
+
+
+CACHE_DIR = os.environ.get(
+    'POKER_FRAME_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'poker-frame')
+)
+
+def cache_path(filename):
+    """Get the path of a file in the table cache directory.
+
+    The directory is `~/.cache/poker-frame` unless overridden by the 
+    `POKER_FRAME_CACHE` environment variable.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the cached file.
+
+    Returns
+    -------
+    str
+        Absolute path to the file in `CACHE_DIR`.
+
+    """
+    return os.path.join(CACHE_DIR, filename)
+
+# _MULTISETS[i][m]: the number of ways that ranks i to 12 can hold m cards,
+# with at most four cards of each rank.
+_MULTISETS = [[0] * 8 for _ in range(14)]
+_MULTISETS[13][0] = 1
+for _i in range(12, -1, -1):
+    for _m in range(8):
+        _MULTISETS[_i][_m] = sum(_MULTISETS[_i+1][_m-c] for c in range(min(4, _m)+1))
+
+# _OFFSETS[i][m][c]: how far rank i holding c of the m cards left moves the
+# hash. Summing these over the ranks numbers each multiset of n ranks in
+# lexicographic order, from 0 to _MULTISETS[0][n] - 1.
+_OFFSETS = [
+    [[sum(_MULTISETS[_i+1][_m-j] for j in range(c)) for c in range(min(4, _m)+1)] for _m in range(8)]
+    for _i in range(13)
+]
+del _i, _m
+
+def _multiset_index(counts, n):
+    index = 0
+    for i, c in enumerate(counts):
+        if c:
+            index += _OFFSETS[i][n][c]
+            n -= c
+    return index
+
+def _multisets(n, i=0):
+    # Yields every list of per-rank counts, from rank i upwards, summing to n.
+    if i == 12:
+        if n <= 4:
+            yield [n]
+        return
+    for c in range(min(4, n)+1):
+        for rest in _multisets(n-c, i+1):
+            yield [c] + rest
+
+def _best_flush(mask):
+    # Best straight flush or flush made from a suit holding the ranks in mask.
+    for straight in reversed(STRAIGHTS):
+        if mask & straight == straight:
+            return _FLUSH[straight]
+    while mask.bit_count() > 5:
+        mask &= mask - 1
+    return _FLUSH[mask]
+
+def _best_nonflush(counts):
+    ranks = [r for r, c in enumerate(counts) for _ in range(c)]
+    best = 0
+    for five in combinations(ranks, 5):
+        mask = _rankmask(five)
+        if mask.bit_count() == 5:
+            score = _UNIQUE5[mask]
+        else:
+            product = 1
+            for r in five:
+                product *= PRIMES[r]
+            score = _PRODUCTS[product]
+        best = max(best, score)
+    return best
+
+_TABLE_MAGIC = b'PFEVAL01'
+_TABLE_FILE = 'eval7-v1.bin'
+_TABLE_SIZES = (8192,) + tuple(_MULTISETS[0][n] for n in (5, 6, 7))
+
+def _table_bytes():
+    tables = array('H', (_best_flush(m) if m.bit_count() >= 5 else 0 for m in range(8192)))
+    for n in (5, 6, 7):
+        nonflush = array('H', bytes(2 * _MULTISETS[0][n]))
+        for counts in _multisets(n):
+            nonflush[_multiset_index(counts, n)] = _best_nonflush(counts)
+        tables.extend(nonflush)
+    return _TABLE_MAGIC + tables.tobytes()
+
+def build_tables(path=None):
+    """Build the 5 to 7 card lookup tables and save them to disk.
+    
+    This happens automatically the first time this module is imported, so 
+    is only needed to rebuild or relocate the tables.
+
+    Parameters
+    ----------
+    path : str, optional
+        Where to save the tables. The default is None, which saves them to 
+        the cache directory (see `cache_path`).
+
+    Returns
+    -------
+    str
+        The path of the saved table file.
+
+    """
+    path = path or cache_path(_TABLE_FILE)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(_table_bytes())
+    os.replace(tmp, path)
+    return path
+
+def _map_tables(path):
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(buffer) != len(_TABLE_MAGIC) + 2 * sum(_TABLE_SIZES) or buffer[:len(_TABLE_MAGIC)] != _TABLE_MAGIC:
+        buffer.close()
+        raise ValueError(f"Stale or corrupt evaluator tables: {path}")
+    return buffer
+
+def _load_tables():
+    # Memory-map the table file, building it first if it is missing or stale.
+    path = cache_path(_TABLE_FILE)
+    try:
+        buffer = _map_tables(path)
+    except (OSError, ValueError):
+        try:
+            buffer = _map_tables(build_tables(path))
+        except OSError:
+            # The cache is not writable, so keep the tables in memory instead.
+            buffer = _table_bytes()
+
+    tables = memoryview(buffer)[len(_TABLE_MAGIC):].cast('H')
+    start = 0
+    for size in _TABLE_SIZES:
+        yield tables[start:start+size]
+        start += size
+
+_FLUSH_BEST, _NONFLUSH5, _NONFLUSH6, _NONFLUSH7 = _load_tables()
+_NONFLUSH = (None, None, None, None, None, _NONFLUSH5, _NONFLUSH6, _NONFLUSH7)
+
+def evaluate(ids):
+    """Score the best 5-card hand that can be made from several cards.
+
+    Parameters
+    ----------
+    ids : sequence
+        Ids of at least five distinct cards (see `card.Card.id`). Hands of 
+        up to 7 cards are scored directly from the lookup tables; larger 
+        hands are scored by their best 7-card subset.
+
+    Returns
+    -------
+    int
+        The equivalence class of the best 5-card hand (see `evaluate5`).
+
+    """
+    n = len(ids)
+    if n > 7:
+        return max(evaluate(seven) for seven in combinations(ids, 7))
+    counts = [0] * 13
+    suits = [0, 0, 0, 0]
+    for i in ids:
+        r = i >> 2
+        counts[r] += 1
+        suits[i & 3] |= 1 << r
+    return evaluate_counts(counts, suits, n)
+
+def evaluate_counts(counts, suits, n):
+    """Score the best 5-card hand from per-rank counts and per-suit ranks.
+    
+    This is what `evaluate` uses once it has tallied the cards, and can be 
+    used directly by callers that maintain these tallies themselves.
+
+    Parameters
+    ----------
+    counts : list
+        The number of cards of each rank, from twos to aces (13 values).
+    suits : list
+        A bitmask of the ranks held in each suit, in `enums.Suit` order.
+    n : int
+        The total number of cards, from 5 to 7.
+
+    Returns
+    -------
+    int
+        The equivalence class of the best 5-card hand (see `evaluate5`).
+
+    """
+    # With at most 7 cards, a flush beats anything else that can be made.
+    for suit in suits:
+        if suit.bit_count() >= 5:
+            return _FLUSH_BEST[suit]
+    return _NONFLUSH[n][_multiset_index(counts, n)]
@@ -1,7 +1,14 @@
 from collections import Counter
 from itertools import combinations
 from card import Card
-from enums import HandStrength
+from cardset import CardSet
+from enums import Draw, HandStrength
+import draws
+import evaluator
+import handclass
+
+# Marks lazily computed attributes that have not been computed yet.
+_UNSET = object()
 
 class Hand:
     """A poker hand.
@@ -10,16 +17,28 @@ class Hand:
     ----
     Hands are compared first according to `enums.Handstrength` rankings, but 
     if they are the same ranking, then additional checks are made to determine 
-    which hand if any is stronger than the other within the same rank.
+    which hand if any is stronger than the other within the same rank. Both 
+    are encoded in a single integer, `Hand.key`, which all comparisons and 
+    hashing use, so equal-strength hands are interchangeable as dict keys.
+    
+    Complete 5-card hands are classified with the lookup-table evaluator in 
+    `evaluator`, which also gives each hand an integer `score` (see 
+    `evaluator.evaluate5`). The original `is_*` predicates are kept as a 
+    reference implementation, see `Hand.classify_hand`.
+    
+    Hands are computed lazily: the strength is only classified, the cards 
+    only sorted by strength, and the kickers only split out, the first time 
+    that each is needed, and the results are kept. Hands that are only ever 
+    compared are never sorted.
 
     Parameters
     ----------
     labels : list, optional
         A list of card string labels, like `As`, or `2c`, from which to create 
         the hand. The default is None.
-    cards : list, optional
-        A list of `Card` instances if these have already been created. The 
-        default is None.
+    cards : list or CardSet, optional
+        A list of `Card` instances if these have already been created, or a 
+        `CardSet`. The default is None.
 
     Raises
     ------
@@ -29,6 +48,11 @@ class Hand:
         If number of labels is less than 1 or greater than 5.
 
     """
+    __slots__ = (
+        '_cards', '_sorted', '_category', '_score', '_draws', '_kicker_cards', 
+        '_ranks', '_rankhist', '_components', '_key', '_current_index'
+    )
+    
     def __init__(self, labels: list=None, cards: Card=None):
         if labels is not None:
             if len(set(labels)) != len(labels):
@@ -42,28 +66,17 @@ class Hand:
         elif (labels is None) and (cards is None):
             raise ValueError("Expected either `label`, or both of `rank` and `suit`.")
 
-        self.cards = cards
-        self._strength = None
+        self._cards = list(cards)
+        self._sorted = False
+        self._category = None
+        self._score = None
         self._draws = None
+        self._kicker_cards = _UNSET
+        self._ranks = None
+        self._rankhist = None
+        self._components = None
+        self._key = None
         self._current_index = 0
-        self._rank_funcs = {
-            HandStrength.ROYAL_FLUSH.name: self.is_royal_flush,
-            HandStrength.STRAIGHT_FLUSH.name: self.is_straight_flush,
-            HandStrength.FOUR_OF_A_KIND.name: self.is_four_of_a_kind,
-            HandStrength.FULL_HOUSE.name: self.is_full_house,
-            HandStrength.FLUSH.name: self.is_flush,
-            HandStrength.STRAIGHT.name: self.is_straight,
-            HandStrength.THREE_OF_A_KIND.name: self.is_three_of_a_kind,
-            HandStrength.TWO_PAIR.name: self.is_twopair,
-            HandStrength.PAIR.name: self.is_pair,
-        }
-        self._draw_funcs = {
-            
-        }
-        
-        self.classify_hand()
-        self.sort_by_strength()
-        _, self._kicker_cards = self._kickersplit()
     
     def __iter__(self):
         return self
@@ -80,88 +93,58 @@ class Hand:
         return self.cards[i]
     
     def __len__(self):
-        return len(self.cards)
+        return len(self._cards)
     
     def __repr__(self):
         return f"<Hand({self.labels})>"
     
+    def __hash__(self):
+        return hash(self.key)
+    
     def __lt__(self, other):
-        if self._strength.value == other._strength.value:
-            for l1, l2 in zip(self.components, other.components):
-                if l1[0] > l2[0]:
-                    return False
-                elif l1[0] == l2[0]:
-                    continue
-                else:
-                    return True
-            return False
-        else:
-            return self._strength.value < other._strength.value
+        if not isinstance(other, Hand):
+            return NotImplemented
+        return self.key < other.key
     
     def __le__(self, other):
-        if self._strength.value == other._strength.value:
-            for l1, l2 in zip(self.components, other.components):
-                if l1[0] > l2[0]:
-                    return False
-                elif l1[0] == l2[0]:
-                    continue
-                else:
-                    return True
-            return True
-        else:
-            return self._strength.value <= other._strength.value
+        if not isinstance(other, Hand):
+            return NotImplemented
+        return self.key <= other.key
 
     def __eq__(self, other):
-        if self._strength.value == other._strength.value:
-            for l1, l2 in zip(self.components, other.components):
-                if l1[0] > l2[0]:
-                    return False
-                elif l1[0] == l2[0]:
-                    continue
-                else:
-                    return False
-            return True
-        else:
-            return False
+        if not isinstance(other, Hand):
+            return NotImplemented
+        return self.key == other.key
 
     def __ne__(self, other):
-        if self._strength.value == other._strength.value:
-            for l1, l2 in zip(self.components, other.components):
-                if l1[0] > l2[0]:
-                    return True
-                elif l1[0] == l2[0]:
-                    continue
-                else:
-                    return True
-            return False
-        else:
-            return True
+        if not isinstance(other, Hand):
+            return NotImplemented
+        return self.key != other.key
     
     def __ge__(self, other):
-        if self._strength.value == other._strength.value:
-            for l1, l2 in zip(self.components, other.components):
-                if l1[0] > l2[0]:
-                    return True
-                elif l1[0] == l2[0]:
-                    continue
-                else:
-                    return False
-            return True
-        else:
-            return self._strength.value >= other._strength.value
+        if not isinstance(other, Hand):
+            return NotImplemented
+        return self.key >= other.key
     
     def __gt__(self, other):
-        if self._strength.value == other._strength.value:
-            for l1, l2 in zip(self.components, other.components):
-                if l1[0] > l2[0]:
-                    return True
-                elif l1[0] == l2[0]:
-                    continue
-                else:
-                    return False
-            return False
-        else:
-            return self._strength.value > other._strength.value
+        if not isinstance(other, Hand):
+            return NotImplemented
+        return self.key > other.key
+    
+    @property
+    def cards(self):
+        """list: The cards in the hand, sorted by strength (see 
+        `Hand.sort_by_strength`)."""
+        if not self._sorted:
+            self.sort_by_strength()
+        return self._cards
+    
+    @property
+    def _strength(self):
+        # The hand's `enums.HandStrength`, classifying the hand if needed.
+        if self._category is None:
+            self.classify_hand()
+        return self._category
     
     @property
     def labels(self):
@@ -175,6 +158,11 @@ class Hand:
         """
         return [c.label for c in self]
     
+    @property
+    def cardset(self):
+        """CardSet: The cards in the hand, as a `CardSet`."""
+        return CardSet(self.cards)
+    
     @property
     def ranks(self):
         """Ranks for each card in the hand.
@@ -187,7 +175,9 @@ class Hand:
             values are sorted in descending order.
 
         """
-        return sorted( [c.rank for c in self], reverse=True )
+        if self._ranks is None:
+            self._ranks = sorted( [c.rank for c in self._cards], reverse=True )
+        return list(self._ranks)
     
     @property
     def suits(self):
@@ -200,7 +190,7 @@ class Hand:
             names of the `enums.Suit` enum (e.g. 'SPADES').
 
         """
-        return [c.suit for c in self.cards]
+        return [c.suit for c in self._cards]
     
     @property
     def rankhist(self):
@@ -217,7 +207,9 @@ class Hand:
             are the corresponding counts.
 
         """
-        return dict(Counter( self.ranks ).most_common())
+        if self._rankhist is None:
+            self._rankhist = dict(Counter( self.ranks ).most_common())
+        return dict(self._rankhist)
     
     @property
     def suithist(self):
@@ -247,16 +239,94 @@ class Hand:
         """
         return self._strength.name
     
+    @property
+    def score(self):
+        """int: The hand's equivalence class from `evaluator.evaluate5`, from 
+        1 (weakest) to 7462 (royal flush), or None if the hand has fewer than 
+        5 cards or was classified with the reference predicates."""
+        if self._category is None:
+            self.classify_hand()
+        return self._score
+    
+    @property
+    def description(self):
+        """str: The hand's equivalence class, e.g. `'Pair of Sevens, A-J-4'` 
+        (see `handclass.describe`), or None if it has no score."""
+        return None if self.score is None else handclass.describe(self._score)
+    
+    @property
+    def percentile(self):
+        """float: The fraction of all 5-card hands that this hand beats (see 
+        `handclass.percentile`), or None if it has no score."""
+        return None if self.score is None else handclass.percentile(self._score, 5)
+    
+    @property
+    def key(self):
+        """int: An integer that orders hands by strength.
+        
+        The `enums.HandStrength` value is stored in bits 20 and up, followed 
+        by the rank of each component (see `Hand.components`) in 4 bits each, 
+        with the ace of a wheel straight counted as 1. For complete hands 
+        this is looked up from the score (see `evaluator.key_of`).
+        """
+        if self._key is None:
+            if self.score is not None:
+                self._key = evaluator.key_of(self._score)
+            else:
+                key = self._strength.value
+                ranks = list(self.rankhist)
+                if ranks == [14, 5, 4, 3, 2] and self._strength in (HandStrength.STRAIGHT, HandStrength.STRAIGHT_FLUSH):
+                    ranks = [5, 4, 3, 2, 1]
+                for rank in ranks + [0] * (5 - len(ranks)):
+                    key = (key << 4) | rank
+                self._key = key
+        return self._key
+    
     @property
     def draws(self):
-        return self._draws
+        """list: The straight and flush draws of the hand, as `enums.Draw` 
+        members, strongest first (see `draws.find_draws`). Empty unless the 
+        hand has 3 to 6 cards."""
+        if self._draws is None:
+            self._draws = [
+                Draw[name] for name, fun in self._draw_funcs.items() if fun(self)
+            ]
+        return list(self._draws)
+    
+    def outs(self, dead=None):
+        """Find the cards that would complete a straight or flush draw.
+        
+        See `draws.outs` for details.
+
+        Parameters
+        ----------
+        dead : list or CardSet, optional
+            Cards that have been seen elsewhere and cannot come. The default 
+            is None.
+
+        Raises
+        ------
+        ValueError
+            If the hand does not have 3 to 6 cards.
+
+        Returns
+        -------
+        CardSet
+            The outs.
+
+        """
+        return draws.outs(self._cards, dead)
     
     @property
     def components(self):
-        return [self.get_by_rank(k) for k in self.rankhist]
+        if self._components is None:
+            self._components = tuple(tuple(self.get_by_rank(k)) for k in self.rankhist)
+        return [list(comp) for comp in self._components]
     
     @property
     def kicker(self):
+        if self._kicker_cards is _UNSET:
+            _, self._kicker_cards = self._kickersplit()
         return self._kicker_cards
     
     def get_by_rank(self, rank):
@@ -303,11 +373,20 @@ class Hand:
         """
         x = []
         for rank in self.rankhist:
-            x.extend(self.get_by_rank(rank))
-        self.cards = x
+            x.extend([c for c in self._cards if c.rank == rank])
+        self._cards = x
+        self._sorted = True
     
-    def classify_hand(self):
+    def classify_hand(self, lookup=True):
         """Classify strength of hand.
+        
+        Parameters
+        ----------
+        lookup : bool, optional
+            Whether to use the lookup-table evaluator (see `evaluator`). If 
+            False, the hand is classified by running the `is_*` predicates in 
+            order of strength instead, which is much slower but kept as a 
+            reference implementation. The default is True.
 
         Returns
         -------
@@ -316,12 +395,18 @@ class Hand:
         """
         # if len(self) == 5: classify_madehand() else classify_draw()
         if len(self) == 5:
+            if lookup:
+                self._score = evaluator.evaluate_cards(self._cards)
+                self._category = evaluator.strength_of(self._score)
+                return
+            
+            self._score = None
             for handstrength, fun in self._rank_funcs.items():
-                if fun():
-                    self._strength = HandStrength[handstrength]
+                if fun(self):
+                    self._category = HandStrength[handstrength]
                     return
 
-        self._strength = HandStrength.HIGH_CARD
+        self._category = HandStrength.HIGH_CARD
     
     def has(self, label):
         """Check if the hand contains a card.
@@ -472,18 +557,125 @@ class Hand:
 
         """
         return self.is_straight_flush() and max(self.ranks) == 14
+    
+    def _has_draw(self, draw):
+        return 3 <= len(self._cards) <= 6 and draws.has_draw(self._cards, draw)
+    
+    def is_combo_draw(self):
+        """Check if the hand has a flush draw and a straight draw.
+
+        Returns
+        -------
+        bool
+            Whether or not the hand has a combo draw.
+
+        """
+        return self._has_draw(Draw.COMBO_DRAW)
+    
+    def is_flush_draw(self):
+        """Check if the hand has four cards of a suit, and no better hand.
+
+        Returns
+        -------
+        bool
+            Whether or not the hand has a flush draw.
+
+        """
+        return self._has_draw(Draw.FLUSH_DRAW)
+    
+    def is_open_ended_straight_draw(self):
+        """Check if either of two ranks would complete a straight.
+        
+        A hand like `Hand(['Js', 'Ts', '9h', '8c', '2d'])` is completed by any 
+        queen or seven. Double gutshots, like `Hand(['Js', '9s', '8h', '7c', 
+        '5d'])`, also count.
+
+        Returns
+        -------
+        bool
+            Whether or not the hand has an open-ended straight draw.
+
+        """
+        return self._has_draw(Draw.OPEN_ENDED_STRAIGHT_DRAW)
+    
+    def is_gutshot(self):
+        """Check if exactly one rank would complete a straight.
+
+        Returns
+        -------
+        bool
+            Whether or not the hand has a gutshot straight draw.
+
+        """
+        return self._has_draw(Draw.GUTSHOT)
+    
+    def is_backdoor_flush_draw(self):
+        """Check if the next two cards could complete a flush.
+
+        Returns
+        -------
+        bool
+            Whether or not the hand has a backdoor flush draw.
+
+        """
+        return self._has_draw(Draw.BACKDOOR_FLUSH_DRAW)
+    
+    def is_backdoor_straight_draw(self):
+        """Check if the next two cards could complete a straight.
+
+        Returns
+        -------
+        bool
+            Whether or not the hand has a backdoor straight draw, and no 
+            better straight draw.
+
+        """
+        return self._has_draw(Draw.BACKDOOR_STRAIGHT_DRAW)
+    
+    # Predicates for `classify_hand`, strongest first.
+    _rank_funcs = {
+        HandStrength.ROYAL_FLUSH.name: is_royal_flush,
+        HandStrength.STRAIGHT_FLUSH.name: is_straight_flush,
+        HandStrength.FOUR_OF_A_KIND.name: is_four_of_a_kind,
+        HandStrength.FULL_HOUSE.name: is_full_house,
+        HandStrength.FLUSH.name: is_flush,
+        HandStrength.STRAIGHT.name: is_straight,
+        HandStrength.THREE_OF_A_KIND.name: is_three_of_a_kind,
+        HandStrength.TWO_PAIR.name: is_twopair,
+        HandStrength.PAIR.name: is_pair,
+    }
+    # Predicates for `Hand.draws`, strongest first.
+    _draw_funcs = {
+        Draw.COMBO_DRAW.name: is_combo_draw,
+        Draw.FLUSH_DRAW.name: is_flush_draw,
+        Draw.OPEN_ENDED_STRAIGHT_DRAW.name: is_open_ended_straight_draw,
+        Draw.GUTSHOT.name: is_gutshot,
+        Draw.BACKDOOR_FLUSH_DRAW.name: is_backdoor_flush_draw,
+        Draw.BACKDOOR_STRAIGHT_DRAW.name: is_backdoor_straight_draw,
+    }
 
 
 class HandSpace:
     """A hand space.
     
     Space of all possible holdings given a set of cards.
+    
+    The strength of the best hand is looked up directly from all of the 
+    cards (see `evaluator.evaluate`) when the space is created. The best 
+    `Hand` itself, and the full set of hands in `.hands`, are only built 
+    when they are first accessed.
+    
+    The per-rank counts and per-suit ranks of the cards are kept, so that 
+    dealing another community card with `add_community` only updates them 
+    and looks the new score up again (see `evaluator.evaluate_counts`). To 
+    deal several runouts from the same flop, `copy` the flop's hand space 
+    for each one.
 
     Parameters
     ----------
-    hole_cards : list
+    hole_cards : list or CardSet
         A pair of two hole cards.
-    community_cards : list, optional
+    community_cards : list or CardSet, optional
         List of community cards. The default is None.
 
     Returns
@@ -494,22 +686,161 @@ class HandSpace:
 
     def __init__(self, hole_cards: list, community_cards: list = None):
         
-        self.hole_cards = hole_cards
-        self.community_cards = community_cards or []
+        self.hole_cards = list(hole_cards)
+        self.community_cards = list(community_cards or [])
         self.space = sorted( self.hole_cards + self.community_cards, reverse=True )
-        self._hands = {x: [] for x in HandStrength.values()}
-        self.find_best_hand()
+        self._counts = [0] * 13
+        self._suits = [0, 0, 0, 0]
+        for card in self.space:
+            self._tally(card.id)
+        self._hands = None
+        self._best_hand = None
+        self._score = None
+        if len(self.space) >= 5:
+            self._score = evaluator.evaluate([c.id for c in self.space])
+    
+    def _tally(self, card_id):
+        self._counts[card_id >> 2] += 1
+        self._suits[card_id & 3] |= 1 << (card_id >> 2)
+    
+    def add_community(self, card):
+        """Deal another community card into the hand space.
+        
+        The best hand is updated from the kept rank and suit tallies, rather 
+        than from all of the cards again.
+
+        Parameters
+        ----------
+        card : Card or str
+            The new community card, or its label.
+
+        Raises
+        ------
+        ValueError
+            If the card is already in the hand space.
+
+        Returns
+        -------
+        None.
+
+        """
+        card = card if isinstance(card, Card) else Card(card)
+        if any(c.id == card.id for c in self.space):
+            raise ValueError(f"{card.label} is already in the hand space.")
+        self.community_cards.append(card)
+        self.space = sorted(self.space + [card], reverse=True)
+        self._tally(card.id)
+        self._hands = None
+        self._best_hand = None
+        n = len(self.space)
+        if 5 <= n <= 7:
+            self._score = evaluator.evaluate_counts(self._counts, self._suits, n)
+        elif n > 7:
+            self._score = evaluator.evaluate([c.id for c in self.space])
+    
+    def copy(self):
+        """Copy the hand space, so that it can be dealt to separately.
+
+        Returns
+        -------
+        HandSpace
+            A new hand space with the same cards, sharing any best hand and 
+            hands found so far.
+
+        """
+        other = HandSpace.__new__(HandSpace)
+        other.__dict__.update(self.__dict__)
+        other.hole_cards = list(self.hole_cards)
+        other.community_cards = list(self.community_cards)
+        other.space = list(self.space)
+        other._counts = list(self._counts)
+        other._suits = list(self._suits)
+        return other
     
     @property
     def best_hand(self):
         """Hand: The best hand from the entire hand space."""
+        if self._best_hand is None:
+            self.find_best_hand()
         return self._best_hand
     
+    @property
+    def score(self):
+        """int: The score of the best hand (see `evaluator.evaluate`), or None 
+        if the hand space has fewer than 5 cards."""
+        return self._score
+    
+    @property
+    def description(self):
+        """str: The equivalence class of the best hand (see 
+        `handclass.describe`), or None if there are fewer than 5 cards."""
+        return None if self._score is None else handclass.describe(self._score)
+    
+    @property
+    def percentile(self):
+        """float: The fraction of all hands with as many cards that the best 
+        hand beats (see `handclass.percentile`), e.g. among all 7-card hands 
+        at the river, or None unless there are 5 to 7 cards."""
+        if self._score is None or len(self.space) not in handclass.HAND_SIZES:
+            return None
+        return handclass.percentile(self._score, len(self.space))
+    
+    @property
+    def strength(self):
+        """str: The strength category name of the best hand."""
+        if self._score is None:
+            return self.best_hand.strength
+        return evaluator.strength_of(self._score).name
+    
     @property
     def hands(self):
-        """dict: A dictionary of all hands, ordered by RankStrength, in the hand space."""
+        """dict: A dictionary of all hands, ordered by RankStrength, in the hand space.
+        
+        Every hand is built and kept the first time this is accessed, which 
+        finding the best hand never needs. To look at each hand once, use 
+        `iter_hands` instead."""
+        if self._hands is None:
+            self.find_all_hands()
         return self._hands.copy()
     
+    @property
+    def cardset(self):
+        """CardSet: All hole and community cards, as a `CardSet`."""
+        return CardSet(self.space)
+    
+    @property
+    def draws(self):
+        """list: The straight and flush draws of all of the cards, as 
+        `enums.Draw` members, strongest first (see `draws.find_draws`). Empty 
+        once there are no cards to come."""
+        if not 3 <= len(self.space) <= 6:
+            return []
+        return draws.find_draws(self.space)
+    
+    def outs(self, dead=None):
+        """Find the cards that would complete a straight or flush draw.
+        
+        See `draws.outs` for details.
+
+        Parameters
+        ----------
+        dead : list or CardSet, optional
+            Cards that have been seen elsewhere and cannot come. The default 
+            is None.
+
+        Raises
+        ------
+        ValueError
+            If the hand space does not have 3 to 6 cards.
+
+        Returns
+        -------
+        CardSet
+            The outs.
+
+        """
+        return draws.outs(self.space, dead)
+    
     @property
     def uses_hole_cards(self):
         """int: The number of hole cards used to make the best hand."""
@@ -526,6 +857,34 @@ class HandSpace:
         """
         return combinations(self.space, min(5, len(self.space)))
     
+    def iter_hands(self, strength=None):
+        """Iterate over the hands in the hand space, one at a time.
+        
+        Unlike `.hands`, nothing is kept, so this is the cheaper way to look 
+        at every hand once. Each combination is scored first, and only those 
+        of the requested strength are built into a `Hand`.
+
+        Parameters
+        ----------
+        strength : HandStrength, optional
+            Only yield hands of this strength. The default is None, which 
+            yields every hand.
+
+        Yields
+        ------
+        Hand
+            Each hand, in the order of `get_combos`.
+
+        """
+        if self._score is None:
+            hand = Hand(cards=self.space)
+            if strength is None or hand._strength is strength:
+                yield hand
+            return
+        for hand_combination in self.get_combos():
+            if strength is None or evaluator.strength_of(evaluator.evaluate_cards(hand_combination)) is strength:
+                yield Hand(cards=hand_combination)
+    
     def find_all_hands(self):
         """Get all hand combinations from the card combinations. Stores them as 
         a dictionary, accessible via the `.hands` property.
@@ -536,13 +895,17 @@ class HandSpace:
 
         """
         # From the entire hand space, finds all available made hands
-        for i, hand_combination in enumerate( self.get_combos() ):
-            hand = Hand(cards=hand_combination)
+        self._hands = {x: [] for x in HandStrength.values()}
+        for hand in self.iter_hands():
             self._hands[hand._strength.value].append( hand )
         self._hands = {k: v for k, v in self._hands.items() if v}
     
     def find_best_hand(self):
         """Find the best hand available.
+        
+        Only the winning combination is built into a `Hand`: combinations are 
+        scored with `evaluator.evaluate_cards` until one matches the best 
+        score of the hand space.
 
         Returns
         -------
@@ -550,9 +913,15 @@ class HandSpace:
             The best hand available from all possible hands in the hand space.
 
         """
-        self.find_all_hands()
-        self._best_hand = max(self._hands[max(self._hands)])
-        return self._best_hand
+        if self._score is None:
+            # Fewer than 5 cards, so there is only the one (partial) hand.
+            self._best_hand = Hand(cards=self.space)
+            return self._best_hand
+        
+        for hand_combination in self.get_combos():
+            if evaluator.evaluate_cards(hand_combination) == self._score:
+                self._best_hand = Hand(cards=hand_combination)
+                return self._best_hand
 
 # hc = [Card('Th'), Card('Qh')]
 # comm = [Card('Jd'), Card('Qd'), Card('2s'), Card('Td'), Card('2d')]
@@ -577,30 +946,3 @@ class HandSpace:
 # trips1 = Hand( ['7c', '7d', '7h', 'Kc', 'Ts'] )
 # pair = Hand(['3h', '3c', '6s', 'Td', 'Jh'])
 # hc = Hand(['3h', '2c', '6s', 'Td', 'Jh'])
-
-# # Draws
-# from itertools import combinations
-
-# oesd_fd = Hand(['Js', 'Ts', 'Qh',])
-# full_straightwidth = []
-# for card in oesd_fd:
-#     straightwidth = range(
-#         card.rank-4 if card.rank-4 >= 2 else 2,
-#         card.rank+4 if card.rank+4 <= 14 else 14+1
-#     )
-#     # print(card, list(straightwidth))
-#     full_straightwidth.extend(list(straightwidth))
-# # print(set(full_straightwidth))
-
-# # Looping through, we could create rankhists and suithists for each iteration and see
-# possibles = list(combinations(full_straightwidth, 5-len(oesd_fd)))
-# # But to do that we need to convert the ranking functions to staticmethods that receive arguments
-# # Then we can pass in a hypothetical rankhist or an actual rankhist, etc.
-# for p in possibles:
-#     if any([p_i for p_i in p if p_i in oesd_fd.ranks]):
-#         continue
-#     # print(list(p), oesd_fd.ranks)
-    
-#     # Now loop over all ps, get every combination of p_i and suit to create labels
-#     # Then stick those together with the current drawing hand's labels.
-#     # Then check if it's a straight. if it is, then put it into the draws.
\ No newline at end of file
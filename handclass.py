@@ -0,0 +1,285 @@
+"""Descriptions and percentiles of the 7462 hand equivalence classes.
+
+Every 5-card hand belongs to one of the equivalence classes numbered by
+`evaluator` (its score), and every hand of 6 or 7 cards to the class of its
+best 5 cards. `hand_class` looks up a class's category, a description like
+`'Pair of Sevens, A-J-4'`, and the fraction of all 5, 6 and 7-card hands
+that it beats, so that how strong a hand is among all hands is a table
+lookup rather than a simulation.
+
+The percentiles come from the exact number of hands in each class, which
+are counted by rank multiset rather than by enumerating the 133784560
+7-card hands. For each multiset of ranks, every choice of at least five of
+its distinct ranks to make a flush in one suit has a number of suit
+assignments that can be counted directly, and the rest of the
+`prod(comb(4, count))` assignments make the multiset's best non-flush hand
+(see `evaluator._best_nonflush`). The counts are built on first use, in
+about a second, and then saved to `evaluator.CACHE_DIR` and memory-mapped,
+like the evaluator tables.
+"""
+from array import array
+from itertools import combinations
+from math import comb
+import mmap
+import os
+from enums import HandStrength, Rank
+import evaluator
+
+# The number of cards in the hands that percentiles are given for.
+HAND_SIZES = (5, 6, 7)
+
+_COUNTS_MAGIC = b'PFCLS001'
+_COUNTS_FILE = 'classes-v1.bin'
+
+def _rank_name(r, plural=False):
+    # Name of a rank index (0 is a two), e.g. 'Seven' or 'Sixes'.
+    name = Rank(r + 2).name.capitalize()
+    if plural:
+        name += 'es' if name == 'Six' else 's'
+    return name
+
+def _kickers(ranks):
+    return '-'.join(Rank(r + 2).label for r in ranks)
+
+def _describe(strength, ranks):
+    if strength == HandStrength.HIGH_CARD:
+        return f"{_rank_name(ranks[0])} high, {_kickers(ranks[1:])}"
+    if strength == HandStrength.PAIR:
+        return f"Pair of {_rank_name(ranks[0], True)}, {_kickers(ranks[2:])}"
+    if strength == HandStrength.TWO_PAIR:
+        return f"Two pair, {_rank_name(ranks[0], True)} and {_rank_name(ranks[2], True)}, {_kickers(ranks[4:])}"
+    if strength == HandStrength.THREE_OF_A_KIND:
+        return f"Three of a kind, {_rank_name(ranks[0], True)}, {_kickers(ranks[3:])}"
+    if strength == HandStrength.STRAIGHT:
+        return f"Straight, {_rank_name(ranks[-1])} to {_rank_name(ranks[0])}"
+    if strength == HandStrength.FLUSH:
+        return f"Flush, {_kickers(ranks)}"
+    if strength == HandStrength.FULL_HOUSE:
+        return f"Full house, {_rank_name(ranks[0], True)} full of {_rank_name(ranks[3], True)}"
+    if strength == HandStrength.FOUR_OF_A_KIND:
+        return f"Four of a kind, {_rank_name(ranks[0], True)}, {_kickers(ranks[4:])}"
+    if strength == HandStrength.STRAIGHT_FLUSH:
+        return f"Straight flush, {_rank_name(ranks[-1])} to {_rank_name(ranks[0])}"
+    return "Royal flush"
+
+def _count_classes(n):
+    # The number of n-card hands whose best 5 cards are in each class.
+    counts = [0] * (evaluator.NUM_CLASSES + 1)
+    nonflush = evaluator._NONFLUSH[n]
+    for multiset in evaluator._multisets(n):
+        total = 1
+        for c in multiset:
+            total *= comb(4, c)
+        distinct = [r for r, c in enumerate(multiset) if c]
+        for k in range(5, len(distinct) + 1):
+            for flush in combinations(distinct, k):
+                # One card of each flush rank, and no other card, in one of 4
+                # suits, with the rest of the cards in the other 3 suits.
+                ways = 4
+                mask = 0
+                for r, c in enumerate(multiset):
+                    if c:
+                        ways *= comb(3, c - 1) if r in flush else comb(3, c)
+                for r in flush:
+                    mask |= 1 << r
+                counts[evaluator._FLUSH_BEST[mask]] += ways
+                total -= ways
+        counts[nonflush[evaluator._multiset_index(multiset, n)]] += total
+    return counts
+
+def _counts_bytes():
+    counts = array('I')
+    for n in HAND_SIZES:
+        counts.extend(_count_classes(n))
+    return _COUNTS_MAGIC + counts.tobytes()
+
+def build_counts(path=None):
+    """Count the 5, 6 and 7-card hands in each class and save them to disk.
+
+    This happens automatically the first time the counts are needed, so is
+    only needed to rebuild or relocate them.
+
+    Parameters
+    ----------
+    path : str, optional
+        Where to save the counts. The default is None, which saves them to
+        the cache directory (see `evaluator.cache_path`).
+
+    Returns
+    -------
+    str
+        The path of the saved counts file.
+
+    """
+    path = path or evaluator.cache_path(_COUNTS_FILE)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(_counts_bytes())
+    os.replace(tmp, path)
+    return path
+
+def _map_counts(path):
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    size = len(_COUNTS_MAGIC) + 4 * len(HAND_SIZES) * (evaluator.NUM_CLASSES + 1)
+    if len(buffer) != size or buffer[:len(_COUNTS_MAGIC)] != _COUNTS_MAGIC:
+        buffer.close()
+        raise ValueError(f"Stale or corrupt class counts: {path}")
+    return buffer
+
+class HandClass:
+    """One of the 7462 equivalence classes of 5-card hands.
+
+    Attributes
+    ----------
+    score : int
+        The class's score (see `evaluator.evaluate5`), from 1 (weakest) to
+        7462 (royal flush).
+    strength : enums.HandStrength
+        The category of the class.
+    description : str
+        The category and ranks of the class, e.g. `'Pair of Sevens, A-J-4'`.
+    percentiles : dict
+        For each hand size in `HAND_SIZES`, the fraction of all hands of
+        that many cards that the class beats.
+
+    """
+    __slots__ = ('score', 'strength', 'description', 'percentiles')
+
+    def __init__(self, score, strength, description, percentiles):
+        self.score = score
+        self.strength = strength
+        self.description = description
+        self.percentiles = percentiles
+
+    def __repr__(self):
+        return f"<HandClass({self.score}, {self.description!r})>"
+
+# The counts of each hand size by class, and the table of classes, once
+# first needed.
+_COUNTS = None
+_TABLE = None
+
+def class_counts(n_cards=7):
+    """Get the number of hands of a size in each class.
+
+    Parameters
+    ----------
+    n_cards : int, optional
+        The hand size, one of `HAND_SIZES`. The default is 7.
+
+    Raises
+    ------
+    ValueError
+        If `n_cards` is not one of `HAND_SIZES`.
+
+    Returns
+    -------
+    memoryview
+        The number of `n_cards`-card hands whose best 5 cards are in each
+        class, indexed by score (index 0 is unused).
+
+    """
+    global _COUNTS
+    if n_cards not in HAND_SIZES:
+        raise ValueError(f"Hands must have {HAND_SIZES[0]} to {HAND_SIZES[-1]} cards, not {n_cards}.")
+    if _COUNTS is None:
+        path = evaluator.cache_path(_COUNTS_FILE)
+        try:
+            buffer = _map_counts(path)
+        except (OSError, ValueError):
+            try:
+                buffer = _map_counts(build_counts(path))
+            except OSError:
+                # The cache is not writable, so keep the counts in memory.
+                buffer = _counts_bytes()
+        counts = memoryview(buffer)[len(_COUNTS_MAGIC):].cast('I')
+        size = evaluator.NUM_CLASSES + 1
+        _COUNTS = {n: counts[i*size:(i+1)*size] for i, n in enumerate(HAND_SIZES)}
+    return _COUNTS[n_cards]
+
+def _build_table():
+    below = {}
+    for n in HAND_SIZES:
+        counts = class_counts(n)
+        total = sum(counts)
+        running, fractions = 0, [0.]
+        for score in range(1, evaluator.NUM_CLASSES + 1):
+            fractions.append(running / total)
+            running += counts[score]
+        below[n] = fractions
+    return [None] + [
+        HandClass(score, strength, _describe(strength, ranks), {n: below[n][score] for n in HAND_SIZES})
+        for score, (strength, ranks) in enumerate(evaluator._CLASSES[1:], 1)
+    ]
+
+def hand_class(score):
+    """Look up an equivalence class by its score.
+
+    Parameters
+    ----------
+    score : int
+        A score from `evaluator.evaluate5` or `evaluator.evaluate`, in the
+        range (1, 7462).
+
+    Raises
+    ------
+    ValueError
+        If the score is out of range.
+
+    Returns
+    -------
+    HandClass
+        The class's category, description and percentiles.
+
+    """
+    global _TABLE
+    if not 1 <= score <= evaluator.NUM_CLASSES:
+        raise ValueError(f"Scores range from 1 to {evaluator.NUM_CLASSES}, not {score}.")
+    if _TABLE is None:
+        _TABLE = _build_table()
+    return _TABLE[score]
+
+def describe(score):
+    """Describe a score's class, e.g. `'Full house, Nines full of Kings'`.
+
+    Parameters
+    ----------
+    score : int
+        A score from `evaluator.evaluate5` or `evaluator.evaluate`.
+
+    Returns
+    -------
+    str
+        The category and ranks of the class.
+
+    """
+    return hand_class(score).description
+
+def percentile(score, n_cards=7):
+    """Get the fraction of all hands that a score beats.
+
+    Parameters
+    ----------
+    score : int
+        A score from `evaluator.evaluate5` or `evaluator.evaluate`.
+    n_cards : int, optional
+        The size of the hands to compare with, one of `HAND_SIZES`, e.g. 7
+        for every 7-card hold 'em holding at the river. The default is 7.
+
+    Raises
+    ------
+    ValueError
+        If `n_cards` is not one of `HAND_SIZES`.
+
+    Returns
+    -------
+    float
+        The fraction of `n_cards`-card hands whose best 5 cards are weaker,
+        from 0 to 1 (hands of the same class are not counted).
+
+    """
+    if n_cards not in HAND_SIZES:
+        raise ValueError(f"Hands must have {HAND_SIZES[0]} to {HAND_SIZES[-1]} cards, not {n_cards}.")
+    return hand_class(score).percentiles[n_cards]
@@ -0,0 +1,270 @@
+"""Streaming hand-history parsing and showdown auditing.
+
+`read_hands` reads plain-text hand histories in the common PokerStars-style
+format one line at a time, and yields each hand as a `HandHistory` once its
+last line has been read, so files of any size are processed in constant
+memory. Only what is needed to check a showdown is kept: the board, the
+hole cards that were shown or mucked at showdown, and who collected from
+the pot. For example:
+
+    PokerStars Hand #1001: Hold'em No Limit ($0.01/$0.02) - 2022/08/09 21:20:00 ET
+    ...
+    *** SHOW DOWN ***
+    alice: shows [Ah Kd] (a pair of Kings)
+    bob: shows [Qc Qs] (a pair of Queens)
+    alice collected $1.00 from pot
+    *** SUMMARY ***
+    Board [Kh 7d 2c 9s 3h]
+
+`audit` recomputes the winners of every showdown from a stream of hands,
+scoring them in batches with `batch.evaluate_batch`, and `audit_paths` audits
+whole files or directories of them on a pool of processes.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import os
+import re
+import numpy as np
+from card import Card
+from batch import evaluate_batch
+
+# Showdowns scored per call to `batch.evaluate_batch`.
+BATCH_SIZE = 1 << 12
+
+_HEADER = re.compile(r"^\S.*\bHand #(\w+)")
+_BOARD = re.compile(r"^Board \[([^\]]*)\]")
+_SHOWS = re.compile(r"^(.+?): (?:shows|mucks) \[([^\]]+)\]")
+_SHOWED = re.compile(r"^Seat \d+: (.+?)(?: \((?:button|small blind|big blind)\))* (?:showed|mucked) \[([^\]]+)\]")
+_COLLECTED = re.compile(r"^(.+?) collected \D*([\d,.]+) from (side |main )?pot")
+
+class HandHistory:
+    """The parts of one hand history needed to audit its showdown.
+
+    Attributes
+    ----------
+    hand_id : str
+        The hand number from the header line.
+    board : list
+        The community cards, as `Card` instances.
+    shown : dict
+        Each player who showed (or mucked) their hole cards at showdown, and
+        those hole cards as a list of `Card` instances.
+    collected : dict
+        Each player who collected from the pot, and how much.
+    side_pots : bool
+        Whether there were side pots, in which case players with weaker
+        hands may also collect.
+
+    """
+    __slots__ = ('hand_id', 'board', 'shown', 'collected', 'side_pots')
+
+    def __init__(self, hand_id, board=None, shown=None, collected=None, side_pots=False):
+        self.hand_id = hand_id
+        self.board = board or []
+        self.shown = shown or {}
+        self.collected = collected or {}
+        self.side_pots = side_pots
+
+    def __repr__(self):
+        return f"<HandHistory({self.hand_id!r})>"
+
+    @property
+    def is_showdown(self):
+        """bool: Whether two or more players showed down on a full board.
+        
+        Only hold 'em showdowns count, where every player showed exactly two
+        hole cards, so Omaha hands and partly shown hands are not audited."""
+        return (
+            len(self.board) == 5 and len(self.shown) >= 2
+            and all(len(hole) == 2 for hole in self.shown.values())
+        )
+
+def _cards(text):
+    return [Card(label) for label in text.split()]
+
+def read_hands(source):
+    """Read hand histories one hand at a time.
+
+    Parameters
+    ----------
+    source : str or file
+        A path to a text file of hand histories, or an open text file (or
+        any other iterable of lines).
+
+    Yields
+    ------
+    HandHistory
+        Each hand in the order it appears.
+
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding='utf-8-sig', errors='replace') as f:
+            yield from read_hands(f)
+        return
+
+    hand = None
+    for line in source:
+        # Cheap substring checks first, as most lines are betting actions.
+        if 'Hand #' in line and (header := _HEADER.match(line)):
+            if hand is not None:
+                yield hand
+            hand = HandHistory(header.group(1))
+        elif hand is None:
+            continue
+        elif '[' in line:
+            if match := _BOARD.match(line):
+                hand.board = _cards(match.group(1))
+            elif match := _SHOWS.match(line) or _SHOWED.match(line):
+                hand.shown.setdefault(match.group(1), _cards(match.group(2)))
+        elif ' collected ' in line and (match := _COLLECTED.match(line)):
+            name, amount = match.group(1), float(match.group(2).replace(',', ''))
+            hand.collected[name] = hand.collected.get(name, 0) + amount
+            hand.side_pots |= match.group(3) is not None
+    if hand is not None:
+        yield hand
+
+class AuditSummary:
+    """Totals from auditing hand histories.
+
+    Attributes
+    ----------
+    hands : int
+        The number of hands read.
+    showdowns : int
+        The number of showdowns that were checked.
+    mismatches : list
+        The ids of hands where a player with the best hand did not collect,
+        or (without side pots) a player without the best hand did.
+
+    """
+    def __init__(self, hands=0, showdowns=0, mismatches=None):
+        self.hands = hands
+        self.showdowns = showdowns
+        self.mismatches = mismatches or []
+
+    def __repr__(self):
+        return f"<AuditSummary(hands={self.hands}, showdowns={self.showdowns}, mismatches={len(self.mismatches)})>"
+
+    def __add__(self, other):
+        return AuditSummary(
+            self.hands + other.hands, self.showdowns + other.showdowns, self.mismatches + other.mismatches
+        )
+
+def _winners(showdowns):
+    # The names of the players with the best hand in each showdown.
+    rows = [
+        [c.id for c in hole + hand.board]
+        for hand in showdowns for hole in hand.shown.values()
+    ]
+    scores = evaluate_batch(np.array(rows, dtype=np.uint8))[0]
+    starts = np.cumsum([0] + [len(hand.shown) for hand in showdowns[:-1]])
+    best = np.maximum.reduceat(scores, starts)
+    winners = []
+    for hand, start, top in zip(showdowns, starts.tolist(), best.tolist()):
+        names = list(hand.shown)
+        winners.append({names[i] for i in range(len(names)) if scores[start + i] == top})
+    return winners
+
+def audit(hands, batch_size=BATCH_SIZE):
+    """Recompute the winners of each showdown.
+
+    Parameters
+    ----------
+    hands : iterable
+        `HandHistory` objects, such as from `read_hands`. Hands without a
+        showdown are skipped.
+    batch_size : int, optional
+        The number of showdowns to score at once. The default is
+        `BATCH_SIZE`.
+
+    Yields
+    ------
+    hand : HandHistory
+        Each showdown.
+    winners : set
+        The names of the players with the best hand.
+
+    """
+    showdowns = filter(lambda hand: hand.is_showdown, hands)
+    while batch := list(islice(showdowns, batch_size)):
+        yield from zip(batch, _winners(batch))
+
+def audit_file(source, batch_size=BATCH_SIZE):
+    """Audit the showdowns in one file of hand histories.
+
+    Parameters
+    ----------
+    source : str or file
+        A path to a text file of hand histories, or an open text file.
+    batch_size : int, optional
+        The number of showdowns to score at once. The default is
+        `BATCH_SIZE`.
+
+    Returns
+    -------
+    AuditSummary
+        The totals for the file.
+
+    """
+    summary = AuditSummary()
+    def counted(hands):
+        for hand in hands:
+            summary.hands += 1
+            yield hand
+
+    for hand, winners in audit(counted(read_hands(source)), batch_size):
+        summary.showdowns += 1
+        collectors = {name for name in hand.collected if name in hand.shown}
+        if not winners <= collectors or (not hand.side_pots and collectors != winners):
+            summary.mismatches.append(hand.hand_id)
+    return summary
+
+def _history_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in sorted(os.walk(path)):
+                yield from (os.path.join(root, name) for name in sorted(files) if name.endswith('.txt'))
+        else:
+            yield path
+
+def audit_paths(paths, workers=None):
+    """Audit the showdowns in many files of hand histories.
+
+    Parameters
+    ----------
+    paths : list
+        Paths of hand history files, or of directories, which are searched
+        for `.txt` files.
+    workers : int, optional
+        The number of processes to audit files on, one file at a time each.
+        The default is None, which uses one per CPU. With a single worker,
+        the files are audited in the calling process.
+
+    Returns
+    -------
+    AuditSummary
+        The totals over every file.
+
+    """
+    files = list(_history_files(paths))
+    workers = min(workers or os.cpu_count() or 1, max(len(files), 1))
+    if workers == 1:
+        return sum(map(audit_file, files), AuditSummary())
+    with ProcessPoolExecutor(workers) as pool:
+        return sum(pool.map(audit_file, files), AuditSummary())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Audit the showdowns in hand history files.")
+    parser.add_argument('paths', nargs='+', help="hand history files, or directories of .txt files")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="number of processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    summary = audit_paths(args.paths, args.workers)
+    print(f"{summary.hands} hands, {summary.showdowns} showdowns, {len(summary.mismatches)} mismatches")
+    for hand_id in summary.mismatches:
+        print(f"Mismatch in hand #{hand_id}")
+    return int(bool(summary.mismatches))
+
+if __name__ == '__main__':
+    raise SystemExit(main())
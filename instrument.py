@@ -0,0 +1,320 @@
+"""Opt-in counters and timers for the evaluation path.
+
+Nothing is measured until collection is switched on, and while it is off
+the evaluation code runs exactly as written: `collect` (or `enable`)
+temporarily wraps the methods below with counting and timing versions, and
+puts the originals back afterwards. For example:
+
+    with instrument.collect() as stats:
+        HandSpace(hole_cards, community_cards).best_hand
+    print(stats.to_json())
+
+Counters:
+
+    - `card.parsed`: `Card` instances looked up from a label or rank and suit.
+    - `hand.built`: `Hand` instances created.
+    - `hand.classified`: hands classified, by lookup or by predicates.
+    - `hand.predicates`: `Hand.is_*` predicates evaluated.
+    - `hand.comparisons`: comparisons between hands.
+    - `handspace.built`: `HandSpace` instances created.
+    - `handspace.combos`: 5-card combinations enumerated by `HandSpace`.
+    - `evaluator.lookups`: hands scored from the lookup tables, by
+      `evaluator.evaluate5` (which `evaluator.evaluate_cards` calls) or
+      `evaluator.evaluate_counts` (which `evaluator.evaluate` calls, once per
+      7-card subset of larger hands). `batch` and `omaha` score arrays of
+      hands without these functions, so are not counted.
+    - `draws.cache_hits`, `draws.cache_misses`: cached draw analyses (see
+      `draws`) that were reused or computed.
+
+Timers, each with the number of calls and total seconds (nested phases are
+included in the phases that call them):
+
+    - `hand.classify`: `Hand.classify_hand`.
+    - `handspace.init`: `HandSpace.__init__`, which scores the best hand.
+    - `handspace.best_hand`: `HandSpace.find_best_hand`.
+    - `handspace.all_hands`: `HandSpace.find_all_hands`.
+
+Other code can add its own with `count` and `timer`, which do nothing while
+collection is off.
+"""
+from contextlib import contextmanager
+from functools import wraps
+import json
+from time import perf_counter
+from card import Card
+from hand import Hand, HandSpace
+import draws
+import evaluator
+
+class Stats:
+    """Counters and timers collected while instrumentation was on.
+
+    Attributes
+    ----------
+    counters : dict
+        Each counter's name and total.
+    timers : dict
+        Each timer's name, and a list of its number of calls and total
+        seconds.
+
+    """
+    def __init__(self):
+        self.counters = {}
+        self.timers = {}
+
+    def __repr__(self):
+        return f"<Stats(counters={len(self.counters)}, timers={len(self.timers)})>"
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_time(self, name, seconds):
+        timer = self.timers.setdefault(name, [0, 0.])
+        timer[0] += 1
+        timer[1] += seconds
+
+    def snapshot(self):
+        """Copy the counters and timers.
+
+        Returns
+        -------
+        dict
+            A `'counters'` dict of each counter's total, and a `'timers'`
+            dict of each timer's `'calls'` and `'seconds'`, both sorted by
+            name.
+
+        """
+        return {
+            'counters': dict(sorted(self.counters.items())),
+            'timers': {
+                name: {'calls': calls, 'seconds': seconds}
+                for name, (calls, seconds) in sorted(self.timers.items())
+            },
+        }
+
+    def to_json(self, **kwargs):
+        """Serialize a snapshot (see `Stats.snapshot`) as JSON.
+
+        Parameters
+        ----------
+        **kwargs
+            Passed on to `json.dumps`, e.g. `indent`.
+
+        Returns
+        -------
+        str
+            The JSON text.
+
+        """
+        return json.dumps(self.snapshot(), **kwargs)
+
+# The stats being collected, or None while instrumentation is off.
+_ACTIVE = None
+
+# The wrapped attributes and their originals, while instrumentation is on.
+_PATCHED = []
+
+# `draws._analyse.cache_info()` when instrumentation was turned on.
+_DRAWS_CACHE = None
+
+def count(name, n=1):
+    """Add to a counter, if instrumentation is on.
+
+    Parameters
+    ----------
+    name : str
+        The counter's name.
+    n : int, optional
+        The amount to add. The default is 1.
+
+    Returns
+    -------
+    None.
+
+    """
+    if _ACTIVE is not None:
+        _ACTIVE.count(name, n)
+
+@contextmanager
+def timer(name):
+    """Time a block of code, if instrumentation is on.
+
+    Parameters
+    ----------
+    name : str
+        The timer's name.
+
+    Yields
+    ------
+    None.
+
+    """
+    if _ACTIVE is None:
+        yield
+        return
+    stats = _ACTIVE
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        stats.add_time(name, perf_counter() - start)
+
+def _counted(fun, name):
+    @wraps(fun)
+    def wrapper(*args, **kwargs):
+        if _ACTIVE is not None:
+            _ACTIVE.count(name)
+        return fun(*args, **kwargs)
+    return wrapper
+
+def _timed(fun, name, counter=None):
+    @wraps(fun)
+    def wrapper(*args, **kwargs):
+        stats = _ACTIVE
+        if stats is None:
+            return fun(*args, **kwargs)
+        if counter:
+            stats.count(counter)
+        start = perf_counter()
+        try:
+            return fun(*args, **kwargs)
+        finally:
+            stats.add_time(name, perf_counter() - start)
+    return wrapper
+
+def _counted_combos(fun):
+    @wraps(fun)
+    def wrapper(*args, **kwargs):
+        stats = _ACTIVE or Stats()
+        for combo in fun(*args, **kwargs):
+            stats.count('handspace.combos')
+            yield combo
+    return wrapper
+
+def _patch(owner, attr, wrapper):
+    if isinstance(owner, dict):
+        original = owner[attr]
+        owner[attr] = wrapper(original)
+    else:
+        original = owner.__dict__[attr] if isinstance(owner, type) else getattr(owner, attr)
+        fun = original.__func__ if isinstance(original, staticmethod) else original
+        wrapped = wrapper(fun)
+        setattr(owner, attr, staticmethod(wrapped) if isinstance(original, staticmethod) else wrapped)
+    _PATCHED.append((owner, attr, original))
+
+def _install():
+    _patch(Card, '__new__', lambda f: _counted(f, 'card.parsed'))
+    _patch(Hand, '__init__', lambda f: _counted(f, 'hand.built'))
+    _patch(Hand, 'classify_hand', lambda f: _timed(f, 'hand.classify', 'hand.classified'))
+    for name in ('__lt__', '__le__', '__eq__', '__ne__', '__ge__', '__gt__'):
+        _patch(Hand, name, lambda f: _counted(f, 'hand.comparisons'))
+    for funcs in (Hand._rank_funcs, Hand._draw_funcs):
+        for key, fun in list(funcs.items()):
+            predicate = _counted(fun, 'hand.predicates')
+            _patch(funcs, key, lambda f: predicate)
+            _patch(Hand, fun.__name__, lambda f: predicate)
+    _patch(HandSpace, '__init__', lambda f: _timed(f, 'handspace.init', 'handspace.built'))
+    _patch(HandSpace, 'get_combos', _counted_combos)
+    _patch(HandSpace, 'find_best_hand', lambda f: _timed(f, 'handspace.best_hand'))
+    _patch(HandSpace, 'find_all_hands', lambda f: _timed(f, 'handspace.all_hands'))
+    for name in ('evaluate5', 'evaluate_counts'):
+        _patch(evaluator, name, lambda f: _counted(f, 'evaluator.lookups'))
+
+def _uninstall():
+    while _PATCHED:
+        owner, attr, original = _PATCHED.pop()
+        if isinstance(owner, dict):
+            owner[attr] = original
+        else:
+            setattr(owner, attr, original)
+
+def is_enabled():
+    """Check whether instrumentation is on.
+
+    Returns
+    -------
+    bool
+        Whether counters and timers are being collected.
+
+    """
+    return _ACTIVE is not None
+
+def enable(stats=None):
+    """Turn instrumentation on, until `disable` is called.
+
+    Parameters
+    ----------
+    stats : Stats, optional
+        Where to collect the counters and timers. The default is None,
+        which starts a new `Stats`.
+
+    Raises
+    ------
+    RuntimeError
+        If instrumentation is already on.
+
+    Returns
+    -------
+    Stats
+        Where the counters and timers are collected.
+
+    """
+    global _ACTIVE, _DRAWS_CACHE
+    if _ACTIVE is not None:
+        raise RuntimeError("Instrumentation is already enabled.")
+    _ACTIVE = stats if stats is not None else Stats()
+    _DRAWS_CACHE = draws._analyse.cache_info()
+    _install()
+    return _ACTIVE
+
+def disable():
+    """Turn instrumentation off, restoring the original methods.
+
+    Returns
+    -------
+    Stats
+        The counters and timers collected since `enable`, or None if
+        instrumentation was not on.
+
+    """
+    global _ACTIVE
+    stats = _ACTIVE
+    if stats is None:
+        return None
+    _uninstall()
+    before, after = _DRAWS_CACHE, draws._analyse.cache_info()
+    stats.count('draws.cache_hits', after.hits - before.hits)
+    stats.count('draws.cache_misses', after.misses - before.misses)
+    _ACTIVE = None
+    return stats
+
+@contextmanager
+def collect(stats=None):
+    """Collect counters and timers for the duration of a block.
+
+    The wrapped methods and functions are replaced on their classes and
+    modules, so this affects every thread, and counts whatever they run
+    during the block. Only collect from one thread at a time.
+
+    Parameters
+    ----------
+    stats : Stats, optional
+        Where to collect the counters and timers, e.g. to add up several
+        runs. The default is None, which starts a new `Stats`.
+
+    Raises
+    ------
+    RuntimeError
+        If instrumentation is already on.
+
+    Yields
+    ------
+    Stats
+        The counters and timers, which are complete once the block exits.
+
+    """
+    stats = enable(stats)
+    try:
+        yield stats
+    finally:
+        disable()
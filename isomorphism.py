@@ -0,0 +1,177 @@
+"""Suit isomorphism of hole cards and boards.
+
+Poker hands are unchanged by relabelling the suits: `AhKh` on `Qh-7h-2c` plays
+exactly like `AsKs` on `Qs-7s-2d`. This module maps any hole cards and board
+to a canonical representative of their class under the 24 permutations of
+the suits, and enumerates the distinct runouts of a board up to the suit
+permutations that leave the known cards unchanged, together with how many
+runouts each one stands for. Enumeration and caching code can then work on a
+fraction of the inputs, weighting each result by its multiplicity.
+
+A suit permutation is a tuple `p` of four suit indexes (in `enums.Suit`
+order), mapping each suit `s` to the suit `p[s]`.
+"""
+from itertools import chain, combinations, permutations
+import numpy as np
+from card import Card
+
+SUIT_PERMUTATIONS = tuple(permutations(range(4)))
+
+# _PERMUTED[i][c]: the id of card c after applying SUIT_PERMUTATIONS[i].
+_PERMUTED = np.array(
+    [[(c & ~3) | p[c & 3] for c in range(52)] for p in SUIT_PERMUTATIONS],
+    dtype=np.uint8
+)
+_PERMUTED_IDS = _PERMUTED.tolist()
+
+def _as_ids(cards):
+    if cards is None:
+        return []
+    return [(c if isinstance(c, Card) else Card(c)).id for c in cards]
+
+def permute(cards, permutation):
+    """Apply a suit permutation to some cards.
+
+    Parameters
+    ----------
+    cards : iterable
+        `Card` instances and/or card labels.
+    permutation : tuple
+        A suit permutation, e.g. from `SUIT_PERMUTATIONS`.
+
+    Returns
+    -------
+    list
+        The permuted cards, as `Card` instances in the same order.
+
+    """
+    return [Card.from_id((i & ~3) | permutation[i & 3]) for i in _as_ids(cards)]
+
+def stabilizer(*card_groups):
+    """Find the suit permutations that leave each group of cards unchanged.
+
+    Parameters
+    ----------
+    *card_groups : iterable
+        Groups of `Card` instances and/or labels, such as each player's hole
+        cards and the board. Each group must map onto itself as a set, but
+        cards may move around within a group.
+
+    Returns
+    -------
+    list
+        The suit permutations (always including the identity) that fix every
+        group.
+
+    """
+    groups = [np.array(sorted(_as_ids(group)), dtype=np.uint8) for group in card_groups]
+    return [
+        p for p, permuted in zip(SUIT_PERMUTATIONS, _PERMUTED)
+        if all((np.sort(permuted[group]) == group).all() for group in groups)
+    ]
+
+def canonicalize(hole, board=None):
+    """Map hole cards and a board to the canonical member of their class.
+
+    Of all the suit permutations of `(hole, board)`, the canonical one is the
+    one whose sorted hole card ids, followed by its sorted board card ids,
+    are lexicographically smallest.
+
+    Parameters
+    ----------
+    hole : iterable
+        Hole cards, as `Card` instances and/or labels.
+    board : iterable, optional
+        Board cards, as `Card` instances and/or labels. The default is None.
+
+    Returns
+    -------
+    hole : list
+        The canonical hole cards, as `Card` instances in ascending id order.
+    board : list
+        The canonical board cards, as `Card` instances in ascending id order.
+    permutation : tuple
+        The suit permutation that maps the given cards onto the canonical
+        ones (see `permute`).
+
+    """
+    hole, board = _as_ids(hole), _as_ids(board)
+    candidates = []
+    for p, permuted in zip(SUIT_PERMUTATIONS, _PERMUTED_IDS):
+        key = (tuple(sorted(permuted[i] for i in hole)), tuple(sorted(permuted[i] for i in board)))
+        candidates.append((key, p))
+    key, permutation = min(candidates)
+    return [Card.from_id(i) for i in key[0]], [Card.from_id(i) for i in key[1]], permutation
+
+def canonical_mask(rows, suit_permutations):
+    """Find the canonical rows of an array of card combinations.
+
+    The permutations must form a group (such as the result of `stabilizer`),
+    and every row must be sorted in ascending order, as combinations from
+    `itertools.combinations` are. Among all the rows in an orbit of the group,
+    the canonical one is the one whose sorted, permuted ids are smallest.
+
+    Parameters
+    ----------
+    rows : numpy.ndarray
+        An integer array of shape `(N, k)` of card ids, each row sorted.
+    suit_permutations : list
+        A group of suit permutations.
+
+    Returns
+    -------
+    mask : numpy.ndarray
+        A boolean array of length N, True for canonical rows.
+    weights : numpy.ndarray
+        An integer array of length N with the size of each row's orbit, i.e.
+        the number of distinct rows that it is equivalent to (itself
+        included).
+
+    """
+    rows = np.asarray(rows, dtype=np.uint8)
+    index = [SUIT_PERMUTATIONS.index(tuple(p)) for p in suit_permutations]
+    places = np.int64(64) ** np.arange(rows.shape[1] - 1, -1, -1, dtype=np.int64)
+    keys = np.sort(_PERMUTED[index][:, rows], axis=2).astype(np.int64) @ places
+    own = rows.astype(np.int64) @ places
+    mask = keys.min(axis=0) == own
+    weights = len(index) // (keys == own).sum(axis=0)
+    return mask, weights
+
+def canonical_runouts(n, hole=None, board=None, dead=None):
+    """Enumerate the distinct runouts of a board, with their multiplicities.
+
+    Runouts are equivalent if a suit permutation that leaves the hole cards,
+    the board and the dead cards unchanged maps one onto the other. For
+    example, there are 22100 possible flops but only 1755 distinct ones
+    when nothing is known.
+
+    Parameters
+    ----------
+    n : int
+        The number of cards to deal, e.g. 3 for a flop.
+    hole : iterable, optional
+        Known hole cards, as `Card` instances and/or labels. The default is
+        None.
+    board : iterable, optional
+        Known board cards. The default is None.
+    dead : iterable, optional
+        Other cards that cannot be dealt. The default is None.
+
+    Returns
+    -------
+    list
+        Tuples of `(cards, multiplicity)`, where `cards` is a tuple of `Card`
+        instances and `multiplicity` is the number of runouts it stands for.
+        The multiplicities sum to the total number of possible runouts.
+
+    """
+    if n == 0:
+        return [((), 1)]
+    known = [_as_ids(hole), _as_ids(board), _as_ids(dead)]
+    live = sorted(set(range(52)).difference(*known))
+    rows = np.fromiter(chain.from_iterable(combinations(live, n)), dtype=np.uint8).reshape(-1, n)
+    mask, weights = canonical_mask(rows, stabilizer(*[map(Card.from_id, ids) for ids in known]))
+    return [
+        (tuple(map(Card.from_id, row)), int(weight))
+        for row, weight in zip(rows[mask].tolist(), weights[mask].tolist())
+    ]
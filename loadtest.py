@@ -0,0 +1,152 @@
+"""Load test for the evaluation service (see `service`).
+
+Opens several client connections, each sending random 7-card evaluate
+requests with a fixed number in flight, and reports the latency of the
+requests (p50 and p99) and the overall throughput. Without an address, a
+server is started in the same process:
+
+    python loadtest.py --requests 100000 --clients 8 --concurrency 64
+    python loadtest.py --port 8765 --requests 100000
+"""
+import argparse
+import asyncio
+from time import perf_counter
+import numpy as np
+from card import Card
+from deck import Deck
+from service import EvaluationClient, EvaluationServer, WINDOW, MAX_BATCH
+
+class LoadResult:
+    """Latencies and throughput from `run_load`.
+
+    Attributes
+    ----------
+    latencies : numpy.ndarray
+        The latency of each request, in seconds.
+    seconds : float
+        The wall time of the whole test.
+    batches : int
+        The number of batches the server answered in, if it was started
+        in-process, or None.
+
+    """
+    def __init__(self, latencies, seconds, batches=None):
+        self.latencies = np.asarray(latencies)
+        self.seconds = seconds
+        self.batches = batches
+
+    def __repr__(self):
+        return f"<LoadResult(requests={len(self.latencies)}, p50={self.p50 * 1000:.2f}ms, p99={self.p99 * 1000:.2f}ms)>"
+
+    @property
+    def p50(self):
+        """float: The median latency, in seconds."""
+        return float(np.percentile(self.latencies, 50))
+
+    @property
+    def p99(self):
+        """float: The 99th percentile latency, in seconds."""
+        return float(np.percentile(self.latencies, 99))
+
+    @property
+    def throughput(self):
+        """float: Requests answered per second."""
+        return len(self.latencies) / self.seconds if self.seconds else 0.
+
+    def report(self):
+        """str: A summary of the latencies and throughput."""
+        lines = [
+            f"{len(self.latencies)} requests in {self.seconds:.2f}s: {self.throughput:,.0f} requests/s",
+            f"latency p50 {self.p50 * 1000:.2f}ms, p99 {self.p99 * 1000:.2f}ms",
+        ]
+        if self.batches:
+            lines.append(f"{self.batches} batches, {len(self.latencies) / self.batches:.1f} requests per batch")
+        return '\n'.join(lines)
+
+async def _client(address, hands, concurrency, latencies):
+    host, port, path = address
+    async with EvaluationClient() as client:
+        await client.connect(host, port, path)
+        queue = iter(hands)
+
+        async def worker():
+            for cards in queue:
+                start = perf_counter()
+                await client.request('evaluate', cards=cards)
+                latencies.append(perf_counter() - start)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+async def run_load(requests=10_000, clients=4, concurrency=32, host='127.0.0.1', port=None, path=None,
+                   window=WINDOW, max_batch=MAX_BATCH, seed=None):
+    """Load test an evaluation server.
+
+    Parameters
+    ----------
+    requests : int, optional
+        The total number of evaluate requests. The default is 10000.
+    clients : int, optional
+        The number of client connections. The default is 4.
+    concurrency : int, optional
+        The number of requests in flight per client. The default is 32.
+    host : str, optional
+        The TCP host of the server. The default is `'127.0.0.1'`.
+    port : int, optional
+        The TCP port of the server. The default is None, which starts a
+        server in-process unless `path` is given.
+    path : str, optional
+        The Unix socket path of the server. The default is None.
+    window, max_batch : optional
+        The batching settings of an in-process server (see
+        `service.EvaluationServer`).
+    seed : int, optional
+        Seed for the random hands. The default is None.
+
+    Returns
+    -------
+    LoadResult
+        The latencies and throughput.
+
+    """
+    rng = np.random.default_rng(seed)
+    holes, boards = Deck().deal_batch(requests, players=1, board_cards=5, rng=rng)
+    labels = np.array([Card.from_id(i).label for i in range(52)])
+    hands = labels[np.concatenate([holes[:, 0], boards], axis=1)].tolist()
+
+    server = None
+    if port is None and path is None:
+        server = await EvaluationServer(window, max_batch).start(host)
+        host, port = server.address[:2]
+
+    latencies = []
+    start = perf_counter()
+    try:
+        await asyncio.gather(*(
+            _client((host, port, path), hands[i::clients], concurrency, latencies)
+            for i in range(clients)
+        ))
+    finally:
+        if server is not None:
+            await server.close()
+    return LoadResult(latencies, perf_counter() - start, server.batches if server else None)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the evaluation service.")
+    parser.add_argument('-n', '--requests', type=int, default=10_000, help="number of requests (default: 10000)")
+    parser.add_argument('-c', '--clients', type=int, default=4, help="client connections (default: 4)")
+    parser.add_argument('--concurrency', type=int, default=32, help="requests in flight per client (default: 32)")
+    parser.add_argument('--host', default='127.0.0.1', help="server host (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=None, help="server port (default: start a server in-process)")
+    parser.add_argument('--unix', default=None, help="server Unix socket path")
+    parser.add_argument('--window', type=float, default=WINDOW * 1000, help="in-process batching window in ms")
+    parser.add_argument('--seed', type=int, default=None, help="random seed")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run_load(
+        args.requests, args.clients, args.concurrency, args.host, args.port, args.unix,
+        window=args.window / 1000, seed=args.seed
+    ))
+    print(result.report())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,440 @@
+"""Omaha hands, which use exactly two hole cards and three board cards.
+
+In Omaha each player has 4 (PLO4) or 5 (PLO5) hole cards, and their hand is
+the best of every 5-card hand made of exactly two of them and exactly three
+of the board cards: 6 or 10 pairs of hole cards times up to 10 triples of
+board cards, so 60 or 100 candidate hands on the river. Taking the best 5 of
+all of the cards, as `hand.HandSpace` does for hold 'em, would both break
+that rule and score far more hands.
+
+Each candidate is split into its pair of hole cards and its triple of board
+cards. Both halves are reduced to the bitmask of their ranks, the suit they
+all share (if any) and an index of their multiset of ranks (one of 91 for a
+pair and 455 for a triple). The triples of each board are reduced once and
+shared by every pair of hole cards of every player, after which each
+candidate hand is a couple of bitwise operations and a lookup:
+
+    - Flushes are looked up by the bitmask of their ranks, as in
+      `evaluator.evaluate5`.
+    - Other hands are looked up in a precomputed table of the score of
+      every pair of ranks with every triple of ranks, by the sum of their
+      indexes.
+
+`evaluate_boards` scores arrays of hands this way with NumPy, for
+simulations (see `equity.equity`). `evaluate` scores a single hand with the
+`evaluator` tables, reusing each triple for every pair in the same way, and
+`OmahaHandSpace` is the Omaha counterpart of `hand.HandSpace`.
+"""
+from functools import lru_cache
+from itertools import combinations, combinations_with_replacement, permutations
+import numpy as np
+from card import Card
+from cardset import CardSet
+from draws import _as_mask
+from enums import Draw, HandStrength
+from hand import HandSpace
+import evaluator
+from evaluator import CARD_CODES, PRIMES, STRAIGHTS, _FLUSH, _PRODUCTS, _UNIQUE5
+
+# The numbers of hole cards in PLO4 and PLO5.
+HOLE_SIZES = (4, 5)
+
+# Candidate hands scored at once, to bound the size of temporary arrays.
+CHUNK_SIZE = 1 << 16
+
+_RANK_BITS = np.array([1 << (i >> 2) for i in range(52)], dtype=np.int64)
+_SUIT_BITS = np.array([1 << (i & 3) for i in range(52)], dtype=np.int64)
+_RANKS = np.array([i >> 2 for i in range(52)], dtype=np.intp)
+
+_FLUSH_TABLE = np.asarray(_FLUSH, dtype=np.uint16)
+
+# Every multiset of ranks of a pair and of a triple, and its index.
+_PAIR_RANKS = list(combinations_with_replacement(range(13), 2))
+_TRIPLE_RANKS = list(combinations_with_replacement(range(13), 3))
+_PAIR_INDEX = np.zeros((13,) * 2, dtype=np.intp)
+for _i, _ranks in enumerate(_PAIR_RANKS):
+    for _order in permutations(_ranks):
+        _PAIR_INDEX[_order] = _i * len(_TRIPLE_RANKS)
+_TRIPLE_INDEX = np.zeros((13,) * 3, dtype=np.intp)
+for _i, _ranks in enumerate(_TRIPLE_RANKS):
+    for _order in permutations(_ranks):
+        _TRIPLE_INDEX[_order] = _i
+
+def _nonflush(ranks):
+    # Score of 5 ranks in more than one suit, or 0 for five of a kind.
+    bits = sum(1 << r for r in set(ranks))
+    if bits.bit_count() == 5:
+        return _UNIQUE5[bits]
+    product = 1
+    for r in ranks:
+        product *= PRIMES[r]
+    return _PRODUCTS.get(product, 0)
+
+# The non-flush score of every pair of ranks with every triple, indexed by
+# the sum of their `_PAIR_INDEX` and `_TRIPLE_INDEX`.
+_NONFLUSH_TABLE = np.array(
+    [_nonflush(pair + triple) for pair in _PAIR_RANKS for triple in _TRIPLE_RANKS], dtype=np.uint16
+)
+del _i, _ranks, _order
+
+def evaluate(hole, board):
+    """Score the best Omaha hand of some hole cards on a board.
+
+    Parameters
+    ----------
+    hole : list
+        Ids of the (4 or 5) hole cards (see `card.Card.id`).
+    board : list
+        Ids of the 3 to 5 board cards, all different from the hole cards.
+
+    Returns
+    -------
+    int
+        The score of the best hand made of exactly two hole cards and three
+        board cards, as given by `evaluator.evaluate5`.
+
+    """
+    pairs = [
+        (CARD_CODES[a] | CARD_CODES[b], CARD_CODES[a] & CARD_CODES[b],
+         (CARD_CODES[a] & 0xFF) * (CARD_CODES[b] & 0xFF))
+        for a, b in combinations(hole, 2)
+    ]
+    best = 0
+    for x, y, z in combinations(board, 3):
+        x, y, z = CARD_CODES[x], CARD_CODES[y], CARD_CODES[z]
+        triple_bits = x | y | z
+        triple_suit = x & y & z & 0xF000
+        triple_product = (x & 0xFF) * (y & 0xFF) * (z & 0xFF)
+        for pair_bits, pair_suit, pair_product in pairs:
+            bits = (triple_bits | pair_bits) >> 16
+            if triple_suit & pair_suit:
+                score = _FLUSH[bits]
+            else:
+                score = _UNIQUE5[bits] or _PRODUCTS[triple_product * pair_product]
+            if score > best:
+                best = score
+    return best
+
+def _reduce(cards, index, ranks_index):
+    # The rank bitmask, shared suit bit (or 0) and rank multiset index of each
+    # group of cards picked by the rows of index, along a new last axis.
+    picked = cards[..., index]
+    ranks = _RANKS[picked]
+    return (
+        np.bitwise_or.reduce(_RANK_BITS[picked], axis=-1),
+        np.bitwise_and.reduce(_SUIT_BITS[picked], axis=-1),
+        ranks_index[tuple(np.moveaxis(ranks, -1, 0))],
+    )
+
+def _best(pairs, triples):
+    # The best score of each row over every pair and triple, from `_reduce`
+    # of shape (..., K) and (..., T).
+    bits = pairs[0][..., :, None] | triples[0][..., None, :]
+    flush = (pairs[1][..., :, None] & triples[1][..., None, :]) != 0
+    scores = _NONFLUSH_TABLE[pairs[2][..., :, None] + triples[2][..., None, :]]
+    scores[flush] = _FLUSH_TABLE[bits[flush]]
+    return scores.max(axis=(-2, -1))
+
+def evaluate_boards(boards, holes):
+    """Score several players' Omaha hole cards on each of an array of boards.
+
+    Each board's triples of cards are reduced once and shared by every pair
+    of every player's hole cards.
+
+    Parameters
+    ----------
+    boards : numpy.ndarray
+        An integer array of shape `(N, 3)`, `(N, 4)` or `(N, 5)` of card ids.
+    holes : numpy.ndarray
+        An integer array of each player's 4 or 5 hole card ids, either of
+        shape `(P, H)` to use the same hole cards on every board, or
+        `(P, N, H)`. Hole cards should not also appear on the boards: the
+        scores of any such rows are meaningless (but harmless, so that
+        callers can mask them out afterwards).
+
+    Raises
+    ------
+    ValueError
+        If the arrays do not have the shapes above.
+
+    Returns
+    -------
+    numpy.ndarray
+        A `uint16` array of shape `(P, N)` with the score of each player's
+        best hand on each board, as given by `evaluate`.
+
+    """
+    boards = np.asarray(boards)
+    holes = np.asarray(holes)
+    if boards.ndim != 2 or not 3 <= boards.shape[1] <= 5:
+        raise ValueError(f"Expected boards of shape (N, 3 to 5), but got {boards.shape}.")
+    if holes.shape[-1] not in HOLE_SIZES or holes.ndim not in (2, 3) or (holes.ndim == 3 and holes.shape[1] != len(boards)):
+        raise ValueError(f"Expected holes of shape (P, 4 or 5) or (P, {len(boards)}, 4 or 5), but got {holes.shape}.")
+
+    boards = boards.astype(np.intp)
+    holes = holes.astype(np.intp)
+    pair_index = np.array(list(combinations(range(holes.shape[-1]), 2)))
+    triple_index = np.array(list(combinations(range(boards.shape[1]), 3)))
+    if holes.ndim == 2:
+        fixed = _reduce(holes, pair_index, _PAIR_INDEX)
+
+    scores = np.empty((len(holes), len(boards)), dtype=np.uint16)
+    step = max(1, CHUNK_SIZE // (len(pair_index) * len(triple_index)))
+    for start in range(0, len(boards), step):
+        stop = start + step
+        triples = _reduce(boards[start:stop], triple_index, _TRIPLE_INDEX)
+        for player, hole in enumerate(holes):
+            if holes.ndim == 2:
+                pairs = tuple(part[player][None] for part in fixed)
+            else:
+                pairs = _reduce(hole[start:stop], pair_index, _PAIR_INDEX)
+            scores[player, start:stop] = _best(pairs, triples)
+    return scores
+
+@lru_cache(maxsize=1 << 12)
+def _analyse(hole_mask, board_mask):
+    # Returns the draws and the bitmask of outs of hole cards on a flop or
+    # turn, as `draws._analyse` but with two hole cards and three board cards
+    # in every hand.
+    hole = [i for i in range(52) if hole_mask >> i & 1]
+    board = [i for i in range(52) if board_mask >> i & 1]
+    if not 3 <= len(board) <= 4:
+        raise ValueError(f"Expected 3 or 4 board cards, but got {len(board)}.")
+    made = evaluator.strength_of(evaluate(hole, board))
+    pairs = list(combinations(hole, 2))
+
+    # Every unseen card that, as the next board card, makes a straight or a
+    # flush (or a straight flush) that beats the made hand with some pair.
+    outs = 0
+    straight_ranks = 0
+    flush = False
+    for card in range(52):
+        if (hole_mask | board_mask) >> card & 1:
+            continue
+        for rest in combinations(board, 2):
+            for pair in pairs:
+                strength = evaluator.strength_of(evaluator.evaluate5(*pair, *rest, card))
+                if strength.value >= HandStrength.STRAIGHT.value and strength.value > made.value:
+                    outs |= 1 << card
+                    if strength is HandStrength.STRAIGHT:
+                        straight_ranks |= 1 << (card >> 2)
+                    elif strength is HandStrength.FLUSH:
+                        flush = True
+
+    draws = set()
+    if straight_ranks.bit_count() >= 2:
+        draws.add(Draw.OPEN_ENDED_STRAIGHT_DRAW)
+    elif straight_ranks:
+        draws.add(Draw.GUTSHOT)
+    elif len(board) == 3 and made.value < HandStrength.STRAIGHT.value and any(
+        (straight & ((1 << (a >> 2)) | (1 << (b >> 2)) | (1 << (c >> 2)))).bit_count() == 3
+        for straight in STRAIGHTS for a, b in pairs for c in board
+    ):
+        draws.add(Draw.BACKDOOR_STRAIGHT_DRAW)
+    if flush:
+        draws.add(Draw.FLUSH_DRAW)
+    elif len(board) == 3 and made.value < HandStrength.FLUSH.value and any(
+        a & 3 == b & 3 and sum(c & 3 == a & 3 for c in board) == 1 for a, b in pairs
+    ):
+        draws.add(Draw.BACKDOOR_FLUSH_DRAW)
+    if flush and straight_ranks:
+        draws.add(Draw.COMBO_DRAW)
+    return frozenset(draws), outs
+
+
+class OmahaHandSpace(HandSpace):
+    """An Omaha hand space.
+
+    Like `hand.HandSpace`, but every hand is made of exactly two of the 4 or
+    5 hole cards and exactly three of the community cards. The best score is
+    looked up when the space is created and whenever a community card is
+    added (see `evaluate`), and hands are only built when they are accessed.
+    There are no hands until the flop, so until then `score`, `best_hand`
+    and `strength` are None.
+
+    Parameters
+    ----------
+    hole_cards : list or CardSet
+        The 4 or 5 hole cards.
+    community_cards : list or CardSet, optional
+        Up to 5 community cards. The default is None.
+
+    Raises
+    ------
+    ValueError
+        If there are not 4 or 5 hole cards, or more than 5 community cards.
+
+    Returns
+    -------
+    None.
+
+    """
+
+    def __init__(self, hole_cards: list, community_cards: list = None):
+        self.hole_cards = list(hole_cards)
+        self.community_cards = list(community_cards or [])
+        if len(self.hole_cards) not in HOLE_SIZES:
+            raise ValueError(f"Omaha hands have 4 or 5 hole cards, not {len(self.hole_cards)}.")
+        if len(self.community_cards) > 5:
+            raise ValueError(f"The board can have at most 5 cards, but got {len(self.community_cards)}.")
+        self.space = sorted(self.hole_cards + self.community_cards, reverse=True)
+        self._hands = None
+        self._best_hand = None
+        self._score = None
+        self._rescore()
+
+    def _rescore(self):
+        self._score = None
+        if len(self.community_cards) >= 3:
+            self._score = evaluate([c.id for c in self.hole_cards], [c.id for c in self.community_cards])
+
+    def add_community(self, card):
+        """Deal another community card into the hand space.
+
+        Parameters
+        ----------
+        card : Card or str
+            The new community card, or its label.
+
+        Raises
+        ------
+        ValueError
+            If the card is already in the hand space, or the board is full.
+
+        Returns
+        -------
+        None.
+
+        """
+        card = card if isinstance(card, Card) else Card(card)
+        if any(c.id == card.id for c in self.space):
+            raise ValueError(f"{card.label} is already in the hand space.")
+        if len(self.community_cards) == 5:
+            raise ValueError("The board already has 5 cards.")
+        self.community_cards.append(card)
+        self.space = sorted(self.space + [card], reverse=True)
+        self._hands = None
+        self._best_hand = None
+        self._rescore()
+
+    def copy(self):
+        """Copy the hand space, so that it can be dealt to separately.
+
+        Returns
+        -------
+        OmahaHandSpace
+            A new hand space with the same cards, sharing any best hand and
+            hands found so far.
+
+        """
+        other = OmahaHandSpace.__new__(OmahaHandSpace)
+        other.__dict__.update(self.__dict__)
+        other.hole_cards = list(self.hole_cards)
+        other.community_cards = list(self.community_cards)
+        other.space = list(self.space)
+        return other
+
+    @property
+    def strength(self):
+        """str: The strength category name of the best hand, or None before
+        the flop."""
+        return None if self._score is None else evaluator.strength_of(self._score).name
+
+    @property
+    def percentile(self):
+        """None: Percentiles are only tabulated for hold 'em hands (see
+        `handclass`)."""
+        return None
+
+    @property
+    def draws(self):
+        """list: The straight and flush draws, as `enums.Draw` members,
+        strongest first, as for `hand.HandSpace.draws` but only counting
+        hands of two hole cards and three community cards. Empty unless
+        there are 3 or 4 community cards."""
+        if not 3 <= len(self.community_cards) <= 4:
+            return []
+        draws = _analyse(_as_mask(self.hole_cards), _as_mask(self.community_cards))[0]
+        return sorted(draws, key=lambda draw: draw.value, reverse=True)
+
+    def outs(self, dead=None):
+        """Find the cards that would complete a straight or flush draw.
+
+        An out is a card that has not been seen which, as the next community
+        card, would give a straight, a flush or a straight flush of two hole
+        cards and three community cards that beats the best hand already
+        made (see `draws.outs`).
+
+        Parameters
+        ----------
+        dead : list or CardSet, optional
+            Cards that have been seen elsewhere and cannot come. The default
+            is None.
+
+        Raises
+        ------
+        ValueError
+            If there are not 3 or 4 community cards.
+
+        Returns
+        -------
+        CardSet
+            The outs.
+
+        """
+        mask = _analyse(_as_mask(self.hole_cards), _as_mask(self.community_cards))[1]
+        if dead is not None:
+            mask &= ~_as_mask(dead)
+        return CardSet.from_mask(mask)
+
+    def get_combos(self):
+        """Get every hand of two hole cards and three community cards.
+
+        Returns
+        -------
+        generator
+            Each combination of 5 cards, as a tuple of the two hole cards
+            followed by the three community cards.
+
+        """
+        return (
+            pair + triple
+            for pair in combinations(self.hole_cards, 2)
+            for triple in combinations(self.community_cards, 3)
+        )
+
+    def iter_hands(self, strength=None):
+        """Iterate over the hands in the hand space, one at a time.
+
+        See `hand.HandSpace.iter_hands`. There are no hands before the flop.
+
+        Parameters
+        ----------
+        strength : HandStrength, optional
+            Only yield hands of this strength. The default is None, which
+            yields every hand.
+
+        Yields
+        ------
+        Hand
+            Each hand, in the order of `get_combos`.
+
+        """
+        if self._score is not None:
+            yield from super().iter_hands(strength)
+
+    def find_best_hand(self):
+        """Find the best hand available.
+
+        See `hand.HandSpace.find_best_hand`.
+
+        Returns
+        -------
+        Hand
+            The best hand of two hole cards and three community cards, or
+            None before the flop.
+
+        """
+        if self._score is None:
+            return None
+        return super().find_best_hand()
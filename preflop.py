@@ -0,0 +1,287 @@
+"""Exact heads-up preflop equities of the 169 starting hands.
+
+Every pair of hole cards belongs to one of 169 starting hands: a pair like
+`'QQ'`, or two ranks that are suited like `'AKs'` or offsuit like `'AKo'`.
+`matrix` holds the exact equity of each starting hand against each other one
+(averaged over every combination of their hole cards that do not share a
+card, and every board), so that a preflop equity query is an array lookup.
+
+The matrix is built once by enumerating every 5-card board, and then saved
+to `evaluator.CACHE_DIR` and memory-mapped, like the evaluator tables. Only
+the 134459 boards that are distinct up to a permutation of the suits are
+scored (see `isomorphism`), each for all 1326 hole card combinations at once
+with `batch.evaluate_boards`. For each board, every combination's wins and
+ties against each starting hand are counted from running per-hand tallies
+of the combinations sorted by score, and combinations that share a card are
+then subtracted, so that no pair of combinations is compared directly.
+
+Building the matrix takes several minutes per CPU, and runs on a pool of
+processes. It happens automatically the first time the matrix is used, or
+can be run from the command line:
+
+    python preflop.py build
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+import mmap
+import os
+import numpy as np
+from card import Card
+from batch import evaluate_boards
+from enums import Rank
+from evaluator import cache_path
+from equity import iter_runouts
+from isomorphism import SUIT_PERMUTATIONS, canonical_mask
+
+# Starting hands in grid order: row i and column j are ranks from ace down,
+# with pairs on the diagonal, suited hands above it and offsuit hands below.
+def _grid_label(i, j):
+    high, low = Rank(14 - min(i, j)).label, Rank(14 - max(i, j)).label
+    return high + low + ('' if i == j else 's' if i < j else 'o')
+
+HAND_CLASSES = tuple(_grid_label(i, j) for i in range(13) for j in range(13))
+_CLASS_INDEX = {label: i for i, label in enumerate(HAND_CLASSES)}
+
+# Boards per step when tallying, to bound the size of temporary arrays.
+STEP_SIZE = 64
+
+# Board combinations per unit of work when building.
+CHUNK_SIZE = 1 << 16
+
+_MATRIX_MAGIC = b'PFPRE001'
+_MATRIX_FILE = 'preflop-v1.bin'
+
+def _class_of(a, b):
+    # Starting hand index of two card ids.
+    i, j = sorted((12 - (a >> 2), 12 - (b >> 2)))
+    return i * 13 + j if (a & 3) == (b & 3) else j * 13 + i
+
+# Every combination of hole cards, and its starting hand.
+_HOLDINGS = np.array(list(combinations(range(52), 2)), dtype=np.uint8)
+_HOLDING_CLASSES = np.array([_class_of(a, b) for a, b in _HOLDINGS.tolist()], dtype=np.intp)
+_HOLDING_MASKS = (np.uint64(1) << _HOLDINGS.astype(np.uint64)).sum(axis=1, dtype=np.uint64)
+
+# Every pair of different combinations that share a card.
+_SHARING = np.array([
+    pair
+    for card in range(52)
+    for pair in combinations(np.flatnonzero((_HOLDINGS == card).any(axis=1)).tolist(), 2)
+], dtype=np.intp).T
+
+def hand_class(cards):
+    """Get the starting hand of two hole cards.
+
+    Parameters
+    ----------
+    cards : iterable
+        Two `Card` instances and/or labels, or a `CardSet`.
+
+    Raises
+    ------
+    ValueError
+        If there are not exactly two different cards.
+
+    Returns
+    -------
+    str
+        The starting hand, like `'AKs'`, `'T9o'` or `'22'`.
+
+    """
+    ids = [(c if isinstance(c, Card) else Card(c)).id for c in cards]
+    if len(set(ids)) != 2 or len(ids) != 2:
+        raise ValueError(f"Expected two different hole cards, but got {len(ids)}.")
+    return HAND_CLASSES[_class_of(*ids)]
+
+def _index(hand):
+    if isinstance(hand, str) and hand in _CLASS_INDEX:
+        return _CLASS_INDEX[hand]
+    if isinstance(hand, str) and len(hand) == 3 and hand[:2] + hand[2].lower() in _CLASS_INDEX:
+        return _CLASS_INDEX[hand[:2] + hand[2].lower()]
+    if isinstance(hand, str):
+        raise ValueError(f"Unknown starting hand: {hand!r}")
+    return _CLASS_INDEX[hand_class(hand)]
+
+def _tally(boards, weights):
+    # Totals over the boards, each counted `weights` times, of every starting
+    # hand's wins plus half its ties against each other starting hand, and
+    # of how many pairs of their combinations met. Combinations that clash
+    # with the board or with each other are left out.
+    k = len(HAND_CLASSES)
+    shares = np.zeros((k, k))
+    counts = np.zeros((k, k))
+    if not len(boards):
+        return shares, counts
+
+    board_masks = (np.uint64(1) << boards.astype(np.uint64)).sum(axis=1, dtype=np.uint64)
+    all_scores = evaluate_boards(boards, _HOLDINGS).T.astype(np.int16)
+    all_valid = (_HOLDING_MASKS[None, :] & board_masks[:, None]) == 0
+    h, g = _SHARING
+    shared_classes = _HOLDING_CLASSES[h] * k + _HOLDING_CLASSES[g]
+    shared_reversed = _HOLDING_CLASSES[g] * k + _HOLDING_CLASSES[h]
+    for start in range(0, len(boards), STEP_SIZE):
+        scores = all_scores[start:start+STEP_SIZE]
+        valid = all_valid[start:start+STEP_SIZE]
+        weight = weights[start:start+STEP_SIZE]
+        n_boards = len(scores)
+
+        # Number the distinct scores on each board from the lowest, and count
+        # each starting hand's combinations at each of them.
+        order = np.argsort(scores, axis=1)
+        ranked = np.take_along_axis(scores, order, axis=1)
+        levels = np.zeros(ranked.shape, dtype=np.intp)
+        np.cumsum(ranked[:, 1:] != ranked[:, :-1], axis=1, out=levels[:, 1:])
+        n_levels = int(levels[:, -1].max()) + 1
+        cells = (np.arange(n_boards)[:, None] * n_levels + levels) * k + _HOLDING_CLASSES[order]
+        at_level = np.bincount(
+            cells.ravel(), weights=np.take_along_axis(valid, order, axis=1).ravel(),
+            minlength=n_boards * n_levels * k
+        ).reshape(n_boards, n_levels, k)
+
+        # Each combination beats those at lower levels and ties with those at
+        # its own level, itself included, which is taken off again.
+        beaten = np.cumsum(at_level, axis=1) - at_level / 2
+        shares += (weight[:, None, None] * at_level).reshape(-1, k).T @ beaten.reshape(-1, k)
+        per_class = at_level.sum(axis=1)
+        counts += (weight[:, None] * per_class).T @ per_class
+        self_weight = weight @ per_class
+        shares[np.diag_indices(k)] -= self_weight / 2
+        counts[np.diag_indices(k)] -= self_weight
+
+        # Pairs of combinations that share a card never meet. Between them,
+        # the two combinations of a pair win all of its shares.
+        scores_t = scores.T
+        valid_t = valid.T.astype(np.float32)
+        both = valid_t[h] * valid_t[g]
+        met = both @ weight
+        won = (met + (np.sign(scores_t[h] - scores_t[g]).astype(np.float32) * both) @ weight) / 2
+        shares -= (
+            np.bincount(shared_classes, weights=won, minlength=k * k) + 
+            np.bincount(shared_reversed, weights=met - won, minlength=k * k)
+        ).reshape(k, k)
+        counts -= (
+            np.bincount(shared_classes, weights=met, minlength=k * k) + 
+            np.bincount(shared_reversed, weights=met, minlength=k * k)
+        ).reshape(k, k)
+    return shares, counts
+
+def _tally_chunk(rows):
+    # Tallies the boards in a chunk that are canonical under every suit
+    # permutation, each weighted by the number of boards it stands for.
+    canonical, weights = canonical_mask(rows, SUIT_PERMUTATIONS)
+    return _tally(rows[canonical], weights[canonical].astype(float))
+
+def build_matrix(path=None, workers=None):
+    """Build the preflop equity matrix and save it to disk.
+
+    This happens automatically the first time the matrix is used, so is only
+    needed to rebuild or relocate it.
+
+    Parameters
+    ----------
+    path : str, optional
+        Where to save the matrix. The default is None, which saves it to the
+        cache directory (see `evaluator.cache_path`).
+    workers : int, optional
+        The number of processes to build it on. The default is None, which
+        uses one per CPU.
+
+    Returns
+    -------
+    str
+        The path of the saved matrix file.
+
+    """
+    path = path or cache_path(_MATRIX_FILE)
+    workers = workers or os.cpu_count() or 1
+    chunks = iter_runouts(np.arange(52, dtype=np.uint8), 5, CHUNK_SIZE)
+    if workers == 1:
+        shares, counts = map(sum, zip(*map(_tally_chunk, chunks)))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            shares, counts = map(sum, zip(*pool.map(_tally_chunk, chunks)))
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(_MATRIX_MAGIC + (shares / counts).astype('<f8').tobytes())
+    os.replace(tmp, path)
+    return path
+
+def _map_matrix(path):
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    k = len(HAND_CLASSES)
+    if len(buffer) != len(_MATRIX_MAGIC) + 8 * k * k or buffer[:len(_MATRIX_MAGIC)] != _MATRIX_MAGIC:
+        buffer.close()
+        raise ValueError(f"Stale or corrupt preflop matrix: {path}")
+    return np.frombuffer(buffer, dtype='<f8', offset=len(_MATRIX_MAGIC)).reshape(k, k)
+
+_MATRIX = None
+
+def matrix():
+    """Get the preflop equity matrix, building it first if necessary.
+
+    Returns
+    -------
+    numpy.ndarray
+        A read-only array of shape `(169, 169)`, where entry `[i, j]` is the
+        equity of `HAND_CLASSES[i]` against `HAND_CLASSES[j]`.
+
+    """
+    global _MATRIX
+    if _MATRIX is None:
+        path = cache_path(_MATRIX_FILE)
+        try:
+            _MATRIX = _map_matrix(path)
+        except (OSError, ValueError):
+            _MATRIX = _map_matrix(build_matrix(path))
+    return _MATRIX
+
+def equity(hand, villain):
+    """Look up the heads-up preflop equity of one starting hand against another.
+
+    The equity is the average over every combination of each hand's hole
+    cards that do not share a card, so it is exact for the starting hands
+    but not for particular hole cards: `['Ah', 'As']` against `['Kd', 'Kc']`
+    is looked up as `'AA'` against `'KK'`.
+
+    Parameters
+    ----------
+    hand : str or iterable
+        A starting hand like `'AKs'`, `'72o'` or `'TT'`, or two hole cards as
+        `Card` instances and/or labels.
+    villain : str or iterable
+        The opponent's starting hand or hole cards.
+
+    Raises
+    ------
+    ValueError
+        If a starting hand is not recognised.
+
+    Returns
+    -------
+    float
+        The share of the pot that `hand` wins on average, with ties split.
+
+    """
+    return float(matrix()[_index(hand), _index(villain)])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the preflop equity matrix.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build_parser = commands.add_parser('build', help="build the matrix")
+    build_parser.add_argument('-w', '--workers', type=int, default=None, help="number of processes (default: one per CPU)")
+    build_parser.add_argument('-o', '--output', default=None, help="file to save the matrix to (default: the cache directory)")
+    query_parser = commands.add_parser('query', help="look up the equity of one starting hand against another")
+    query_parser.add_argument('hand', help="starting hand, e.g. AKs")
+    query_parser.add_argument('villain', help="opponent's starting hand, e.g. QQ")
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        print(build_matrix(args.output, args.workers))
+    else:
+        print(f"{args.hand} vs {args.villain}: {equity(args.hand, args.villain):.4f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,398 @@
+"""Hand ranges, and equity between them.
+
+A range is a set of hole card combinations, each with a weight, written the
+usual way as comma-separated starting hands:
+
+    - `'QQ'`, `'AKs'`, `'AKo'` or `'AK'` (suited and offsuit), or exact hole
+      cards like `'AhKh'`.
+    - `'QQ+'` for QQ, KK and AA, and `'ATs+'` for ATs up to AKs.
+    - `'88-55'` or `'KTo-K7o'` for a run of pairs or of kickers.
+    - A weight as a percentage in front, like `'50% AQo'`, or as a fraction
+      after, like `'AQo:0.5'`.
+
+For example `parse_range("QQ+, AKs, 50% AQo")` has 18 + 4 + 12 combinations,
+the offsuit ones weighted 0.5. A hand that appears twice takes the later
+weight.
+
+`range_equity` calculates one range's equity against another over every
+board (or a random sample of boards). Each board is scored once for every
+combination of both ranges with `batch.evaluate_boards`. Combinations are
+then compared all at once from the scores sorted per board, with the pairs
+of combinations that share a card subtracted card by card, so that pairs of
+combinations are never compared directly. This is fast enough for full
+ranges of over a thousand combinations each.
+"""
+import re
+import numpy as np
+from card import Card
+from cardset import CardSet
+from deck import Deck
+from batch import evaluate_boards
+from equity import as_ids, id_masks, iter_runouts
+
+# Combination-board pairs scored per step, to bound the size of temporary
+# arrays.
+STEP_SIZE = 1 << 16
+
+# Boards scored at once.
+CHUNK_SIZE = 1 << 12
+
+_RANKS = 'AKQJT98765432'
+_HAND = re.compile(r"^([2-9TJQKA])([2-9TJQKA])([so]?)$")
+_WEIGHT = re.compile(r"^(?:(\d+(?:\.\d+)?)%\s*)?(.*?)(?::(\d*\.?\d+))?$")
+
+class Range:
+    """Weighted hole card combinations.
+
+    Parameters
+    ----------
+    combos : iterable
+        Pairs of hole cards, each as `Card` instances and/or labels, or an
+        integer array of shape `(K, 2)` of card ids.
+    weights : iterable, optional
+        The weight of each combination, from 0 to 1. The default is None,
+        which weights them all 1.
+
+    Raises
+    ------
+    ValueError
+        If a combination does not have two different cards, a combination
+        is given twice, or a weight is outside 0 to 1.
+
+    Attributes
+    ----------
+    combos : numpy.ndarray
+        A `uint8` array of shape `(K, 2)` of card ids, the higher id first.
+    weights : numpy.ndarray
+        A float array of shape `(K,)` of the weight of each combination.
+
+    """
+    def __init__(self, combos, weights=None):
+        ids = [as_ids(combo) if not isinstance(combo, np.ndarray) else combo.tolist() for combo in combos]
+        if any(len(combo) != 2 or combo[0] == combo[1] for combo in ids):
+            raise ValueError("Each combination must have two different cards.")
+        self.combos = np.sort(np.array(ids, dtype=np.uint8).reshape(-1, 2), axis=1)[:, ::-1].copy()
+        self.weights = np.ones(len(ids)) if weights is None else np.asarray(weights, dtype=float)
+        if len(self.weights) != len(ids):
+            raise ValueError(f"Got {len(ids)} combinations but {len(self.weights)} weights.")
+        if ((self.weights < 0) | (self.weights > 1)).any():
+            raise ValueError("Weights must be from 0 to 1.")
+        if len(np.unique(id_masks(self.combos))) != len(ids):
+            raise ValueError("Each combination can only be given once.")
+
+    def __len__(self):
+        return len(self.combos)
+
+    def __repr__(self):
+        return f"<Range({len(self)} combos)>"
+
+    @property
+    def labels(self):
+        """list: The labels of each combination's cards, like `'AhKh'`."""
+        return [Card.from_id(a).label + Card.from_id(b).label for a, b in self.combos.tolist()]
+
+    @property
+    def size(self):
+        """float: The total weight of the combinations."""
+        return float(self.weights.sum())
+
+    def without(self, cards):
+        """Remove the combinations that use any of some cards.
+
+        Parameters
+        ----------
+        cards : list or CardSet
+            The cards, e.g. the board.
+
+        Returns
+        -------
+        Range
+            The remaining combinations and their weights.
+
+        """
+        mask = np.uint64(CardSet(cards).mask) if len(cards) else np.uint64(0)
+        keep = (id_masks(self.combos) & mask) == 0
+        return Range(self.combos[keep], self.weights[keep])
+
+def _hand_combos(token):
+    # Card id pairs of one starting hand like 'AKs', 'AK' or 'QQ'.
+    match = _HAND.match(token)
+    if match is None:
+        raise ValueError(f"Unknown hand: {token!r}")
+    high, low, kind = match.groups()
+    if high == low and kind:
+        raise ValueError(f"Pairs cannot be suited or offsuit: {token!r}")
+    high, low = 14 - _RANKS.index(high), 14 - _RANKS.index(low)
+    if high == low:
+        suits = [(s, t) for s in range(4) for t in range(s + 1, 4)]
+    else:
+        suits = [(s, t) for s in range(4) for t in range(4) if kind == '' or (s == t) == (kind == 's')]
+    return [((high - 2) * 4 + s, (low - 2) * 4 + t) for s, t in suits]
+
+def _expand(token):
+    # The starting hands that a token like 'QQ+', 'ATs+' or '88-55' stands for.
+    if token.endswith('+'):
+        hand = token[:-1]
+        match = _HAND.match(hand)
+        if match is None:
+            raise ValueError(f"Unknown hand: {token!r}")
+        high, low, kind = match.groups()
+        if high == low:
+            return [r + r for r in _RANKS[:_RANKS.index(high) + 1]]
+        return [high + r + kind for r in _RANKS[_RANKS.index(high) + 1:_RANKS.index(low) + 1]]
+    if '-' in token:
+        first, last = token.split('-', 1)
+        a, b = _HAND.match(first), _HAND.match(last)
+        if a is None or b is None or a.group(3) != b.group(3):
+            raise ValueError(f"Unknown hand range: {token!r}")
+        if a.group(1) == a.group(2) and b.group(1) == b.group(2):
+            i, j = sorted((_RANKS.index(a.group(1)), _RANKS.index(b.group(1))))
+            return [r + r for r in _RANKS[i:j + 1]]
+        if a.group(1) != b.group(1):
+            raise ValueError(f"Hands in a range must share their first card: {token!r}")
+        i, j = sorted((_RANKS.index(a.group(2)), _RANKS.index(b.group(2))))
+        return [a.group(1) + r + a.group(3) for r in _RANKS[i:j + 1] if r != a.group(1)]
+    return [token]
+
+def parse_range(text):
+    """Parse a range like `"QQ+, AKs, 50% AQo"`.
+
+    Parameters
+    ----------
+    text : str
+        Comma-separated starting hands, runs of hands or exact hole cards,
+        optionally weighted (see the module docstring).
+
+    Raises
+    ------
+    ValueError
+        If any part of the range is not recognised.
+
+    Returns
+    -------
+    Range
+        The combinations and their weights.
+
+    """
+    weights = {}
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        match = _WEIGHT.match(part)
+        percent, token, fraction = match.groups()
+        weight = float(percent) / 100 if percent else float(fraction) if fraction else 1.
+        token = token.strip()
+        if len(token) == 4 and token[1].lower() in 'cdhs' and token[3].lower() in 'cdhs':
+            combos = [tuple(as_ids([token[:2], token[2:]]))]
+        else:
+            token = token.upper().replace('S', 's').replace('O', 'o')
+            combos = [combo for hand in _expand(token) for combo in _hand_combos(hand)]
+        for a, b in combos:
+            weights[(max(a, b), min(a, b))] = weight
+    combos = [combo for combo, weight in weights.items() if weight > 0]
+    return Range(np.array(combos, dtype=np.uint8).reshape(-1, 2), [weights[c] for c in combos])
+
+class RangeEquityResult:
+    """Equity of one range against another, from `range_equity`.
+
+    Attributes
+    ----------
+    equity : float
+        The hero's share of the pot, averaged over every pair of hero and
+        villain combinations that do not share a card (weighted by their
+        weights) and every board.
+    stderr : float
+        The standard error of `equity` (zero when it was calculated
+        exactly).
+    hero : numpy.ndarray
+        The equity of each of the hero's combinations (in the order of
+        `Range.combos`) against the villain's range, or NaN for combinations
+        that never met one, e.g. because they use a board card.
+    villain : numpy.ndarray
+        The equity of each of the villain's combinations against the hero's
+        range.
+    boards : int
+        The number of boards that were evaluated.
+
+    """
+    def __init__(self, equity, stderr, hero, villain, boards):
+        self.equity = equity
+        self.stderr = stderr
+        self.hero = hero
+        self.villain = villain
+        self.boards = boards
+
+    def __repr__(self):
+        return f"<RangeEquityResult(equity={self.equity:.4f}, boards={self.boards})>"
+
+def _cumulative(keys, weights):
+    # The keys sorted, and the running total of their weights.
+    order = np.argsort(keys)
+    return keys[order], np.concatenate([[0.], np.cumsum(weights[order])])
+
+def _weight_below(keys, cumulative, queries):
+    # Total weight of the sorted keys below each query, and of those equal
+    # to it. Searching in sorted order is much faster than in random order.
+    flat = queries.ravel()
+    order = np.argsort(flat)
+    ordered = flat[order]
+    left = cumulative[np.searchsorted(keys, ordered, 'left')]
+    below, tied = np.empty(len(flat)), np.empty(len(flat))
+    below[order] = left
+    tied[order] = cumulative[np.searchsorted(keys, ordered, 'right')] - left
+    return below.reshape(queries.shape), tied.reshape(queries.shape)
+
+def _same(combos, other_combos):
+    # The index of each combination in the other range, or -1.
+    index = {mask: i for i, mask in enumerate(id_masks(other_combos).tolist())}
+    return np.array([index.get(mask, -1) for mask in id_masks(combos).tolist()], dtype=np.intp)
+
+def _against(scores, combos, weights, other_scores, other_combos, other_weights, same):
+    # Each combination's wins plus half its ties, and its weight, against
+    # the other range on each board, over pairs of combinations that share
+    # no card. Scores are (K, N), with 0 for combinations that clash with
+    # the board.
+    n_boards = scores.shape[1]
+    boards = np.arange(n_boards, dtype=np.int64)
+    scores, other_scores = scores.astype(np.int64), other_scores.astype(np.int64)
+    weight = other_weights[:, None] * (other_scores > 0)
+
+    # Against every combination of the other range on the same board.
+    keys, cumulative = _cumulative((boards * 8192 + other_scores).ravel(), weight.ravel())
+    below, tied = _weight_below(keys, cumulative, boards * 8192 + scores)
+    below -= cumulative[np.searchsorted(keys, boards * 8192)]
+    total = np.broadcast_to(weight.sum(axis=0), scores.shape).copy()
+
+    # Less those that share a card with it, found through each card in turn
+    # from the other range's scores sorted per board and card.
+    keys, cumulative = _cumulative(
+        ((boards * 52 + other_combos[:, :, None]) * 8192 + other_scores[:, None, :]).ravel(),
+        np.broadcast_to(weight[:, None, :], (len(other_combos), 2, n_boards)).ravel()
+    )
+    starts = cumulative[np.searchsorted(keys, np.arange(n_boards * 52, dtype=np.int64) * 8192)].reshape(n_boards, 52)
+    by_card = np.zeros((52, n_boards))
+    np.add.at(by_card, other_combos[:, 0], weight)
+    np.add.at(by_card, other_combos[:, 1], weight)
+    for card in (combos[:, 0].astype(np.int64), combos[:, 1].astype(np.int64)):
+        card_below, card_tied = _weight_below(keys, cumulative, (boards * 52 + card[:, None]) * 8192 + scores)
+        below -= card_below - starts[boards, card[:, None]]
+        tied -= card_tied
+        total -= by_card[card]
+
+    # An identical combination was taken off twice, and always ties.
+    has_same = same >= 0
+    total[has_same] += weight[same[has_same]]
+    tied[has_same] += weight[same[has_same]]
+
+    own = weights[:, None] * (scores > 0)
+    return own * (below + tied / 2), own * total
+
+def range_equity(hero, villain, board=None, dead=None, iterations=5_000, exact=False, seed=None):
+    """Calculate one range's equity against another.
+
+    Parameters
+    ----------
+    hero : Range or str
+        The hero's range, or its text (see `parse_range`).
+    villain : Range or str
+        The villain's range.
+    board : list, optional
+        Known community cards, from 0 to 5 cards. The default is None.
+    dead : list, optional
+        Cards known to be out of play. The default is None.
+    iterations : int, optional
+        The number of random boards to evaluate. Ignored if `exact` is True.
+        Each board takes about a millisecond with two full ranges. The 
+        default is 5000.
+    exact : bool, optional
+        Whether to enumerate every possible board instead. This takes a 
+        second or two from the flop on with full ranges, but is impractical 
+        from preflop. The default is False.
+    seed : int, optional
+        Seed for the random number generator. The default is None.
+
+    Raises
+    ------
+    ValueError
+        If the board has more than 5 cards, a card is given more than once,
+        `iterations` is less than 1, or no combinations of the two ranges
+        can meet.
+
+    Returns
+    -------
+    RangeEquityResult
+        The hero's equity, overall and per combination.
+
+    """
+    hero = parse_range(hero) if isinstance(hero, str) else hero
+    villain = parse_range(villain) if isinstance(villain, str) else villain
+    board = as_ids(board)
+    known = board + as_ids(dead)
+    if len(board) > 5:
+        raise ValueError(f"The board can have at most 5 cards, but got {len(board)}.")
+    if len(set(known)) != len(known):
+        raise ValueError("Board and dead cards must all be different.")
+    if not exact and iterations < 1:
+        raise ValueError(f"Expected at least 1 iteration, but got {iterations}.")
+    known_cards = [Card.from_id(i) for i in known]
+    # Combinations that use a known card keep their place, but never meet.
+    known_mask = np.uint64(CardSet(known_cards).mask)
+    hero, villain = (Range(r.combos, r.weights * ((id_masks(r.combos) & known_mask) == 0)) for r in (hero, villain))
+    board = np.array(board, dtype=np.uint8)
+    n_board = 5 - len(board)
+    live = np.array((CardSet.full() - CardSet(known_cards)).ids, dtype=np.uint8)
+
+    if exact:
+        runouts = iter_runouts(live, n_board, CHUNK_SIZE)
+    else:
+        rng = np.random.default_rng(seed)
+        exclude = CardSet(known_cards)
+        runouts = (
+            Deck().deal_batch(min(CHUNK_SIZE, iterations - start), 0, n_board, exclude=exclude, rng=rng)[1]
+            for start in range(0, iterations, CHUNK_SIZE)
+        )
+
+    same_hero, same_villain = _same(hero.combos, villain.combos), _same(villain.combos, hero.combos)
+    step = max(1, STEP_SIZE // max(len(hero), len(villain), 1))
+    hero_won, hero_met = np.zeros(len(hero)), np.zeros(len(hero))
+    villain_won, villain_met = np.zeros(len(villain)), np.zeros(len(villain))
+    board_won, board_met = [], []
+    n_boards = 0
+    # Every combination of either range is scored once per board.
+    union, index = np.unique(np.concatenate([hero.combos, villain.combos]), axis=0, return_inverse=True)
+    index = index.ravel()
+    hero_index, villain_index = index[:len(hero)], index[len(hero):]
+    union_masks = id_masks(union)
+    for chunk in runouts:
+        boards = np.hstack([np.broadcast_to(board, (len(chunk), len(board))), chunk])
+        scores = evaluate_boards(boards, union)
+        scores[(union_masks[:, None] & id_masks(boards)[None, :]) != 0] = 0
+        for start in range(0, len(chunk), step):
+            hero_scores = scores[hero_index, start:start+step]
+            villain_scores = scores[villain_index, start:start+step]
+
+            won, met = _against(hero_scores, hero.combos, hero.weights, villain_scores, villain.combos, villain.weights, same_hero)
+            hero_won += won.sum(axis=1)
+            hero_met += met.sum(axis=1)
+            board_won.append(won.sum(axis=0))
+            board_met.append(met.sum(axis=0))
+            won, met = _against(villain_scores, villain.combos, villain.weights, hero_scores, hero.combos, hero.weights, same_villain)
+            villain_won += won.sum(axis=1)
+            villain_met += met.sum(axis=1)
+            n_boards += hero_scores.shape[1]
+
+    board_won, board_met = np.concatenate(board_won), np.concatenate(board_met)
+    total = board_met.sum()
+    if not total:
+        raise ValueError("No combinations of the two ranges can meet.")
+    equity = board_won.sum() / total
+    stderr = 0.
+    if not exact and n_boards > 1:
+        # Delta-method standard error of the ratio of per-board totals.
+        residuals = (board_won - equity * board_met) / board_met.mean()
+        stderr = float(residuals.std(ddof=1) / np.sqrt(n_boards))
+    with np.errstate(invalid='ignore'):
+        return RangeEquityResult(
+            float(equity), stderr, hero_won / hero_met, villain_won / villain_met, n_boards
+        )
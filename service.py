@@ -0,0 +1,437 @@
+"""A local hand evaluation service, with micro-batching.
+
+Processes that need hands evaluated can share one server instead of each
+building `Hand` and `HandSpace` objects themselves. The server listens on
+localhost TCP or a Unix socket, and holds each request for up to `window`
+seconds, so that concurrent requests are answered together: evaluations
+with one call to `batch.evaluate_batch` per hand size, and equities one
+after another on a worker thread.
+
+The protocol is one compact JSON object per line in each direction. Each
+request has an `id`, chosen by the client, that is echoed in its response,
+and responses may arrive in any order:
+
+    {"id": 1, "op": "evaluate", "cards": ["As", "Ks", "Qs", "Js", "Ts", "2c", "2d"]}
+    {"id": 1, "score": 7462, "strength": "ROYAL_FLUSH"}
+
+    {"id": 2, "op": "equity", "hands": [["Ah", "As"], ["Kd", "Kc"]], "board": ["2c", "7d", "9h"], "exact": true}
+    {"id": 2, "equity": [0.912, 0.088], "stderr": [0.0, 0.0], "iterations": 903}
+
+    {"id": 3, "op": "evaluate", "cards": ["As"]}
+    {"id": 3, "error": "Expected 5 to 7 cards, but got 1."}
+
+`EvaluationClient` speaks the protocol, and the server can be started from
+the command line:
+
+    python service.py --port 8765
+"""
+import argparse
+import asyncio
+import json
+import numpy as np
+from card import Card
+from batch import evaluate_batch
+from enums import HandStrength
+from equity import equity
+
+# How long to hold requests for others to batch with, in seconds.
+WINDOW = 0.002
+
+# Batch at once, without waiting, when this many requests are held.
+MAX_BATCH = 1 << 12
+
+# Limit on the length of one request line, in bytes.
+LINE_LIMIT = 1 << 16
+
+def _labels(cards):
+    return None if cards is None else [c.label if isinstance(c, Card) else c for c in cards]
+
+def _as_ids(cards):
+    ids = [(c if isinstance(c, Card) else Card(c)).id for c in cards]
+    if len(set(ids)) != len(ids):
+        raise ValueError("Every card must be different.")
+    return ids
+
+def _parse(request):
+    # Check a request, returning its operation and arguments.
+    op = request.get('op')
+    if op == 'evaluate':
+        ids = _as_ids(request.get('cards', []))
+        if not 5 <= len(ids) <= 7:
+            raise ValueError(f"Expected 5 to 7 cards, but got {len(ids)}.")
+        return op, ids
+    if op == 'equity':
+        kwargs = {
+            'hole_cards_per_player': request.get('hands', []),
+            'board': request.get('board'),
+            'dead': request.get('dead'),
+            'iterations': int(request.get('iterations', 10_000)),
+            'seed': request.get('seed'),
+            'exact': bool(request.get('exact', False)),
+        }
+        return op, kwargs
+    raise ValueError(f"Unknown operation: {op!r}")
+
+def _evaluate_all(rows):
+    # Score the rows of card ids, one `evaluate_batch` call per length.
+    results = [None] * len(rows)
+    for n in (5, 6, 7):
+        indexes = [i for i, row in enumerate(rows) if len(row) == n]
+        if not indexes:
+            continue
+        scores, strengths = evaluate_batch(np.array([rows[i] for i in indexes], dtype=np.uint8))
+        for i, score, strength in zip(indexes, scores.tolist(), strengths.tolist()):
+            results[i] = {'score': score, 'strength': HandStrength(strength).name}
+    return results
+
+def _equity_all(requests):
+    # Calculate each request on its own, so that one bad request only fails
+    # itself and not the rest of its batch.
+    results = []
+    for kwargs in requests:
+        try:
+            result = equity(workers=1, **kwargs)
+        except Exception as e:
+            results.append({'error': str(e)})
+            continue
+        results.append({
+            'equity': result.equity.tolist(),
+            'stderr': result.stderr.tolist(),
+            'iterations': result.iterations,
+        })
+    return results
+
+class EvaluationServer:
+    """A server that answers evaluate and equity requests in batches.
+
+    Parameters
+    ----------
+    window : float, optional
+        How long to hold a request for others to batch with, in seconds.
+        The default is `WINDOW`.
+    max_batch : int, optional
+        The number of held requests at which a batch is answered straight
+        away. The default is `MAX_BATCH`.
+
+    Attributes
+    ----------
+    requests : int
+        The number of requests received.
+    batches : int
+        The number of batches they were answered in.
+
+    """
+    def __init__(self, window=WINDOW, max_batch=MAX_BATCH):
+        self.window = window
+        self.max_batch = max_batch
+        self.requests = 0
+        self.batches = 0
+        self._pending = []
+        self._timer = None
+        self._server = None
+
+    def __repr__(self):
+        return f"<EvaluationServer(address={self.address!r})>"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @property
+    def address(self):
+        """tuple or str: The `(host, port)` or Unix socket path listened on,
+        or None before `start`."""
+        if self._server is None:
+            return None
+        return self._server.sockets[0].getsockname()
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        """Start listening.
+
+        Parameters
+        ----------
+        host : str, optional
+            The TCP host to listen on. The default is `'127.0.0.1'`.
+        port : int, optional
+            The TCP port to listen on. The default is 0, which picks a free
+            port (see `address`).
+        path : str, optional
+            A Unix socket path to listen on instead of TCP. The default is
+            None.
+
+        Returns
+        -------
+        EvaluationServer
+            The server itself.
+
+        """
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path, limit=LINE_LIMIT)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port, limit=LINE_LIMIT)
+        return self
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stop listening, and answer any requests still held."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._pending:
+            await self._flush()
+
+    def submit(self, op, args):
+        """Hold a parsed request for the next batch.
+
+        Parameters
+        ----------
+        op : str
+            `'evaluate'` or `'equity'`.
+        args : list or dict
+            The card ids to evaluate, or the keyword arguments of
+            `equity.equity`.
+
+        Returns
+        -------
+        asyncio.Future
+            The response, without its `id`.
+
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((op, args, future))
+        self.requests += 1
+        if len(self._pending) >= self.max_batch:
+            asyncio.ensure_future(self._flush())
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.window, lambda: asyncio.ensure_future(self._flush())
+            )
+        return future
+
+    async def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        self.batches += 1
+        loop = asyncio.get_running_loop()
+        for op, run in (('evaluate', _evaluate_all), ('equity', _equity_all)):
+            requests = [(args, future) for o, args, future in pending if o == op]
+            if not requests:
+                continue
+            try:
+                results = await loop.run_in_executor(None, run, [args for args, _ in requests])
+            except Exception as e:
+                results = [{'error': str(e)}] * len(requests)
+            for (_, future), result in zip(requests, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def _respond(self, writer, request_id, future):
+        response = await future
+        writer.write(json.dumps({'id': request_id, **response}, separators=(',', ':')).encode() + b'\n')
+
+    async def _handle(self, reader, writer):
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                request_id = None
+                try:
+                    request = json.loads(line)
+                    request_id = request.get('id')
+                    future = self.submit(*_parse(request))
+                except Exception as e:
+                    # Answer any malformed request with an error, rather
+                    # than dropping the connection and its other requests.
+                    future = asyncio.get_running_loop().create_future()
+                    future.set_result({'error': str(e)})
+                task = asyncio.ensure_future(self._respond(writer, request_id, future))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+            await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+class EvaluationClient:
+    """An async client of `EvaluationServer`.
+
+    Requests can be made concurrently over the one connection, e.g. with
+    `asyncio.gather`, and are answered as their batches complete.
+    """
+    def __init__(self):
+        self._reader = None
+        self._writer = None
+        self._futures = {}
+        self._next_id = 0
+        self._listener = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def connect(self, host='127.0.0.1', port=None, path=None):
+        """Connect to a server.
+
+        Parameters
+        ----------
+        host : str, optional
+            The TCP host to connect to. The default is `'127.0.0.1'`.
+        port : int, optional
+            The TCP port to connect to.
+        path : str, optional
+            A Unix socket path to connect to instead of TCP. The default is
+            None.
+
+        Returns
+        -------
+        EvaluationClient
+            The client itself.
+
+        """
+        if path is not None:
+            self._reader, self._writer = await asyncio.open_unix_connection(path, limit=LINE_LIMIT)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+        self._listener = asyncio.ensure_future(self._listen())
+        return self
+
+    async def close(self):
+        """Close the connection."""
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+        if self._listener is not None:
+            await self._listener
+
+    async def _listen(self):
+        try:
+            while line := await self._reader.readline():
+                response = json.loads(line)
+                future = self._futures.pop(response.pop('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._futures.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("The connection was closed."))
+            self._futures.clear()
+
+    async def request(self, op, **kwargs):
+        """Send a request and wait for its response.
+
+        Parameters
+        ----------
+        op : str
+            `'evaluate'` or `'equity'`.
+        **kwargs
+            The other fields of the request.
+
+        Raises
+        ------
+        ConnectionError
+            If the client is not connected, or the connection was closed.
+        ValueError
+            If the server could not answer the request.
+
+        Returns
+        -------
+        dict
+            The response, without its `id`.
+
+        """
+        if self._listener is None or self._listener.done():
+            # Nothing would ever answer the request.
+            raise ConnectionError("The connection was closed.")
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._futures[request_id] = future
+        self._writer.write(json.dumps({'id': request_id, 'op': op, **kwargs}, separators=(',', ':')).encode() + b'\n')
+        response = await future
+        if 'error' in response:
+            raise ValueError(response['error'])
+        return response
+
+    async def evaluate(self, cards):
+        """Score the best 5-card hand from 5 to 7 cards.
+
+        Parameters
+        ----------
+        cards : list
+            The cards, as `Card` instances and/or labels.
+
+        Returns
+        -------
+        score : int
+            The equivalence class of the best hand (see
+            `evaluator.evaluate`).
+        strength : str
+            The strength category name of the best hand.
+
+        """
+        response = await self.request('evaluate', cards=_labels(cards))
+        return response['score'], response['strength']
+
+    async def equity(self, hands, board=None, dead=None, iterations=10_000, seed=None, exact=False):
+        """Calculate each player's equity (see `equity.equity`).
+
+        Parameters
+        ----------
+        hands : list
+            Each player's two hole cards, or None if unknown.
+        board : list, optional
+            Known community cards. The default is None.
+        dead : list, optional
+            Cards known to be out of play. The default is None.
+        iterations : int, optional
+            The number of random deals to evaluate. The default is 10000.
+        seed : int, optional
+            Seed for the random number generator. The default is None.
+        exact : bool, optional
+            Whether to enumerate every deal instead. The default is False.
+
+        Returns
+        -------
+        dict
+            Each player's `'equity'` and `'stderr'`, and the number of
+            `'iterations'`.
+
+        """
+        return await self.request(
+            'equity', hands=[_labels(h) for h in hands], board=_labels(board), dead=_labels(dead),
+            iterations=iterations, seed=seed, exact=exact
+        )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve hand evaluations over a local socket.")
+    parser.add_argument('--host', default='127.0.0.1', help="TCP host (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="TCP port (default: 8765)")
+    parser.add_argument('--unix', default=None, help="Unix socket path to listen on instead of TCP")
+    parser.add_argument('--window', type=float, default=WINDOW * 1000, help=f"batching window in ms (default: {WINDOW * 1000:g})")
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH, help=f"largest batch (default: {MAX_BATCH})")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        server = await EvaluationServer(args.window / 1000, args.max_batch).start(args.host, args.port, args.unix)
+        print(f"Listening on {server.address}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
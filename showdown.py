@@ -0,0 +1,242 @@
+"""Showdown resolution for any number of players, with split and side pots.
+
+`resolve_showdown` scores each player's best hand once with
+`evaluator.evaluate` and compares the integer scores, instead of building a
+`HandSpace` per player and comparing `Hand` objects. The pot is divided into
+a main pot and side pots by how much each player contributed: each pot is
+contested by the players still in the hand who contributed at least its
+level, and split equally between those of them with the best hand.
+
+`resolve_showdowns` settles many tables at once from NumPy arrays, scoring
+every hand with `batch.evaluate_batch`.
+"""
+import numpy as np
+from card import Card
+from batch import evaluate_batch
+import evaluator
+
+class Pot:
+    """The main pot or a side pot of a showdown.
+
+    Attributes
+    ----------
+    amount : int or float
+        The size of the pot.
+    eligible : list
+        The indexes of the players who contested it.
+    winners : list
+        The indexes of the players who won or split it.
+
+    """
+    __slots__ = ('amount', 'eligible', 'winners')
+
+    def __init__(self, amount, eligible, winners):
+        self.amount = amount
+        self.eligible = eligible
+        self.winners = winners
+
+    def __repr__(self):
+        return f"<Pot(amount={self.amount}, eligible={self.eligible}, winners={self.winners})>"
+
+class ShowdownResult:
+    """The outcome of a showdown, from `resolve_showdown`.
+
+    Attributes
+    ----------
+    scores : list
+        Each player's score (see `evaluator.evaluate`), or None for players
+        who folded.
+    winners : list
+        The indexes of the players with the best hand. There is a split pot
+        if there is more than one.
+    pots : list
+        The `Pot` objects, main pot first.
+    payouts : list
+        The amount won by each player, including any contribution that no
+        player still in the hand matched and that was returned.
+
+    """
+    def __init__(self, scores, winners, pots, payouts):
+        self.scores = scores
+        self.winners = winners
+        self.pots = pots
+        self.payouts = payouts
+
+    def __repr__(self):
+        return f"<ShowdownResult(winners={self.winners}, payouts={self.payouts})>"
+
+    @property
+    def is_split(self):
+        """bool: Whether more than one player has the best hand."""
+        return len(self.winners) > 1
+
+def _as_ids(cards):
+    return [(c if isinstance(c, Card) else Card(c)).id for c in cards]
+
+def _split(amount, winners):
+    # Shares of a pot, with any odd chips of an integer pot going to the
+    # winners in seat order.
+    if isinstance(amount, int):
+        share, odd = divmod(amount, len(winners))
+        return {w: share + (i < odd) for i, w in enumerate(winners)}
+    return {w: amount / len(winners) for w in winners}
+
+def resolve_showdown(board, players_hole_cards, contributions):
+    """Decide who wins a showdown, and how much.
+
+    Parameters
+    ----------
+    board : list
+        The community cards, as `Card` instances and/or labels (at least 3).
+    players_hole_cards : list
+        Each player's two hole cards, or None for players who folded (who
+        cannot win, but whose contributions are still in the pot).
+    contributions : list
+        How much each player put into the pot, in the same order. If all of
+        the contributions are integers (e.g. chips), so are the payouts,
+        with odd chips going to the earliest winners. Money that nobody
+        still in the hand matched goes to the pot below it, or if there is
+        none (when the players still in the hand put in nothing), back to
+        whoever put it in.
+
+    Raises
+    ------
+    ValueError
+        If the numbers of players and contributions differ, no player is
+        left in the hand, or the cards are invalid.
+
+    Returns
+    -------
+    ShowdownResult
+        The scores, winners, pots and payouts.
+
+    """
+    if len(players_hole_cards) != len(contributions):
+        raise ValueError(
+            f"Got {len(players_hole_cards)} players but {len(contributions)} contributions."
+        )
+    board = _as_ids(board)
+    scores = []
+    for hole in players_hole_cards:
+        if hole is None:
+            scores.append(None)
+            continue
+        ids = _as_ids(hole) + board
+        if len(ids) < 5 or len(set(ids)) != len(ids):
+            raise ValueError("Each player needs two hole cards different from the board's.")
+        scores.append(evaluator.evaluate(ids))
+    live = [i for i, score in enumerate(scores) if score is not None]
+    if not live:
+        raise ValueError("At least one player must still be in the hand.")
+
+    top = max(scores[i] for i in live)
+    winners = [i for i in live if scores[i] == top]
+
+    # One pot per contribution level, from the smallest up.
+    pots = []
+    payouts = [0] * len(contributions)
+    previous = 0
+    for level in sorted(set(contributions)):
+        shares = [min(c, level) - min(c, previous) for c in contributions]
+        amount = sum(shares)
+        eligible = [i for i in live if contributions[i] >= level]
+        previous = level
+        if not amount:
+            continue
+        if not eligible and not pots:
+            # Nobody left in the hand put in this much, or anything below
+            # it, so there is no pot for it to go to and it is returned.
+            for i, share in enumerate(shares):
+                payouts[i] += share
+            continue
+        if not eligible or pots and pots[-1].eligible == eligible:
+            # Either nobody left in the hand matched this much, so it goes
+            # to whoever wins the pot below it, or only folded players'
+            # contributions separate the two, so they are one pot.
+            pots[-1].amount += amount
+            continue
+        best = max(scores[i] for i in eligible)
+        pots.append(Pot(amount, eligible, [i for i in eligible if scores[i] == best]))
+
+    for pot in pots:
+        for i, share in _split(pot.amount, pot.winners).items():
+            payouts[i] += share
+    return ShowdownResult(scores, winners, pots, payouts)
+
+def resolve_showdowns(boards, holes, contributions, live=None):
+    """Settle the showdowns of many tables at once.
+
+    Parameters
+    ----------
+    boards : numpy.ndarray
+        An integer array of shape `(T, 5)` of card ids, one board per table.
+    holes : numpy.ndarray
+        An integer array of shape `(T, P, 2)` of each player's two hole card
+        ids. Tables with fewer players can be padded with players who have
+        folded.
+    contributions : numpy.ndarray
+        An array of shape `(T, P)` of how much each player put into the pot.
+    live : numpy.ndarray, optional
+        A boolean array of shape `(T, P)`, False for players who folded
+        (whose hole cards are ignored). The default is None, meaning that
+        every player is still in the hand. Every table needs at least one
+        player still in the hand.
+
+    Raises
+    ------
+    ValueError
+        If the arrays do not have matching shapes.
+
+    Returns
+    -------
+    scores : numpy.ndarray
+        A `uint16` array of shape `(T, P)` of each player's score (see
+        `evaluator.evaluate`), or 0 for players who folded.
+    payouts : numpy.ndarray
+        A float array of shape `(T, P)` of the amount won by each player,
+        divided as in `resolve_showdown` except that split pots are shared
+        exactly rather than in whole chips.
+
+    """
+    boards = np.asarray(boards)
+    holes = np.asarray(holes)
+    contributions = np.asarray(contributions, dtype=float)
+    n_tables, n_players = contributions.shape
+    if boards.shape != (n_tables, 5) or holes.shape != (n_tables, n_players, 2):
+        raise ValueError(
+            f"Expected boards of shape ({n_tables}, 5) and holes of shape ({n_tables}, {n_players}, 2), "
+            f"but got {boards.shape} and {holes.shape}."
+        )
+    live = np.ones((n_tables, n_players), dtype=bool) if live is None else np.asarray(live, dtype=bool)
+
+    cards = np.concatenate([holes, np.broadcast_to(boards[:, None, :], (n_tables, n_players, 5))], axis=2)
+    # Folded players' cards may be anything, so score a fixed hand instead.
+    cards = np.where(live[..., None], cards, np.arange(7)).astype(np.uint8)
+    scores = evaluate_batch(cards.reshape(-1, 7))[0].reshape(n_tables, n_players)
+    scores[~live] = 0
+
+    # One slice of the pot per contribution level, from the smallest up;
+    # levels that several players share give empty slices.
+    levels = np.sort(contributions, axis=1)
+    payouts = np.zeros((n_tables, n_players))
+    previous = np.zeros(n_tables)
+    last_winners = np.zeros((n_tables, n_players))
+    for k in range(n_players):
+        level = levels[:, k]
+        amount = (np.minimum(contributions, level[:, None]) - np.minimum(contributions, previous[:, None])).sum(axis=1)
+        eligible = live & (contributions >= level[:, None])
+        best = np.where(eligible, scores, 0).max(axis=1)
+        winners = eligible & (scores == best[:, None])
+        # Slices that nobody left in the hand matched go to the winners of
+        # the slice below, or back to their contributors if there is none,
+        # as in `resolve_showdown`.
+        contested = winners.any(axis=1) & (amount > 0)
+        last_winners[contested] = winners[contested] / winners[contested].sum(axis=1, keepdims=True)
+        payouts += amount[:, None] * last_winners
+        unclaimed = ~last_winners.any(axis=1)
+        payouts[unclaimed] += (
+            np.minimum(contributions[unclaimed], level[unclaimed, None])
+            - np.minimum(contributions[unclaimed], previous[unclaimed, None])
+        )
+        previous = level
+    return scores, payouts
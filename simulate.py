@@ -0,0 +1,242 @@
+"""Simulation of the distribution of hand strength categories.
+
+`simulate` deals a large number of random 5-card hands, or 7-card hands
+scored by their best 5 cards as in `HandSpace`, and counts how many fall in
+each `enums.HandStrength` category, to compare with the known probabilities
+(as in the results table in the README). Hands are dealt with
+`Deck.deal_batch` and scored with `batch.evaluate_batch`, in independently
+seeded shards which are run across a pool of processes.
+
+The counts are aggregated as shards finish and can be saved to a JSON
+checkpoint file after each one, so that a long run which is interrupted can
+be resumed from where it stopped by running it again with the same
+checkpoint. Run this module as a script for a command line interface.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import json
+import os
+import time
+import numpy as np
+from batch import evaluate_batch
+from deck import Deck
+from enums import HandStrength
+
+# Hands per shard, i.e. per unit of work and checkpoint.
+SHARD_SIZE = 1 << 20
+
+# Hands dealt and scored per vectorised step within a shard.
+STEP_SIZE = 1 << 16
+
+# The number of hands of each category, in `HandStrength` order, among all
+# possible deals of 5 and 7 cards.
+EXPECTED_COUNTS = {
+    5: (1302540, 1098240, 123552, 54912, 10200, 5108, 3744, 624, 36, 4),
+    7: (
+        23294460, 58627800, 31433400, 6461620, 6180020, 4047644, 3473184,
+        224848, 37260, 4324
+    ),
+}
+
+class SimulationResult:
+    """Category counts from `simulate`.
+
+    Attributes
+    ----------
+    n_cards : int
+        The number of cards in each hand, 5 or 7.
+    counts : numpy.ndarray
+        The number of hands observed in each category, in `HandStrength`
+        order.
+    hands : int
+        The number of hands dealt.
+    seconds : float
+        The time spent dealing and scoring hands, summed over every run of
+        a resumed simulation.
+    expected : numpy.ndarray
+        The expected number of hands in each category.
+    chi_square : float
+        Pearson's chi-square statistic of the observed counts against the
+        expected counts, with 9 degrees of freedom.
+
+    """
+    def __init__(self, n_cards, counts, seconds):
+        self.n_cards = n_cards
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.hands = int(self.counts.sum())
+        self.seconds = seconds
+        self.expected = expected_counts(n_cards, self.hands)
+        self.chi_square = float(((self.counts - self.expected) ** 2 / self.expected).sum())
+
+    def __repr__(self):
+        return f"<SimulationResult(n_cards={self.n_cards}, hands={self.hands}, chi_square={self.chi_square:.2f})>"
+
+    @property
+    def hands_per_second(self):
+        """float: The number of hands dealt and scored per second."""
+        return self.hands / self.seconds if self.seconds else float('nan')
+
+    def table(self):
+        """Format the observed and expected counts as a table.
+
+        Returns
+        -------
+        str
+            A table with one row per category, strongest first, followed by
+            the chi-square statistic and the simulation speed.
+
+        """
+        probabilities = np.array(EXPECTED_COUNTS[self.n_cards]) / sum(EXPECTED_COUNTS[self.n_cards])
+        lines = [f"{'Hand':<16} {'Probability':>11} {'Observed':>12} {'Expected':>14}"]
+        for strength in reversed(HandStrength):
+            i = strength.value
+            lines.append(
+                f"{strength.name:<16} {probabilities[i]:>11.4e} {self.counts[i]:>12} {self.expected[i]:>14.1f}"
+            )
+        lines.append(f"Chi-square: {self.chi_square:.2f} (9 degrees of freedom, 5% critical value 16.92)")
+        lines.append(f"{self.hands} hands in {self.seconds:.1f}s ({self.hands_per_second:,.0f} hands/s)")
+        return '\n'.join(lines)
+
+def expected_counts(n_cards, hands):
+    """Get the expected number of hands in each category.
+
+    Parameters
+    ----------
+    n_cards : int
+        The number of cards in each hand, 5 or 7.
+    hands : int
+        The number of hands dealt.
+
+    Returns
+    -------
+    numpy.ndarray
+        The expected counts, in `HandStrength` order.
+
+    """
+    counts = np.array(EXPECTED_COUNTS[n_cards], dtype=float)
+    return hands * counts / counts.sum()
+
+def _simulate(n_cards, hands, seed):
+    # Runs one shard, returning the category counts.
+    rng = np.random.default_rng(seed)
+    deck = Deck()
+    counts = np.zeros(len(HandStrength), dtype=np.int64)
+    for start in range(0, hands, STEP_SIZE):
+        size = min(STEP_SIZE, hands - start)
+        cards = deck.deal_batch(size, players=0, board_cards=n_cards, rng=rng)[1]
+        counts += np.bincount(evaluate_batch(cards)[1], minlength=len(counts))
+    return counts
+
+def _load_checkpoint(path, n_cards, hands):
+    # Returns the checkpoint state, or None if there is no checkpoint yet.
+    if path is None or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        state = json.load(f)
+    if (state['n_cards'], state['hands']) != (n_cards, hands):
+        raise ValueError(
+            f"The checkpoint at {path} is for {state['hands']} hands of {state['n_cards']} cards, "
+            f"not {hands} hands of {n_cards} cards."
+        )
+    return state
+
+def _save_checkpoint(path, state):
+    # Writes to a temporary file first, so a crash never leaves a partial file.
+    temporary = f"{path}.tmp"
+    with open(temporary, 'w') as f:
+        json.dump(state, f)
+    os.replace(temporary, path)
+
+def simulate(hands, n_cards=5, workers=None, seed=None, checkpoint=None):
+    """Count the hand strength categories of many random hands.
+
+    Parameters
+    ----------
+    hands : int
+        The number of hands to deal.
+    n_cards : int, optional
+        The number of cards in each hand: 5, or 7 to score the best 5 of 7
+        cards as in hold 'em. The default is 5.
+    workers : int, optional
+        The number of processes to run the simulation on. The default is
+        None, which uses one per CPU. With a single worker, the simulation
+        runs in the calling process.
+    seed : int, optional
+        Seed for the random number generator, for reproducible results. The
+        default is None. When resuming from a checkpoint, the seed saved in
+        the checkpoint is used instead.
+    checkpoint : str, optional
+        Path to a JSON file to save the counts to after each shard. If the
+        file exists, the simulation resumes from it, skipping the shards
+        that it has already counted. The default is None.
+
+    Raises
+    ------
+    ValueError
+        If `n_cards` is not 5 or 7, `hands` is less than 1, or the
+        checkpoint is for a different simulation.
+
+    Returns
+    -------
+    SimulationResult
+        The counts of each category.
+
+    """
+    if n_cards not in EXPECTED_COUNTS:
+        raise ValueError(f"Expected 5 or 7 cards per hand, but got {n_cards}.")
+    if hands < 1:
+        raise ValueError(f"Expected at least 1 hand, but got {hands}.")
+    workers = workers or os.cpu_count() or 1
+
+    state = _load_checkpoint(checkpoint, n_cards, hands) or {
+        'n_cards': n_cards,
+        'hands': hands,
+        'entropy': np.random.SeedSequence(seed).entropy,
+        'done': [],
+        'counts': [0] * len(HandStrength),
+        'seconds': 0.0,
+    }
+    n_shards = -(-hands // SHARD_SIZE)
+    shard_sizes = [min(SHARD_SIZE, hands - i * SHARD_SIZE) for i in range(n_shards)]
+    seeds = np.random.SeedSequence(state['entropy']).spawn(n_shards)
+    todo = sorted(set(range(n_shards)).difference(state['done']))
+
+    counts = np.array(state['counts'], dtype=np.int64)
+    previous_seconds, started = state['seconds'], time.perf_counter()
+    def record(shard, shard_counts):
+        counts[:] += shard_counts
+        state['done'].append(shard)
+        state['counts'] = counts.tolist()
+        state['seconds'] = previous_seconds + time.perf_counter() - started
+        if checkpoint is not None:
+            _save_checkpoint(checkpoint, state)
+
+    if workers == 1:
+        for shard in todo:
+            record(shard, _simulate(n_cards, shard_sizes[shard], seeds[shard]))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = {
+                pool.submit(_simulate, n_cards, shard_sizes[shard], seeds[shard]): shard
+                for shard in todo
+            }
+            for future in as_completed(futures):
+                record(futures[future], future.result())
+    return SimulationResult(n_cards, counts, state['seconds'])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Simulate random poker hands and compare their strength categories with the expected distribution."
+    )
+    parser.add_argument('hands', type=int, help="number of hands to deal")
+    parser.add_argument('-c', '--cards', type=int, choices=(5, 7), default=5, help="cards per hand (default: 5)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="number of processes (default: one per CPU)")
+    parser.add_argument('-s', '--seed', type=int, default=None, help="random seed")
+    parser.add_argument('--checkpoint', default=None, help="JSON file to save progress to and resume from")
+    args = parser.parse_args(argv)
+
+    result = simulate(args.hands, args.cards, args.workers, args.seed, args.checkpoint)
+    print(result.table())
+
+if __name__ == '__main__':
+    main()
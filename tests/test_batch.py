@@ -0,0 +1,51 @@
+import unittest
+import random
+import numpy as np
+from enums import HandStrength
+from hand import Hand, HandSpace
+from card import Card
+from batch import card_ids, categories, evaluate_batch
+import evaluator
+
+random.seed(21)
+
+class TestBatch(unittest.TestCase):
+    
+    def test_card_ids(self):
+        ids = card_ids([['2c', Card('As')], ['2d', '3c']])
+        self.assertEqual(ids.dtype, np.uint8)
+        self.assertEqual(ids.tolist(), [[0, 51], [1, 4]])
+    
+    def test_matches_hand(self):
+        labels = [card.label for card in map(Card.from_id, range(52))]
+        hands = [random.sample(labels, 5) for _ in range(1000)]
+        scores, strengths = evaluate_batch(card_ids(hands))
+        for hand, score, strength in zip(hands, scores, strengths):
+            hand = Hand(hand)
+            self.assertEqual(score, hand.score)
+            self.assertEqual(HandStrength(strength).name, hand.strength)
+    
+    def test_matches_handspace(self):
+        for n in (6, 7):
+            spaces = [random.sample(range(52), n) for _ in range(1000)]
+            scores, strengths = evaluate_batch(np.array(spaces, dtype=np.uint8))
+            for space, score in zip(spaces[:100], scores):
+                hs = HandSpace([Card.from_id(i) for i in space[:2]], [Card.from_id(i) for i in space[2:]])
+                self.assertEqual(score, hs.score)
+            self.assertEqual(scores.tolist(), [evaluator.evaluate(s) for s in spaces])
+            self.assertTrue((strengths == categories(scores)).all())
+    
+    def test_bad_shape(self):
+        with self.assertRaises(ValueError):
+            evaluate_batch(np.zeros((3, 4), dtype=np.uint8))
+        with self.assertRaises(ValueError):
+            evaluate_batch(np.zeros(5, dtype=np.uint8))
+    
+    def test_empty(self):
+        scores, strengths = evaluate_batch(np.zeros((0, 7), dtype=np.uint8))
+        self.assertEqual(len(scores), 0)
+        self.assertEqual(len(strengths), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
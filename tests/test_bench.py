@@ -0,0 +1,34 @@
+import os
+import tempfile
+import unittest
+import bench
+from hand import Hand
+
+class TestBench(unittest.TestCase):
+
+    def test_example_hands(self):
+        for strength, labels in bench.EXAMPLE_HANDS.items():
+            self.assertEqual(Hand(labels).strength, strength)
+
+    def test_run_and_save(self):
+        results = bench.run(['card.', 'hand.compare'], repeat=1)
+        self.assertEqual(sorted(results), ['card.construct', 'hand.compare'])
+        self.assertTrue(all(seconds > 0 for seconds in results.values()))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            bench.save(results, path)
+            self.assertEqual(bench.load(path), results)
+
+    def test_compare(self):
+        baseline = {'a': 1.0, 'b': 1.0, 'c': 1.0, 'gone': 1.0}
+        results = {'a': 1.05, 'b': 1.5, 'c': 0.5, 'new': 1.0}
+        rows = bench.compare(results, baseline, tolerance=0.1)
+        self.assertEqual([(name, status) for name, *_, status in rows], [
+            ('a', 'same'), ('b', 'slower'), ('c', 'faster')
+        ])
+        self.assertEqual(rows[1][3], 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
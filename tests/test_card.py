@@ -56,6 +56,10 @@ class TestCard(unittest.TestCase):
         # Just the suit
         with self.assertRaises(ValueError):
             Card(suit=Rank.TEN.value)
+        # Labels too short to have a rank and a suit
+        for label in ('A', ''):
+            with self.assertRaises(ValueError):
+                Card(label)
     
     def test_card_comparisons(self):
         ranks = Rank.values()[::-1]        
@@ -69,6 +73,19 @@ class TestCard(unittest.TestCase):
                 card_bigger = Card(rank=ranks[i-1], suit=suit)
                 self.assertLess(card_smaller, card_bigger)
 
+    def test_cards_are_interned(self):
+        # Every way of constructing a card gives back the same instance.
+        for i, label in enumerate(get_all_handlabels()):
+            card = Card(label)
+            self.assertIs(card, Card(label.upper()))
+            self.assertIs(card, Card(rank=card.rank, suit=card.suit))
+            self.assertIs(card, Card.from_id(i))
+            self.assertEqual(card.id, i)
+    
+    def test_cards_have_no_dict(self):
+        with self.assertRaises(AttributeError):
+            Card('As').__dict__
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,64 @@
+import unittest
+from enums import get_all_handlabels
+from card import Card
+from cardset import CardSet
+from deck import Deck
+from hand import Hand, HandSpace
+
+class TestCardSet(unittest.TestCase):
+    
+    def test_construction(self):
+        from_labels = CardSet(['As', 'Kd', '2c'])
+        from_cards = CardSet([Card('Kd'), Card('2c'), Card('As')])
+        self.assertEqual(from_labels, from_cards)
+        self.assertEqual(CardSet(from_labels), from_labels)
+        self.assertEqual(len(from_labels), 3)
+        self.assertEqual(len(CardSet()), 0)
+        self.assertEqual(len(CardSet.full()), 52)
+        
+        with self.assertRaises(ValueError):
+            CardSet(['As', 'joker'])
+    
+    def test_iteration_order(self):
+        # Iteration is in id order, whatever order the cards were given in.
+        labels = get_all_handlabels()
+        self.assertEqual(CardSet(labels[::-1]).labels, labels)
+        self.assertEqual(list(CardSet.full()), [Card(l) for l in labels])
+        self.assertEqual(CardSet(['Th', '3s']).ids, [Card('3s').id, Card('Th').id])
+    
+    def test_contains(self):
+        cs = CardSet(['As', 'Kd'])
+        self.assertIn('As', cs)
+        self.assertIn(Card('Kd'), cs)
+        self.assertNotIn('Ks', cs)
+        self.assertNotIn('joker', cs)
+    
+    def test_set_operations(self):
+        a = CardSet(['As', 'Kd', 'Qh'])
+        b = CardSet(['Kd', 'Qh', 'Jc'])
+        self.assertEqual(a | b, CardSet(['As', 'Kd', 'Qh', 'Jc']))
+        self.assertEqual(a & b, CardSet(['Kd', 'Qh']))
+        self.assertEqual(a - b, CardSet(['As']))
+        self.assertEqual(a ^ b, CardSet(['As', 'Jc']))
+        self.assertEqual(a | ['2c'], CardSet(['As', 'Kd', 'Qh', '2c']))
+        self.assertTrue(CardSet(['As']).issubset(a))
+        self.assertTrue(a.isdisjoint(['2c', '3c']))
+        self.assertFalse(a.isdisjoint(b))
+        self.assertEqual(len({a, CardSet(a.labels)}), 1)
+    
+    def test_integration(self):
+        deck = Deck()
+        taken = deck.take(labels=CardSet(['As', 'Ks']))
+        self.assertEqual(CardSet(taken), CardSet(['As', 'Ks']))
+        self.assertEqual(deck.cardset, CardSet.full() - CardSet(taken))
+        
+        hand = Hand(cards=CardSet(['As', 'Ks', 'Qs', 'Js', 'Ts']))
+        self.assertEqual(hand.strength, 'ROYAL_FLUSH')
+        self.assertEqual(hand.cardset, CardSet(hand.labels))
+        
+        hs = HandSpace(CardSet(['As', 'Ks']), CardSet(['Qs', 'Js', 'Ts']))
+        self.assertEqual(hs.cardset, CardSet(['As', 'Ks', 'Qs', 'Js', 'Ts']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,6 @@
 import unittest
+import numpy as np
+from card import Card
 from deck import Deck
 from enums import Suit, get_all_handlabels
 
@@ -97,6 +99,51 @@ class TestDeck(unittest.TestCase):
                 self.assertTrue( card.label in labels ) # contained in labels?
                 self.assertFalse( deck.has( card.label ) ) # no longer in deck?
 
+    def test_reset(self):
+        deck = Deck()
+        deck.shuffle()
+        order = [c.label for c in deck]
+        for _ in range(3):
+            taken = deck.take(labels=['As', 'Kd'])
+            self.assertEqual(sorted(t.label for t in taken), ['As', 'Kd'])
+            self.assertFalse(deck.has('As'))
+            self.assertEqual(len(deck.take(labels=['As'])), 0)
+            deck.take(10)
+            self.assertEqual(len(deck), 40)
+            self.assertEqual(deck.cardset.mask.bit_count(), 40)
+            self.assertEqual(list(deck), deck.cards)
+            deck.reset()
+            self.assertEqual([c.label for c in deck], order)
+    
+    def test_take_skips_taken_cards(self):
+        deck = Deck()
+        top = deck.fan(-3)
+        deck.take(labels=[top[-1].label])
+        taken = deck.take(2)
+        self.assertEqual([t.label for t in taken], [top[1].label, top[0].label])
+        with self.assertRaises(ValueError):
+            deck.take(50)
+
+    def test_deal_batch(self):
+        deck = Deck()
+        deck.take(labels=['As', 'Ks'])
+        rng = np.random.default_rng(0)
+        holes, boards = deck.deal_batch(20000, players=3, board_cards=5, exclude=['Qs'], rng=rng)
+        self.assertEqual(holes.shape, (20000, 3, 2))
+        self.assertEqual(boards.shape, (20000, 5))
+        
+        dealt = np.hstack([holes.reshape(20000, 6), boards])
+        self.assertFalse((np.diff(np.sort(dealt, axis=1), axis=1) == 0).any())
+        counts = np.bincount(dealt[:, 0], minlength=52)
+        self.assertEqual(counts[[Card(c).id for c in ('As', 'Ks', 'Qs')]].sum(), 0)
+        # Every other card is equally likely in every position
+        self.assertLess(counts.max() - counts[counts > 0].min(), 200)
+        # The deck is left as it was
+        self.assertEqual(len(deck), 50)
+        
+        with self.assertRaises(ValueError):
+            deck.deal_batch(1, players=23, board_cards=5)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
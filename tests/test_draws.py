@@ -0,0 +1,55 @@
+import unittest
+from itertools import combinations
+from card import Card
+from cardset import CardSet
+from draws import find_draws, has_draw, outs
+from enums import Draw, HandStrength
+import evaluator
+
+class TestDraws(unittest.TestCase):
+
+    def test_find_draws(self):
+        examples = {
+            ('Js', 'Ts', 'Qs', '2s', '9c'): [Draw.COMBO_DRAW, Draw.FLUSH_DRAW, Draw.OPEN_ENDED_STRAIGHT_DRAW],
+            ('Ah', 'Kh', '7h', '2h', 'Qd', '3c'): [Draw.FLUSH_DRAW],
+            ('Js', '9s', '8h', '7c', '5d'): [Draw.OPEN_ENDED_STRAIGHT_DRAW],
+            ('Ah', '2d', '3c', 'Kh', '7s', '4d'): [Draw.GUTSHOT],
+            ('Js', 'Ts', 'Qh', '2s', '9c'): [Draw.OPEN_ENDED_STRAIGHT_DRAW, Draw.BACKDOOR_FLUSH_DRAW],
+            ('As', 'Kd', 'Qh', '3c', '3h'): [Draw.BACKDOOR_STRAIGHT_DRAW],
+            # Made hands are not drawing to something weaker
+            ('Ah', 'Kh', '7h', '2h', '5h'): [],
+            ('9s', '9d', '9c', '8s', '8d', '7s'): [],
+        }
+        for cards, expected in examples.items():
+            self.assertEqual(find_draws(cards), expected, cards)
+        self.assertTrue(has_draw(CardSet(['Js', 'Ts', 'Qs', '2s']), 'FLUSH_DRAW'))
+        with self.assertRaises(ValueError):
+            find_draws(['As', 'Ks'])
+
+    def test_outs(self):
+        self.assertEqual(len(outs(['Js', 'Ts', 'Qs', '2s', '9c'])), 15)
+        self.assertEqual(len(outs(['Ah', 'Kh', '7h', '2h', 'Qd'], dead=['3h', '4h'])), 7)
+        self.assertEqual(outs(['Ah', '2d', '3c', 'Kh', '7s', '4d']).labels, ['5c', '5d', '5h', '5s'])
+        # A made flush is only drawing to the straight flush
+        self.assertEqual(outs(['9h', '8h', '7h', '6h', '2h']).labels, ['5h', 'Th'])
+
+    def test_outs_exhaustive(self):
+        # On every flop with these hole cards, the outs are exactly the cards
+        # that make a straight, flush or straight flush which is better than
+        # the current hand.
+        drawn = {HandStrength.STRAIGHT, HandStrength.FLUSH, HandStrength.STRAIGHT_FLUSH, HandStrength.ROYAL_FLUSH}
+        hole = ['Jh', 'Th']
+        live = CardSet.full() - CardSet(hole)
+        for flop in combinations(list(live)[::3], 3):
+            ids = [Card(c).id for c in hole] + [c.id for c in flop]
+            made = evaluator.strength_of(evaluator.evaluate(ids)).value
+            expected = []
+            for card in live - CardSet(flop):
+                strengths = [evaluator.strength_of(evaluator.evaluate5(*five)) for five in combinations(ids + [card.id], 5)]
+                if any(s in drawn and s.value > made for s in strengths):
+                    expected.append(card.label)
+            self.assertEqual(outs(list(map(Card.from_id, ids))).labels, expected, ids)
+
+
+if __name__ == '__main__':
+    unittest.main()
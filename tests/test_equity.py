@@ -0,0 +1,99 @@
+import unittest
+from itertools import combinations
+from card import Card
+from cardset import CardSet
+from equity import equity
+import evaluator
+
+class TestEquity(unittest.TestCase):
+    
+    def test_known_matchup(self):
+        # AhAs vs KdKc is 81.26% for the aces, by exhaustive enumeration.
+        result = equity([['Ah', 'As'], ['Kd', 'Kc']], iterations=50_000, workers=1, seed=21)
+        self.assertEqual(result.iterations, 50_000)
+        self.assertLess(abs(result.equity[0] - 0.8126), 4 * result.stderr[0])
+        self.assertAlmostEqual(result.equity.sum(), 1)
+        self.assertTrue((result.wins + result.ties + result.losses == 50_000).all())
+    
+    def test_complete_board(self):
+        # With the whole board known, there is nothing left to chance.
+        result = equity(
+            [['Ah', 'Kh'], [Card('Qd'), Card('Qc')], CardSet(['2s', '3s'])],
+            board=['Qh', 'Jh', 'Th', '2c', '2d'],
+            iterations=100, workers=1
+        )
+        self.assertEqual(result.equity.tolist(), [1, 0, 0])
+        self.assertEqual(result.stderr.tolist(), [0, 0, 0])
+        
+        chop = equity([['2c', '3c'], ['2d', '3d']], board=['As', 'Ks', 'Qh', 'Jh', 'Td'], iterations=10, workers=1)
+        self.assertEqual(chop.equity.tolist(), [0.5, 0.5])
+        self.assertEqual(chop.ties.tolist(), [10, 10])
+    
+    def test_unknown_players(self):
+        result = equity([['Ah', 'As'], None, None], board=['2c', '7d', 'Ts'], iterations=20_000, workers=1, seed=21)
+        self.assertAlmostEqual(result.equity.sum(), 1)
+        self.assertGreater(result.equity[0], 0.7)
+        # The two random players are interchangeable
+        self.assertLess(abs(result.equity[1] - result.equity[2]), 4 * result.stderr[1])
+    
+    def test_reproducible(self):
+        kwargs = dict(board=['2c', '7d', 'Ts'], iterations=5000, seed=5)
+        first = equity([['Ah', 'As'], None], workers=1, **kwargs)
+        second = equity([['Ah', 'As'], None], workers=1, **kwargs)
+        self.assertEqual(first.equity.tolist(), second.equity.tolist())
+    
+    def test_parallel(self):
+        result = equity([['Ah', 'As'], ['Kd', 'Kc']], iterations=20_000, workers=2, seed=21)
+        self.assertEqual(result.iterations, 20_000)
+        self.assertLess(abs(result.equity[0] - 0.8126), 4 * result.stderr[0])
+    
+    def test_exact_preflop(self):
+        result = equity([['Ah', 'As'], ['Kd', 'Kc']], exact=True, workers=1)
+        self.assertEqual(result.iterations, 1712304) # C(48, 5) boards
+        self.assertEqual(result.wins.tolist(), [1388072, 317694])
+        self.assertEqual(result.ties.tolist(), [6538, 6538])
+        self.assertEqual(result.stderr.tolist(), [0, 0])
+    
+    def test_exact_unknown_player(self):
+        # Brute force every holding and river for the unknown player.
+        hero = [Card('Ah').id, Card('Kh').id]
+        board = [Card(l).id for l in ['Qh', '7h', '2c', '3d']]
+        live = [i for i in range(52) if i not in hero + board]
+        shares, deals = 0, 0
+        for villain in combinations(live, 2):
+            for river in live:
+                if river in villain:
+                    continue
+                a = evaluator.evaluate(hero + board + [river])
+                b = evaluator.evaluate(list(villain) + board + [river])
+                shares += 1 if a > b else 0.5 if a == b else 0
+                deals += 1
+        
+        result = equity([['Ah', 'Kh'], None], board=['Qh', '7h', '2c', '3d'], exact=True, workers=1)
+        self.assertEqual(result.iterations, deals)
+        self.assertAlmostEqual(result.equity[0], shares / deals)
+        
+        # Two unknown players share the remaining equity equally
+        result = equity([['Ah', 'Kh'], None, None], board=['Qh', '7h', '2c', '3d', '3s'], exact=True, workers=2)
+        self.assertEqual(result.iterations, 990 * 903) # C(45, 2) * C(43, 2)
+        self.assertAlmostEqual(result.equity[1], result.equity[2])
+    
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            equity([['Ah', 'As']])
+        with self.assertRaises(ValueError):
+            equity([['Ah', 'As']] + [None] * 9)
+        with self.assertRaises(ValueError):
+            equity([['Ah', 'As'], ['Ah', 'Kc']])
+        with self.assertRaises(ValueError):
+            equity([['Ah', 'As'], ['Kh']])
+        with self.assertRaises(ValueError):
+            equity([['Ah', 'As'], None], board=['2c', '3c', '4c', '5c', '6c', '7c'])
+        with self.assertRaises(ValueError):
+            equity([['Ah', 'As'], None], dead=['As'])
+        with self.assertRaises(ValueError):
+            equity([['Ah', 'As'], None], iterations=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import random
+from itertools import combinations
+from collections import Counter
+from enums import HandStrength, get_all_handlabels
+from hand import Hand
+import evaluator
+
+random.seed(21)
+
+class TestEvaluator(unittest.TestCase):
+    
+    def test_class_counts(self):
+        # Number of distinct equivalence classes in each category.
+        expected = {
+            HandStrength.HIGH_CARD: 1277,
+            HandStrength.PAIR: 2860,
+            HandStrength.TWO_PAIR: 858,
+            HandStrength.THREE_OF_A_KIND: 858,
+            HandStrength.STRAIGHT: 10,
+            HandStrength.FLUSH: 1277,
+            HandStrength.FULL_HOUSE: 156,
+            HandStrength.FOUR_OF_A_KIND: 156,
+            HandStrength.STRAIGHT_FLUSH: 9,
+            HandStrength.ROYAL_FLUSH: 1,
+        }
+        counts = Counter(evaluator.strength_of(s) for s in range(1, evaluator.NUM_CLASSES+1))
+        self.assertEqual(counts, expected)
+    
+    def test_extremes(self):
+        self.assertEqual(Hand(['7h', '5c', '4d', '3s', '2h']).score, 1)
+        self.assertEqual(Hand(['As', 'Ks', 'Qs', 'Js', 'Ts']).score, evaluator.NUM_CLASSES)
+        # The wheel is the lowest straight
+        wheel = Hand(['Ah', '2c', '3d', '4s', '5h'])
+        six_high = Hand(['6h', '2c', '3d', '4s', '5h'])
+        self.assertEqual(wheel.strength, HandStrength.STRAIGHT.name)
+        self.assertEqual(wheel.score + 1, six_high.score)
+    
+    def test_matches_reference(self):
+        # The lookup tables agree with the predicate implementation.
+        labels = get_all_handlabels()
+        for _ in range(2000):
+            hand = Hand(random.sample(labels, 5))
+            reference = Hand(cards=hand.cards)
+            reference.classify_hand(lookup=False)
+            self.assertEqual(hand.strength, reference.strength)
+            self.assertIsNone(reference.score)
+    
+    def test_score_ordering(self):
+        hands = [
+            Hand(['Jh', '9h', 'Qh', '8h', 'Th']),
+            Hand(['Qc','6d', '6c',  '6h', '6s']),
+            Hand(['2h', '9s', '2c', '2d', '9h']),
+            Hand(['6d', '3d', 'Ad', 'Jd', '9d']),
+            Hand(['7d', '9d', '5h', '8d', '6c']),
+            Hand(['Qc', '6d', 'Ah', '6h', '6s']),
+            Hand(['2d', 'Ks', '9c', '9h', '2h']),
+            Hand(['2d', '6s', '9c', '9h', '2h']),
+            Hand(['3h', '3c', '6s', 'Td', 'Jh']),
+            Hand(['3h', '2c', '6s', 'Td', 'Jh']),
+        ]
+        scores = [h.score for h in hands]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(len(set(scores)), len(scores))
+
+    def test_evaluate_many_cards(self):
+        # Direct 5 to 8 card scores match the best of their 5-card subsets.
+        for n in (5, 6, 7, 8):
+            for _ in range(500):
+                ids = random.sample(range(52), n)
+                best = max(evaluator.evaluate5(*five) for five in combinations(ids, 5))
+                self.assertEqual(evaluator.evaluate(ids), best)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 import random
-from enums import HandStrength
+from enums import Draw, HandStrength
 from hand import Hand
 
 random.seed(21)
@@ -90,6 +90,51 @@ class TestHand(unittest.TestCase):
         for good, bad in zip(self.better, self.worse):
             self.assertGreater(good, bad)
         
+    def test_lazy_evaluation(self):
+        hand = Hand(['Ks', 'Tc', 'Ts', 'Td', 'Th'])
+        self.assertIsNone(hand._category)
+        self.assertFalse(hand._sorted)
+        # Comparing classifies the hands but does not sort them
+        self.assertGreater(hand, self.example_hands[HandStrength.FULL_HOUSE.name])
+        self.assertEqual(hand._category, HandStrength.FOUR_OF_A_KIND)
+        self.assertFalse(hand._sorted)
+        self.assertEqual(hand.labels, ['Tc', 'Ts', 'Td', 'Th', 'Ks'])
+        self.assertEqual([c.label for c in hand.kicker], ['Ks'])
+        # Cached results are not changed by callers
+        hand.components[0].pop()
+        self.assertEqual(len(hand.components[0]), 4)
+    
+    def test_sort_key(self):
+        hands = list(self.example_hands.values()) + self.better + self.worse
+        ordered = sorted(hands)
+        self.assertEqual([h.key for h in ordered], sorted(h.key for h in hands))
+        self.assertIs(max(hands), ordered[-1])
+        # A wheel is the lowest straight
+        wheel = Hand(['As', '2d', '3c', '4h', '5s'])
+        self.assertLess(wheel, Hand(['6s', '2d', '3c', '4h', '5s']))
+        self.assertLess(Hand(['Ks', 'Kd']), Hand(['As', 'Ad']))
+        # Hands of equal strength are interchangeable as keys
+        same = {Hand(['Ks', 'Kd']): 1, Hand(['Kc', 'Kh']): 2}
+        self.assertEqual(len(same), 1)
+        self.assertEqual(len({wheel, Hand(['Ad', '2c', '3s', '4h', '5d'])}), 1)
+        self.assertNotEqual(wheel, 'wheel')
+    
+    def test_draws(self):
+        hand = Hand(['Js', 'Ts', 'Qs', '2s', '9c'])
+        self.assertEqual(hand.draws, [Draw.COMBO_DRAW, Draw.FLUSH_DRAW, Draw.OPEN_ENDED_STRAIGHT_DRAW])
+        self.assertTrue(hand.is_combo_draw())
+        self.assertFalse(hand.is_gutshot())
+        self.assertEqual(len(hand.outs()), 15)
+        self.assertEqual(len(hand.outs(dead=['8s', '8h', 'Ah'])), 13)
+        self.assertEqual(Hand(['As', 'Ks']).draws, [])
+        self.assertEqual(self.example_hands[HandStrength.FLUSH.name].draws, [])
+    
+    def test_compact(self):
+        hand = self.example_hands[HandStrength.PAIR.name]
+        with self.assertRaises(AttributeError):
+            hand.__dict__
+        self.assertIs(Hand._rank_funcs, type(hand)._rank_funcs)
+    
     
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,90 @@
+import unittest
+import os
+import tempfile
+from collections import Counter
+from itertools import combinations
+import numpy as np
+from batch import evaluate_batch
+from enums import HandStrength
+from hand import Hand, HandSpace
+from card import Card
+import evaluator
+import handclass
+
+class TestHandClass(unittest.TestCase):
+    
+    def test_category_counts(self):
+        # Known numbers of 5 and 7-card hands in each category.
+        expected = {
+            5: [1302540, 1098240, 123552, 54912, 10200, 5108, 3744, 624, 36, 4],
+            7: [23294460, 58627800, 31433400, 6461620, 6180020, 4047644, 3473184, 224848, 37260, 4324],
+        }
+        for n, totals in expected.items():
+            counts = handclass.class_counts(n)
+            by_category = Counter()
+            for score in range(1, evaluator.NUM_CLASSES+1):
+                by_category[evaluator.strength_of(score).value] += counts[score]
+            self.assertEqual([by_category[v] for v in range(10)], totals)
+        self.assertEqual(sum(handclass.class_counts(6)), 20358520)
+    
+    def test_matches_enumeration(self):
+        # Every 5-card hand, scored and tallied by class.
+        hands = np.array(list(combinations(range(52), 5)), dtype=np.uint8)
+        scores, _ = evaluate_batch(hands)
+        tally = np.bincount(scores, minlength=evaluator.NUM_CLASSES+1)
+        self.assertEqual(tally.tolist(), list(handclass.class_counts(5)))
+    
+    def test_percentiles(self):
+        for n in handclass.HAND_SIZES:
+            counts = handclass.class_counts(n)
+            total = sum(counts)
+            fractions = [handclass.percentile(s, n) for s in range(1, evaluator.NUM_CLASSES+1)]
+            self.assertEqual(fractions[0], 0.)
+            self.assertEqual(fractions, sorted(fractions))
+            self.assertAlmostEqual(fractions[-1], 1 - counts[-1] / total)
+        # Any pair beats every high card 7-card hand, of which there are 23294460.
+        self.assertAlmostEqual(handclass.percentile(1278), 23294460 / 133784560)
+        with self.assertRaises(ValueError):
+            handclass.percentile(100, 4)
+        with self.assertRaises(ValueError):
+            handclass.hand_class(0)
+    
+    def test_descriptions(self):
+        def describe(labels):
+            return handclass.describe(evaluator.evaluate([Card(c).id for c in labels]))
+        self.assertEqual(describe(['7h', '7c', 'As', 'Jd', '4c']), 'Pair of Sevens, A-J-4')
+        self.assertEqual(describe(['6h', '6c', '6s', 'Kd', 'Kc']), 'Full house, Sixes full of Kings')
+        self.assertEqual(describe(['Kh', 'Kc', '7s', '7d', 'Ac']), 'Two pair, Kings and Sevens, A')
+        self.assertEqual(describe(['Ah', '2c', '3s', '4d', '5c']), 'Straight, Ace to Five')
+        self.assertEqual(describe(['7h', '5c', '4d', '3s', '2h', '9d', 'Jc']), 'Jack high, 9-7-5-4')
+        self.assertEqual(describe(['As', 'Ks', 'Qs', 'Js', 'Ts']), 'Royal flush')
+        descriptions = {handclass.describe(s) for s in range(1, evaluator.NUM_CLASSES+1)}
+        self.assertEqual(len(descriptions), evaluator.NUM_CLASSES)
+        self.assertEqual(handclass.hand_class(7452).strength, HandStrength.FOUR_OF_A_KIND)
+    
+    def test_hand_accessors(self):
+        hand = Hand(['9h', '9d', '9s', 'Kc', 'Kh'])
+        self.assertEqual(hand.description, 'Full house, Nines full of Kings')
+        self.assertEqual(hand.percentile, handclass.percentile(hand.score, 5))
+        self.assertIsNone(Hand(['9h', '9d']).percentile)
+        space = HandSpace([Card('9h'), Card('9d')], [Card(c) for c in ['9s', 'Kc', 'Kh']])
+        self.assertEqual(space.percentile, hand.percentile)
+        space.add_community('2c')
+        space.add_community('3d')
+        self.assertEqual(space.description, hand.description)
+        self.assertEqual(space.percentile, handclass.percentile(hand.score, 7))
+        self.assertIsNone(HandSpace([Card('9h'), Card('9d')]).percentile)
+    
+    def test_cache_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = handclass.build_counts(os.path.join(tmp, 'classes.bin'))
+            buffer = handclass._map_counts(path)
+            self.assertEqual(buffer[:], handclass._counts_bytes())
+            buffer.close()
+            with open(path, 'r+b') as f:
+                f.truncate(100)
+            with self.assertRaises(ValueError):
+                handclass._map_counts(path)
+
+if __name__ == '__main__':
+    unittest.main()
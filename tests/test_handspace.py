@@ -1,6 +1,6 @@
 import unittest
 import random
-from enums import HandStrength
+from enums import Draw, HandStrength
 from hand import Card, Hand, HandSpace
 
 random.seed(21)
@@ -55,7 +55,68 @@ class TestHandSpace(unittest.TestCase):
             )
             
             self.assertEqual(hs.best_hand, space['target'])
+    
+    def test_lazy_best_hand(self):
+        for space in self.example_spaces:
+            hs = HandSpace(
+                hole_cards = [Card(lbl) for lbl in space['holecards']],
+                community_cards = [Card(lbl) for lbl in space['community_cards']]
+            )
+            # Only the score is known until the best hand is asked for
+            self.assertIsNone(hs._best_hand)
+            self.assertIsNone(hs._hands)
+            self.assertEqual(hs.score, space['target'].score)
+            self.assertEqual(hs.strength, space['target'].strength)
+            self.assertEqual(hs.best_hand.score, hs.score)
+            self.assertIsNone(hs._hands)
+            self.assertEqual(max(hs.hands), HandStrength[hs.strength].value)
+    
+    def test_iter_hands(self):
+        for space in self.example_spaces:
+            hs = HandSpace(
+                hole_cards = [Card(lbl) for lbl in space['holecards']],
+                community_cards = [Card(lbl) for lbl in space['community_cards']]
+            )
+            hands = list(hs.iter_hands())
+            self.assertIsNone(hs._hands)
+            self.assertEqual(max(hands), hs.best_hand)
+            strength = HandStrength[hs.strength]
+            self.assertEqual(
+                [h.cards for h in hs.iter_hands(strength)],
+                [h.cards for h in hs.hands[strength.value]]
+            )
+            self.assertEqual(sum(map(len, hs.hands.values())), len(hands))
+    
+    def test_draws(self):
+        hs = HandSpace(
+            hole_cards = [Card('Ah'), Card('Kh')],
+            community_cards = [Card(lbl) for lbl in ['7h', '2h', 'Qd']]
+        )
+        self.assertEqual(hs.draws, [Draw.FLUSH_DRAW, Draw.BACKDOOR_STRAIGHT_DRAW])
+        self.assertEqual(len(hs.outs()), 9)
+        self.assertEqual(len(hs.outs(dead=[Card('3h')])), 8)
+        
+        river = HandSpace(hs.hole_cards, hs.community_cards + [Card('3c'), Card('4d')])
+        self.assertEqual(river.draws, [])
 
+    def test_add_community(self):
+        flop = HandSpace([Card('Th'), Card('Qh')], [Card(lbl) for lbl in ['Jd', 'Qd', '2s']])
+        flop.best_hand
+        for turn_label, river_label in [('Td', '2d'), ('Kh', 'Ah'), ('3c', '9h')]:
+            hs = flop.copy()
+            hs.add_community(turn_label)
+            self.assertIsNone(hs._best_hand)
+            hs.add_community(Card(river_label))
+            fresh = HandSpace(flop.hole_cards, flop.community_cards + [Card(turn_label), Card(river_label)])
+            self.assertEqual(hs.score, fresh.score)
+            self.assertEqual(hs.best_hand, fresh.best_hand)
+            self.assertEqual([c.label for c in hs.space], [c.label for c in fresh.space])
+        # The flop itself is left as it was
+        self.assertEqual(len(flop.community_cards), 3)
+        self.assertEqual(flop.score, HandSpace(flop.hole_cards, flop.community_cards).score)
+        with self.assertRaises(ValueError):
+            flop.add_community('Qd')
+    
     
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,135 @@
+import io
+import os
+import tempfile
+import unittest
+from history import AuditSummary, audit, audit_file, audit_paths, read_hands
+
+HISTORY = """﻿PokerStars Hand #1001: Hold'em No Limit ($0.01/$0.02) - 2022/08/09 21:20:00 ET
+Table 'Alpha' 6-max Seat #1 is the button
+Seat 1: alice ($2.00 in chips)
+Seat 2: bob ($2.00 in chips)
+*** HOLE CARDS ***
+Dealt to alice [Ah Kd]
+*** FLOP *** [Kh 7d 2c]
+*** TURN *** [Kh 7d 2c] [9s]
+*** RIVER *** [Kh 7d 2c 9s] [3h]
+*** SHOW DOWN ***
+alice: shows [Ah Kd] (a pair of Kings)
+bob: shows [Qc Qs] (a pair of Queens)
+alice collected $1.00 from pot
+*** SUMMARY ***
+Total pot $1.00 | Rake $0
+Board [Kh 7d 2c 9s 3h]
+Seat 1: alice (button) showed [Ah Kd] and won ($1.00) with a pair of Kings
+Seat 2: bob (big blind) showed [Qc Qs] and lost with a pair of Queens
+
+
+
+PokerStars Hand #1002: Hold'em No Limit ($0.01/$0.02) - 2022/08/09 21:21:00 ET
+*** HOLE CARDS ***
+bob: folds
+alice collected $0.03 from pot
+*** SUMMARY ***
+Total pot $0.03 | Rake $0
+
+PokerStars Hand #1003: Hold'em No Limit ($0.01/$0.02) - 2022/08/09 21:22:00 ET
+*** SHOW DOWN ***
+alice: shows [2d 2h] (a pair of Deuces)
+bob: shows [As 5c] (a straight, Ace to Five)
+carol: shows [Jc Tc] (high card Ace)
+alice collected $3.00 from side pot
+bob collected $2.50 from main pot
+*** SUMMARY ***
+Board [3c 4d Kc 8h As]
+
+PokerStars Hand #1004: Hold'em No Limit ($0.01/$0.02) - 2022/08/09 21:23:00 ET
+*** SHOW DOWN ***
+alice: shows [Ts Js] (a flush, Ace high)
+bob: shows [9c 9d] (three of a kind, Nines)
+bob collected $1,234.50 from pot
+*** SUMMARY ***
+Board [As 9h 2s 5s Kd]
+Seat 3: carol mucked [Qh Qd]
+
+PokerStars Hand #1005: Hold'em No Limit ($0.01/$0.02) - 2022/08/09 21:24:00 ET
+*** SHOW DOWN ***
+alice: shows [Ac Kc] (high card Ace)
+bob: shows [Ad Kh] (high card Ace)
+alice collected $0.50 from pot
+bob collected $0.50 from pot
+*** SUMMARY ***
+Board [2c 7d 9h Js 3s]
+"""
+
+# Omaha and partly shown hands among hold 'em ones, which are not audited.
+MIXED = """PokerStars Hand #2001: Omaha Pot Limit ($0.01/$0.02) - 2022/08/09 21:30:00 ET
+*** SHOW DOWN ***
+alice: shows [Ah As Kd Kc] (a pair of Aces)
+bob: shows [Jh Th 9s 8s] (a straight, Eight to Queen)
+bob collected $1.00 from pot
+*** SUMMARY ***
+Board [Qc 2h 7h 6d 3c]
+PokerStars Hand #2002: Hold'em No Limit ($0.01/$0.02) - 2022/08/09 21:31:00 ET
+*** SHOW DOWN ***
+alice: shows [Ah] (high card Ace)
+bob: shows [Qc Qs] (a pair of Queens)
+bob collected $0.50 from pot
+*** SUMMARY ***
+Board [Kh 7d 2c 9s 3h]
+""" + HISTORY
+
+class TestHistory(unittest.TestCase):
+
+    def test_read_hands(self):
+        hands = list(read_hands(io.StringIO(HISTORY)))
+        self.assertEqual([h.hand_id for h in hands], ['1001', '1002', '1003', '1004', '1005'])
+        first = hands[0]
+        self.assertEqual([c.label for c in first.board], ['Kh', '7d', '2c', '9s', '3h'])
+        self.assertEqual({name: [c.label for c in cards] for name, cards in first.shown.items()}, {
+            'alice': ['Ah', 'Kd'], 'bob': ['Qc', 'Qs']
+        })
+        self.assertEqual(first.collected, {'alice': 1.0})
+        self.assertFalse(hands[1].is_showdown)
+        self.assertTrue(hands[2].side_pots)
+        self.assertEqual(hands[3].collected, {'bob': 1234.5})
+        self.assertIn('carol', hands[3].shown)
+
+    def test_audit(self):
+        winners = {hand.hand_id: names for hand, names in audit(read_hands(io.StringIO(HISTORY)), batch_size=2)}
+        self.assertEqual(winners, {
+            '1001': {'alice'}, '1003': {'bob'}, '1004': {'alice'}, '1005': {'alice', 'bob'}
+        })
+
+    def test_mixed_games(self):
+        hands = list(read_hands(io.StringIO(MIXED)))
+        self.assertEqual([h.is_showdown for h in hands[:2]], [False, False])
+        winners = {hand.hand_id: names for hand, names in audit(hands)}
+        self.assertEqual(sorted(winners), ['1001', '1003', '1004', '1005'])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'mixed.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(MIXED)
+            summary = audit_file(path)
+        self.assertEqual((summary.hands, summary.showdowns), (7, 4))
+        self.assertEqual(summary.mismatches, ['1004'])
+
+    def test_audit_paths(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.mkdir(os.path.join(directory, 'day2'))
+            for name in ('day1.txt', os.path.join('day2', 'a.txt'), 'notes.md'):
+                with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+                    f.write(HISTORY)
+
+            summary = audit_file(os.path.join(directory, 'day1.txt'))
+            self.assertEqual((summary.hands, summary.showdowns), (5, 4))
+            self.assertEqual(summary.mismatches, ['1004'])
+
+            for workers in (1, 2):
+                total = audit_paths([directory], workers=workers)
+                self.assertIsInstance(total, AuditSummary)
+                self.assertEqual((total.hands, total.showdowns), (10, 8))
+                self.assertEqual(total.mismatches, ['1004', '1004'])
+
+
+if __name__ == '__main__':
+    unittest.main()
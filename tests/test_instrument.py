@@ -0,0 +1,69 @@
+import json
+import unittest
+from card import Card
+from hand import Hand, HandSpace
+import draws
+import evaluator
+import instrument
+
+class TestInstrument(unittest.TestCase):
+
+    def test_disabled(self):
+        self.assertFalse(instrument.is_enabled())
+        self.assertIsNone(instrument.disable())
+        # Nothing is wrapped while collection is off
+        init, new, evaluate = Hand.__init__, Card.__dict__['__new__'], evaluator.evaluate
+        with instrument.collect():
+            self.assertTrue(instrument.is_enabled())
+            self.assertIsNot(Hand.__init__, init)
+        self.assertIs(Hand.__init__, init)
+        self.assertIs(Card.__dict__['__new__'], new)
+        self.assertIs(evaluator.evaluate, evaluate)
+        self.assertIs(Hand._rank_funcs['FLUSH'], Hand.is_flush)
+        instrument.count('ignored')
+        with instrument.timer('ignored'):
+            pass
+
+    def test_collect(self):
+        draws._analyse.cache_clear()
+        with instrument.collect() as stats:
+            hs = HandSpace([Card('Th'), Card('Qh')], [Card(lbl) for lbl in ['Jd', 'Qd', '2s', 'Td', '2d']])
+            hs.best_hand
+            hs.hands
+            Hand(['As', 'Ks', 'Qs', 'Js', 'Ts']).classify_hand(lookup=False)
+            Hand(['Ah', 'Kd', '7c']).draws
+            Hand(['Ah', 'Kd', '7c']).draws
+            self.assertTrue(Hand(['2c', '2d', '5h', '6s', '9c']) < hs.best_hand)
+            with self.assertRaises(RuntimeError):
+                instrument.enable()
+            with instrument.timer('custom'):
+                instrument.count('custom', 3)
+
+        counters = stats.snapshot()['counters']
+        self.assertEqual(counters['handspace.built'], 1)
+        # The space's best score, the combination found to match it, all 21 for
+        # `.hands` and the two hands compared
+        self.assertEqual(counters['evaluator.lookups'], 1 + 1 + 21 + 2)
+        # Up to the best combination, then all 21 for `.hands`
+        self.assertGreaterEqual(counters['handspace.combos'], 22)
+        self.assertEqual(counters['hand.built'], 1 + 21 + 4)
+        self.assertGreaterEqual(counters['hand.predicates'], 1)
+        self.assertEqual(counters['hand.comparisons'], 1)
+        # One analysis of the three cards, reused by the other 11 draw predicates
+        self.assertEqual((counters['draws.cache_misses'], counters['draws.cache_hits']), (1, 11))
+        self.assertEqual(counters['custom'], 3)
+        self.assertEqual(stats.timers['handspace.init'][0], 1)
+        self.assertEqual(stats.timers['custom'][0], 1)
+
+        snapshot = json.loads(stats.to_json())
+        self.assertEqual(snapshot['counters'], counters)
+        self.assertEqual(set(snapshot['timers']['hand.classify']), {'calls', 'seconds'})
+
+        # Collecting into the same stats adds them up
+        with instrument.collect(stats):
+            HandSpace([Card('Th'), Card('Qh')], [Card(lbl) for lbl in ['Jd', 'Qd', '2s']])
+        self.assertEqual(stats.counters['handspace.built'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
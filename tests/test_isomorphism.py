@@ -0,0 +1,52 @@
+import unittest
+from math import comb
+import numpy as np
+from isomorphism import (
+    SUIT_PERMUTATIONS, canonical_mask, canonical_runouts, canonicalize, permute, stabilizer
+)
+
+class TestIsomorphism(unittest.TestCase):
+    
+    def test_permute(self):
+        # Clubs -> diamonds -> hearts -> spades -> clubs
+        rotate = (1, 2, 3, 0)
+        self.assertEqual([c.label for c in permute(['Ac', 'Kd', 'Qh', 'Js'], rotate)], ['Ad', 'Kh', 'Qs', 'Jc'])
+        self.assertEqual(len(set(SUIT_PERMUTATIONS)), 24)
+    
+    def test_canonicalize(self):
+        hole, board, perm = canonicalize(['Ah', 'Kh'], ['Qh', '7h', '2c'])
+        other_hole, other_board, _ = canonicalize(['As', 'Ks'], ['Qs', '7s', '2d'])
+        self.assertEqual([c.id for c in hole + board], [c.id for c in other_hole + other_board])
+        self.assertEqual([c.id for c in permute(['Ah', 'Kh'], perm)], [c.id for c in hole[::-1]])
+        self.assertEqual(sorted(c.id for c in permute(['Qh', '7h', '2c'], perm)), [c.id for c in board])
+        # Different hands stay different (cards compare by rank, so use labels)
+        offsuit = canonicalize(['Ah', 'Kc'], ['Qh', '7h', '2c'])[0]
+        self.assertNotEqual([c.label for c in hole], [c.label for c in offsuit])
+    
+    def test_stabilizer(self):
+        self.assertEqual(len(stabilizer()), 24)
+        self.assertEqual(len(stabilizer(['Ah', 'Kh'])), 6)
+        self.assertEqual(len(stabilizer(['Ah', 'As'], ['Kd', 'Kc'])), 4)
+        self.assertEqual(stabilizer(['Ac', 'Kd', 'Qh']), [(0, 1, 2, 3)])
+    
+    def test_canonical_runouts(self):
+        flops = canonical_runouts(3)
+        self.assertEqual(len(flops), 1755)
+        self.assertEqual(sum(w for _, w in flops), comb(52, 3))
+        
+        turns = canonical_runouts(1, hole=['Ah', 'Kh'], board=['Qh', '7h', '2c'])
+        self.assertEqual(sum(w for _, w in turns), 47)
+        # Remaining hearts, clubs and the two interchangeable suits
+        self.assertEqual(len(turns), 9 + 12 + 13)
+        
+        self.assertEqual(canonical_runouts(0), [((), 1)])
+    
+    def test_canonical_mask(self):
+        rows = np.array([[0, 1], [2, 3], [0, 4]], dtype=np.uint8) # 2c2d, 2h2s, 2c3c
+        mask, weights = canonical_mask(rows, SUIT_PERMUTATIONS)
+        self.assertEqual(mask.tolist(), [True, False, True])
+        self.assertEqual(weights.tolist(), [6, 6, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+from itertools import combinations
+import numpy as np
+from card import Card
+from deck import Deck
+from enums import Draw
+from equity import equity
+from hand import Hand
+from omaha import OmahaHandSpace, evaluate, evaluate_boards
+import evaluator
+
+def _ids(labels):
+    return [Card(c).id for c in labels]
+
+def _brute(hole, board):
+    # Best of every 2 hole card and 3 board card hand, one at a time.
+    return max(evaluator.evaluate5(*pair, *triple) for pair in combinations(hole, 2) for triple in combinations(board, 3))
+
+class TestOmaha(unittest.TestCase):
+    
+    def test_two_hole_cards(self):
+        # Four hearts in hand and one on the board is not a flush.
+        score = evaluate(_ids(['Ah', 'Kh', 'Qh', 'Jh']), _ids(['Th', '2c', '3d', '8s', '5c']))
+        self.assertEqual(evaluator.strength_of(score).name, 'HIGH_CARD')
+        # Nor is a flush on the board with one card of the suit in hand.
+        score = evaluate(_ids(['Ah', '2c', 'Jc', 'Td']), _ids(['Kh', 'Qh', '8h', '7h', '9s']))
+        self.assertEqual(evaluator.strength_of(score).name, 'STRAIGHT')
+        # Nor are quads on the board.
+        score = evaluate(_ids(['Kh', 'Kd', '2c', '3c']), _ids(['9c', '9d', '9h', '9s', 'Ac']))
+        self.assertEqual(evaluator.strength_of(score).name, 'FULL_HOUSE')
+    
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(21)
+        _, deals = Deck().deal_batch(300, players=0, board_cards=10, rng=rng)
+        for n_hole in (4, 5):
+            for n_board in (3, 4, 5):
+                holes, boards = deals[:, :n_hole], deals[:, 5:5+n_board]
+                expected = [_brute(h, b) for h, b in zip(holes.tolist(), boards.tolist())]
+                self.assertEqual([evaluate(h, b) for h, b in zip(holes.tolist(), boards.tolist())], expected)
+                self.assertEqual(evaluate_boards(boards, holes[None])[0].tolist(), expected)
+        
+        # The same hole cards for every board.
+        hole = _ids(['Ah', 'As', 'Kd', 'Kc'])
+        boards = deals[~np.isin(deals[:, 5:], hole).any(axis=1), 5:]
+        scores = evaluate_boards(boards, [hole, hole])
+        self.assertEqual(scores.shape, (2, len(boards)))
+        self.assertEqual(scores[1].tolist(), [_brute(hole, b) for b in boards.tolist()])
+        with self.assertRaises(ValueError):
+            evaluate_boards(boards, [hole[:2]])
+    
+    def test_hand_space(self):
+        space = OmahaHandSpace([Card(c) for c in ['Ah', 'Kh', 'Qh', 'Jh']], [Card(c) for c in ['Th', '2c']])
+        self.assertIsNone(space.score)
+        self.assertIsNone(space.best_hand)
+        self.assertIsNone(space.strength)
+        self.assertEqual(list(space.iter_hands()), [])
+        
+        river = space.copy()
+        river.add_community('3d')
+        river.add_community('9c')
+        self.assertEqual(len(space.community_cards), 2)
+        self.assertEqual(len(list(river.get_combos())), 6 * 4)
+        self.assertEqual(river.strength, 'HIGH_CARD')
+        self.assertEqual(river.best_hand, Hand(['Ah', 'Kh', 'Th', '9c', '3d']))
+        self.assertEqual(river.uses_hole_cards, 2)
+        
+        river.add_community('8s')
+        self.assertEqual(len(list(river.get_combos())), 60)
+        self.assertEqual(river.best_hand, Hand(['Qh', 'Jh', 'Th', '9c', '8s']))
+        self.assertEqual(len(river.hands[river.best_hand._strength.value]), 1)
+        self.assertEqual(river.score, _brute(_ids(['Ah', 'Kh', 'Qh', 'Jh']), _ids(['Th', '2c', '3d', '9c', '8s'])))
+        with self.assertRaises(ValueError):
+            river.add_community('4d')
+        with self.assertRaises(ValueError):
+            river.add_community('Ah')
+        with self.assertRaises(ValueError):
+            OmahaHandSpace([Card('Ah'), Card('Kh')])
+        
+        plo5 = OmahaHandSpace([Card(c) for c in ['Ah', 'Kh', 'Qh', 'Jh', '2s']], [Card(c) for c in ['3h', '4h', '5d']])
+        self.assertEqual(len(list(plo5.get_combos())), 10)
+        self.assertEqual(plo5.best_hand, Hand(['Ah', '2s', '3h', '4h', '5d']))
+    
+    def test_draws(self):
+        def space(hole, board):
+            return OmahaHandSpace([Card(c) for c in hole], [Card(c) for c in board])
+        
+        nut_flush_draw = space(['Ah', 'Kh', '7c', '2d'], ['Qh', 'Jh', '3s'])
+        self.assertEqual(nut_flush_draw.draws, [Draw.COMBO_DRAW, Draw.FLUSH_DRAW, Draw.GUTSHOT])
+        self.assertEqual(sorted(c.label for c in nut_flush_draw.outs()), [
+            '2h', '3h', '4h', '5h', '6h', '7h', '8h', '9h', 'Tc', 'Td', 'Th', 'Ts'
+        ])
+        # A wrap: tens, nines, eights, fives, fours and threes all make a straight.
+        wrap = space(['9h', '8c', '5d', '4s'], ['7h', '6c', '2d'])
+        self.assertEqual(wrap.draws, [Draw.OPEN_ENDED_STRAIGHT_DRAW])
+        self.assertEqual(len(wrap.outs()), 20)
+        self.assertEqual(len(wrap.outs(dead=['Tc', 'Td'])), 18)
+        # Four hearts in hand are only a backdoor flush draw with one on the board.
+        hearts = space(['Ah', 'Kh', 'Qh', 'Jh'], ['Th', '2c', '3d'])
+        self.assertEqual(hearts.draws, [Draw.BACKDOOR_FLUSH_DRAW, Draw.BACKDOOR_STRAIGHT_DRAW])
+        self.assertEqual(len(hearts.outs()), 0)
+        
+        river = space(['Ah', 'Kh', '7c', '2d'], ['Qh', 'Jh', '3s', '4c', '9d'])
+        self.assertEqual(river.draws, [])
+        with self.assertRaises(ValueError):
+            river.outs()
+    
+    def test_exact_equity(self):
+        hands = [['Ah', 'As', 'Kd', 'Kc'], ['Jh', 'Th', '9s', '8s']]
+        result = equity(hands, board=['2h', '7h', 'Qc'], exact=True, workers=1)
+        board = _ids(['2h', '7h', 'Qc'])
+        self.assertEqual(result.iterations, 820)
+        
+        holes = [_ids(h) for h in hands]
+        live = sorted(set(range(52)) - set(board) - set(holes[0]) - set(holes[1]))
+        shares = np.zeros(2)
+        for runout in combinations(live, 2):
+            scores = [evaluate(h, board + list(runout)) for h in holes]
+            winners = [i for i, s in enumerate(scores) if s == max(scores)]
+            shares[winners] += 1 / len(winners)
+        np.testing.assert_allclose(result.equity, shares / 820)
+    
+    def test_simulated_equity(self):
+        hands = [['Ah', 'As', 'Kd', 'Kc', '2c'], None, None]
+        result = equity(hands, board=['2h', '7h', 'Qc'], iterations=20_000, workers=1, seed=21)
+        self.assertAlmostEqual(result.equity.sum(), 1)
+        self.assertLess(abs(result.equity[1] - result.equity[2]), 4 * result.stderr[1])
+        
+        known = [hands[0], ['Jh', 'Th', '9s', '8s', '3d']]
+        exact = equity(known, board=['2h', '7h', 'Qc'], exact=True, workers=1)
+        simulated = equity(known, board=['2h', '7h', 'Qc'], iterations=20_000, workers=1, seed=21)
+        self.assertTrue((abs(simulated.equity - exact.equity) < 4 * simulated.stderr + 1e-9).all())
+        
+        with self.assertRaises(ValueError):
+            equity(hands, exact=True, workers=1)
+        with self.assertRaises(ValueError):
+            equity([['Ah', 'As', 'Kd', 'Kc'], ['Jh', 'Th']], workers=1)
+        with self.assertRaises(ValueError):
+            equity([None, None], n_hole=3, workers=1)
+
+if __name__ == '__main__':
+    unittest.main()
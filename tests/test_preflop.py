@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from batch import evaluate_boards
+import preflop
+from preflop import HAND_CLASSES, hand_class
+
+class TestPreflop(unittest.TestCase):
+
+    def test_hand_classes(self):
+        self.assertEqual(len(set(HAND_CLASSES)), 169)
+        self.assertEqual(sum(len(c) == 2 for c in HAND_CLASSES), 13)
+        self.assertEqual(sum(c.endswith('s') for c in HAND_CLASSES), 78)
+        self.assertEqual(HAND_CLASSES[:2], ('AA', 'AKs'))
+        self.assertEqual(HAND_CLASSES[13], 'AKo')
+        self.assertEqual(hand_class(['As', 'Kd']), 'AKo')
+        self.assertEqual(hand_class(['Kd', 'As']), 'AKo')
+        self.assertEqual(hand_class(['9h', 'Th']), 'T9s')
+        self.assertEqual(hand_class(['7h', '7c']), '77')
+        # Every starting hand has 4, 6 or 12 combinations
+        combos = np.bincount(preflop._HOLDING_CLASSES, minlength=169)
+        self.assertEqual(sorted(set(combos.tolist())), [4, 6, 12])
+        with self.assertRaises(ValueError):
+            hand_class(['As', 'As'])
+
+    def test_tally(self):
+        # Compare every pair of combinations on a few boards directly.
+        rng = np.random.default_rng(1)
+        boards = np.array([np.sort(rng.choice(52, 5, replace=False)) for _ in range(3)], dtype=np.uint8)
+        weights = np.array([1., 3., 2.])
+        shares, counts = preflop._tally(boards, weights)
+
+        k = len(HAND_CLASSES)
+        masks, classes = preflop._HOLDING_MASKS, preflop._HOLDING_CLASSES
+        expected_shares, expected_counts = np.zeros((k, k)), np.zeros((k, k))
+        for board, weight in zip(boards, weights):
+            board_mask = np.uint64(sum(1 << int(c) for c in board))
+            live = np.flatnonzero((masks & board_mask) == 0)
+            scores = evaluate_boards(board[None, :], preflop._HOLDINGS[live])[:, 0].astype(int)
+            meet = (masks[live][:, None] & masks[live][None, :]) == 0
+            won = (scores[:, None] > scores[None, :]) + 0.5 * (scores[:, None] == scores[None, :])
+            cells = (classes[live][:, None] * k + classes[live][None, :])[meet]
+            expected_shares += weight * np.bincount(cells, weights=won[meet], minlength=k * k).reshape(k, k)
+            expected_counts += weight * np.bincount(cells, minlength=k * k).reshape(k, k)
+        np.testing.assert_array_equal(shares, expected_shares)
+        np.testing.assert_array_equal(counts, expected_counts)
+
+    def test_build_and_lookup(self):
+        rng = np.random.default_rng(2)
+        boards = np.array([np.sort(rng.choice(52, 5, replace=False)) for _ in range(50)], dtype=np.uint8)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'preflop.bin')
+            with mock.patch.object(preflop, 'iter_runouts', lambda *args: iter([boards])):
+                with np.errstate(invalid='ignore'):
+                    self.assertEqual(preflop.build_matrix(path, workers=1), path)
+            matrix = preflop._map_matrix(path)
+            self.assertEqual(matrix.shape, (169, 169))
+            met = np.isfinite(matrix)
+            np.testing.assert_allclose((matrix + matrix.T)[met], 1)
+
+            with mock.patch.object(preflop, '_MATRIX', matrix):
+                aces, kings = HAND_CLASSES.index('AA'), HAND_CLASSES.index('KK')
+                self.assertEqual(preflop.equity('AA', 'KK'), matrix[aces, kings])
+                self.assertEqual(preflop.equity(['Ah', 'As'], 'KK'), matrix[aces, kings])
+                self.assertEqual(preflop.equity('AKS', 'KK'), preflop.equity('AKs', 'KK'))
+                with self.assertRaises(ValueError):
+                    preflop.equity('AKx', 'KK')
+
+            with open(path, 'r+b') as f:
+                f.write(b'XXXXXXXX')
+            with self.assertRaises(ValueError):
+                preflop._map_matrix(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import numpy as np
+from equity import equity
+from ranges import Range, parse_range, range_equity
+
+class TestRanges(unittest.TestCase):
+
+    def test_parse_range(self):
+        r = parse_range("QQ+, AKs, 50% AQo")
+        self.assertEqual(len(r), 18 + 4 + 12)
+        self.assertEqual(r.size, 18 + 4 + 6)
+        self.assertEqual(len(parse_range('22+')), 78)
+        self.assertEqual(len(parse_range('ATs+')), 16)
+        self.assertEqual(len(parse_range('KTo-K7o')), 48)
+        self.assertEqual(len(parse_range('88-55')), len(parse_range('55-88')))
+        self.assertEqual(len(parse_range('AK')), 16)
+        self.assertEqual(len(parse_range('aks, AhKh')), 4)
+        self.assertEqual(parse_range('AhKh').labels, ['AhKh'])
+        # Later weights win, and zero weights drop the combination
+        r = parse_range('AK, AKs:0.25, AKo:0')
+        self.assertEqual(sorted(r.weights.tolist()), [0.25] * 4)
+        self.assertEqual(len(r.without(['Ah'])), 3)
+        for bad in ('AKx', 'QQs', 'Q', 'AK-QJ', '150% AA'):
+            with self.assertRaises(ValueError):
+                parse_range(bad)
+        with self.assertRaises(ValueError):
+            Range([['Ah', 'Kh'], ['Kh', 'Ah']])
+
+    def test_range_equity(self):
+        # Compare against exact equities of every pair of combinations.
+        board = ['2h', '7h', '9c', 'Kd']
+        hero = parse_range('AhKh, QQ, 50% KQs, 97s')
+        villain = parse_range('QhQd:0.5, KK, AK, 9h7h')
+        result = range_equity(hero, villain, board=board, exact=True)
+        self.assertEqual(result.boards, 48)
+
+        won = np.zeros((len(hero), len(villain)))
+        met = np.zeros((len(hero), len(villain)))
+        for i, (combo, weight) in enumerate(zip(hero.labels, hero.weights)):
+            for j, (other, other_weight) in enumerate(zip(villain.labels, villain.weights)):
+                cards = {combo[:2], combo[2:], other[:2], other[2:]}
+                if len(cards) < 4 or cards & set(board):
+                    continue
+                e = equity([[combo[:2], combo[2:]], [other[:2], other[2:]]], board=board, exact=True, workers=1)
+                boards = e.iterations
+                won[i, j] = weight * other_weight * e.equity[0] * boards
+                met[i, j] = weight * other_weight * boards
+        self.assertAlmostEqual(result.equity, won.sum() / met.sum())
+        hero_met = met.sum(axis=1)
+        self.assertTrue(np.isnan(result.hero[hero_met == 0]).all())
+        np.testing.assert_allclose(result.hero[hero_met > 0], won.sum(axis=1)[hero_met > 0] / hero_met[hero_met > 0])
+        villain_met = met.sum(axis=0)
+        np.testing.assert_allclose(
+            result.villain[villain_met > 0], (met - won).sum(axis=0)[villain_met > 0] / villain_met[villain_met > 0]
+        )
+
+        simulated = range_equity(hero, villain, board=board[:3], iterations=2000, seed=1)
+        exact = range_equity(hero, villain, board=board[:3], exact=True)
+        self.assertEqual(simulated.boards, 2000)
+        self.assertLess(abs(simulated.equity - exact.equity), 4 * simulated.stderr)
+
+        with self.assertRaises(ValueError):
+            range_equity('AhAs', 'AhAd', board=board)
+        with self.assertRaises(ValueError):
+            range_equity('AA', 'KK', board=['Kd', 'Kd'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import asyncio
+import os
+import tempfile
+import unittest
+import numpy as np
+from card import Card
+import evaluator
+from loadtest import run_load
+from service import EvaluationClient, EvaluationServer
+
+class TestService(unittest.TestCase):
+
+    def test_evaluate(self):
+        rng = np.random.default_rng(3)
+        hands = [
+            [Card.from_id(int(i)).label for i in rng.choice(52, n, replace=False)]
+            for n in rng.integers(5, 8, size=200)
+        ]
+
+        async def run():
+            async with await EvaluationServer(window=0.01).start() as server:
+                host, port = server.address[:2]
+                async with await EvaluationClient().connect(host, port) as client:
+                    results = await asyncio.gather(*(client.evaluate(cards) for cards in hands))
+                    self.assertEqual(await client.evaluate([Card('As'), 'Ks', 'Qs', 'Js', 'Ts']), (7462, 'ROYAL_FLUSH'))
+                    for bad in (['As'], ['As', 'As', 'Kd', '2c', '3c'], ['Xx', 'Ks', 'Qs', 'Js', 'Ts']):
+                        with self.assertRaises(ValueError):
+                            await client.evaluate(bad)
+                    with self.assertRaises(ValueError):
+                        await client.request('shuffle')
+                return results, server.requests, server.batches
+
+        results, requests, batches = asyncio.run(run())
+        self.assertEqual([score for score, _ in results], [evaluator.evaluate([Card(c).id for c in h]) for h in hands])
+        self.assertEqual([strength for _, strength in results], [
+            evaluator.strength_of(score).name for score, _ in results
+        ])
+        # Invalid requests are answered without being batched, and the
+        # concurrent valid ones together
+        self.assertEqual(requests, 201)
+        self.assertLess(batches, 10)
+
+    def test_equity(self):
+        async def run(path):
+            async with await EvaluationServer().start(path=path):
+                async with await EvaluationClient().connect(path=path) as client:
+                    return await asyncio.gather(
+                        client.equity([['Ah', 'As'], ['Kd', 'Kc']], board=['2c', '7d', '9h', 'Th'], exact=True),
+                        client.equity([['Ah', 'As'], None], iterations=1000, seed=1),
+                        client.equity([['Ah', 'As'], ['Ah', 'Kc']]),
+                        return_exceptions=True,
+                    )
+
+        with tempfile.TemporaryDirectory() as directory:
+            exact, simulated, error = asyncio.run(run(os.path.join(directory, 'service.sock')))
+        self.assertEqual(exact['iterations'], 44)
+        self.assertAlmostEqual(exact['equity'][0], 42 / 44)
+        self.assertEqual(simulated['iterations'], 1000)
+        self.assertAlmostEqual(sum(simulated['equity']), 1)
+        self.assertIsInstance(error, ValueError)
+
+    def test_bad_equity_request(self):
+        # A malformed request only fails itself, not the rest of its batch.
+        async def run():
+            async with await EvaluationServer(window=0.05).start() as server:
+                host, port = server.address[:2]
+                async with await EvaluationClient().connect(host, port) as client:
+                    results = await asyncio.gather(
+                        client.request('equity', hands=[1, 2]),
+                        client.equity([['Ah', 'As'], ['Kd', 'Kc']], board=['2c', '7d', '9h', 'Th'], exact=True),
+                        return_exceptions=True,
+                    )
+                return results, server.batches
+
+        (error, exact), batches = asyncio.run(run())
+        self.assertEqual(batches, 1)
+        self.assertIsInstance(error, ValueError)
+        self.assertAlmostEqual(exact['equity'][0], 42 / 44)
+
+    def test_bad_card_label(self):
+        # A malformed card label only fails its own request, not the others on
+        # the same connection.
+        async def run():
+            async with await EvaluationServer(window=0.05).start() as server:
+                host, port = server.address[:2]
+                async with await EvaluationClient().connect(host, port) as client:
+                    return await asyncio.gather(
+                        client.evaluate(['A', 'Ks', 'Qs', 'Js', 'Ts']),
+                        client.evaluate(['As', 'Ks', 'Qs', 'Js', 'Ts']),
+                        return_exceptions=True,
+                    )
+
+        error, royal = asyncio.run(run())
+        self.assertIsInstance(error, ValueError)
+        self.assertEqual(royal[0], 7462)
+
+    def test_closed_connection(self):
+        # Requests after the server hangs up fail at once rather than hang.
+        async def run():
+            server = await asyncio.start_server(lambda reader, writer: writer.close(), '127.0.0.1', 0)
+            async with server:
+                host, port = server.sockets[0].getsockname()[:2]
+                async with await EvaluationClient().connect(host, port) as client:
+                    await client._listener
+                    with self.assertRaises(ConnectionError):
+                        await asyncio.wait_for(client.evaluate(['As', 'Ks', 'Qs', 'Js', 'Ts']), 1)
+
+        asyncio.run(run())
+
+    def test_load(self):
+        result = asyncio.run(run_load(requests=500, clients=2, concurrency=8, seed=4))
+        self.assertEqual(len(result.latencies), 500)
+        self.assertLessEqual(result.p50, result.p99)
+        self.assertGreater(result.throughput, 0)
+        self.assertIn('requests/s', result.report())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import numpy as np
+from card import Card
+from showdown import resolve_showdown, resolve_showdowns
+
+class TestShowdown(unittest.TestCase):
+
+    def test_single_winner(self):
+        result = resolve_showdown(
+            ['Kh', '7d', '2c', '9s', '3h'], [['Ah', 'Kd'], ['Qc', 'Qs']], [50, 50]
+        )
+        self.assertEqual(result.winners, [0])
+        self.assertFalse(result.is_split)
+        self.assertEqual(result.payouts, [100, 0])
+        self.assertGreater(result.scores[0], result.scores[1])
+
+    def test_split_pot(self):
+        # Both players play the board's straight
+        result = resolve_showdown(
+            ['5s', '6d', '7c', '8h', '9s'], [['2c', '3d'], ['2h', '3c'], ['Kd', 'Kc']], [21, 21, 21]
+        )
+        self.assertEqual(result.winners, [0, 1, 2])
+        self.assertTrue(result.is_split)
+        self.assertEqual(result.payouts, [21, 21, 21])
+
+        # Odd chips go to the earliest winners
+        result = resolve_showdown(['5s', '6d', '7c', '8h', '9s'], [['2c', '3d'], ['2h', '3c'], None], [10, 10, 5])
+        self.assertEqual(result.payouts, [13, 12, 0])
+        self.assertEqual(result.scores[2], None)
+
+    def test_side_pots(self):
+        board = ['Kh', '7d', '2c', '9s', '3h']
+        # The short stack has the best hand, the middle stack the next best
+        holes = [['Ks', 'Kd'], ['9h', '9d'], ['Ac', 'Qd'], None]
+        result = resolve_showdown(board, holes, [20, 50, 100, 30])
+        self.assertEqual([(p.amount, p.eligible, p.winners) for p in result.pots], [
+            (80, [0, 1, 2], [0]),
+            (70, [1, 2], [1]),
+            (50, [2], [2]),
+        ])
+        self.assertEqual(result.payouts, [80, 70, 50, 0])
+        self.assertEqual(sum(result.payouts), 200)
+
+        with self.assertRaises(ValueError):
+            resolve_showdown(board, [None, None], [1, 1])
+        with self.assertRaises(ValueError):
+            resolve_showdown(board, [['Kh', 'Ad'], ['2d', '2s']], [1, 1])
+
+    def test_unmatched_contributions(self):
+        # The only player left put nothing in, so there is no pot to win and
+        # the folded players' money goes back to them.
+        board = ['2c', '7d', '9h', 'Ts', 'Kc']
+        result = resolve_showdown(board, [['Ah', 'As'], None, None], [0, 10, 4])
+        self.assertEqual(result.pots, [])
+        self.assertEqual(result.payouts, [0, 10, 4])
+        
+        ids = np.array([[Card(c).id for c in board]])
+        holes = np.array([[[Card(c).id for c in ['Ah', 'As']], [0, 1], [4, 5]]])
+        _, payouts = resolve_showdowns(ids, holes, [[0, 10, 4]], [[True, False, False]])
+        self.assertEqual(payouts.tolist(), [[0, 10, 4]])
+    
+    def test_batch(self):
+        rng = np.random.default_rng(7)
+        n_tables, n_players = 500, 5
+        cards = np.argsort(rng.random((n_tables, 52)), axis=1)[:, :15].astype(np.uint8)
+        boards, holes = cards[:, :5], cards[:, 5:].reshape(n_tables, n_players, 2)
+        contributions = rng.choice([0, 10, 20, 40, 80], size=(n_tables, n_players))
+        live = rng.random((n_tables, n_players)) < 0.8
+        live[:, 0] = True
+
+        scores, payouts = resolve_showdowns(boards, holes, contributions, live)
+        np.testing.assert_allclose(payouts.sum(axis=1), contributions.sum(axis=1))
+        for t in range(n_tables):
+            result = resolve_showdown(
+                [Card.from_id(c) for c in boards[t].tolist()],
+                [[Card.from_id(c) for c in h.tolist()] if alive else None for h, alive in zip(holes[t], live[t])],
+                contributions[t].astype(float).tolist(),
+            )
+            np.testing.assert_allclose(payouts[t], result.payouts)
+            self.assertEqual(scores[t].tolist(), [s or 0 for s in result.scores])
+
+        with self.assertRaises(ValueError):
+            resolve_showdowns(boards[:, :4], holes, contributions)
+
+if __name__ == '__main__':
+    unittest.main()
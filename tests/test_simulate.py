@@ -0,0 +1,56 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import simulate
+from simulate import EXPECTED_COUNTS, simulate as run
+
+class TestSimulate(unittest.TestCase):
+
+    def test_expected_counts(self):
+        self.assertEqual(sum(EXPECTED_COUNTS[5]), 2598960)
+        self.assertEqual(sum(EXPECTED_COUNTS[7]), 133784560)
+
+    def test_distribution(self):
+        for n_cards in (5, 7):
+            result = run(200_000, n_cards, workers=1, seed=5)
+            self.assertEqual(result.hands, 200_000)
+            self.assertEqual(result.counts.sum(), 200_000)
+            # Far below the 0.1% critical value of 27.9
+            self.assertLess(result.chi_square, 27.9)
+            self.assertIn('ROYAL_FLUSH', result.table())
+
+        with self.assertRaises(ValueError):
+            run(10, n_cards=6)
+
+    @mock.patch.object(simulate, 'SHARD_SIZE', 1000)
+    def test_resume(self):
+        expected = run(5500, 7, workers=1, seed=3).counts
+
+        shard = simulate._simulate
+        calls = []
+        def interrupted(*args):
+            calls.append(args)
+            if len(calls) == 3:
+                raise KeyboardInterrupt
+            return shard(*args)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'run.json')
+            with mock.patch.object(simulate, '_simulate', interrupted):
+                with self.assertRaises(KeyboardInterrupt):
+                    run(5500, 7, workers=1, seed=3, checkpoint=path)
+            with open(path) as f:
+                self.assertEqual(len(json.load(f)['done']), 2)
+
+            # The seed is restored from the checkpoint
+            result = run(5500, 7, workers=1, checkpoint=path)
+            np.testing.assert_array_equal(result.counts, expected)
+            with self.assertRaises(ValueError):
+                run(100, 7, workers=1, checkpoint=path)
+
+
+if __name__ == '__main__':
+    unittest.main()